@@ -0,0 +1,215 @@
+"""
+Benchmarks for the model and aggregation hot paths, e.g.
+
+    python benchmarks/run.py --quick -o before.json
+    python benchmarks/run.py --quick -o after.json --compare before.json
+
+Results are written as JSON: one entry per (benchmark, species, files) with the
+min/median/mean of the repeats in seconds. --compare prints the ratio against
+an earlier run and exits with 1 when anything got slower than --threshold.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from model.sessionModel import sessionModel
+from model.fishColumns import numpy
+from model.parallelLoader import aggregate_files
+from model.sessionCache import session_cache
+
+import synthetic
+
+SORT_COLUMNS = ["Name", "Count", "Percentage", "Catch Percentage"]
+CSV_MAPPING = {'name': "Fish", 'count': "Caught", 'missed': "Missed"}
+# fish_index is timed over at most this many lookups per run
+MAX_LOOKUPS = 10000
+
+
+def measure(func, repeat, setup=None):
+    """Run func `repeat` times, setup (untimed) before each, and return the timings."""
+    timings = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summarize(name, timings, **params):
+    return dict(name=name, **params, repeat=len(timings), min=min(timings),
+                median=statistics.median(timings), mean=statistics.fmean(timings))
+
+
+def bench_species(species, duplicate_rate, repeat, workdir, seed):
+    """Single session benchmarks at one table size."""
+    fish_data = synthetic.make_fish_data(species, duplicate_rate, seed)
+    json_path = os.path.join(workdir, f"single_{species}.json")
+    csv_path = os.path.join(workdir, f"single_{species}.csv")
+    out_path = os.path.join(workdir, f"export_{species}.csv")
+    synthetic.write_session(json_path, fish_data, seed)
+    synthetic.write_csv(csv_path, fish_data)
+
+    session = sessionModel.load_file(json_path)
+    params = {'species': species, 'files': 1, 'duplicate_rate': duplicate_rate}
+    results = [summarize("load_file", measure(lambda _: sessionModel.load_file(json_path), repeat), **params)]
+
+    for col in SORT_COLUMNS:
+        results.append(summarize(f"sort_data[{col}]", measure(
+            lambda s: s.sort_data(col, ascending=False), repeat,
+            lambda: sessionModel(session.fish_data.copy(), session.water_type, session.bait_type)), **params))
+        results.append(summarize(f"sort_fish_data[{col}]", measure(
+            lambda rows: sessionModel.sort_fish_data(rows, col, ascending=False), repeat,
+            lambda: [dict(fish) for fish in fish_data]), **params))
+
+    names = session.fish_data.names[:MAX_LOOKUPS]
+    lookups = [name.upper() if i % 2 else name for i, name in enumerate(names)]
+    lookups.append("Not A Fish")
+
+    def find_all(_):
+        for name in lookups:
+            session.fish_index(name)
+    results.append(summarize("fish_index", measure(find_all, repeat), lookups=len(lookups), **params))
+
+    def totals(_):
+        session.touch()  # drop the memoized stats so the totals are really computed
+        session.calculate_total_caught()
+        session.calculate_total_missed()
+        session.calculate_total_seen()
+    results.append(summarize("calculate_total_*", measure(totals, repeat), **params))
+
+    def totals_from(_):
+        sessionModel.calculate_total_caught_from(fish_data)
+        sessionModel.calculate_total_missed_from(fish_data)
+        sessionModel.calculate_total_seen_from(fish_data)
+    results.append(summarize("calculate_total_*_from", measure(totals_from, repeat), **params))
+
+    results.append(summarize("aggregate_fish_data", measure(
+        lambda _: sessionModel.aggregate_fish_data(fish_data), repeat), **params))
+    results.append(summarize("import_from_csv", measure(
+        lambda _: sessionModel.import_from_csv(csv_path, CSV_MAPPING), repeat), **params))
+    results.append(summarize("export_to_csv", measure(
+        lambda _: session.export_to_csv(out_path, CSV_MAPPING), repeat), **params))
+
+    for path in (json_path, csv_path, out_path):
+        os.remove(path)
+    return results
+
+
+def bench_files(files, species, duplicate_rate, repeat, workdir, seed, workers):
+    """Many session benchmarks: parsing every file and combining them."""
+    folder = os.path.join(workdir, f"files_{files}")
+    paths = synthetic.write_sessions(folder, files, species, duplicate_rate, seed)
+    params = {'species': species, 'files': files, 'duplicate_rate': duplicate_rate}
+
+    def load_all(_):
+        return [sessionModel.load_file(path) for path in paths]
+    results = [summarize("load_file[all]", measure(load_all, repeat), **params)]
+
+    rows = [dict(fish) for session in load_all(None) for fish in session.fish_data]
+    results.append(summarize("aggregate_fish_data[all]", measure(
+        lambda _: sessionModel.aggregate_fish_data(rows), repeat), **params))
+    results.append(summarize("aggregate_files", measure(
+        lambda _: aggregate_files(paths, workers), repeat, session_cache.invalidate), workers=workers, **params))
+
+    shutil.rmtree(folder)
+    return results
+
+
+def compare(results, baseline_path, threshold):
+    """Print current/baseline median ratios, returns the number of regressions."""
+    with open(baseline_path) as f:
+        baseline = {_result_key(r): r for r in json.load(f)['results']}
+    regressions = 0
+    for result in results:
+        old = baseline.get(_result_key(result))
+        if old is None or old['median'] <= 0:
+            continue
+        ratio = result['median'] / old['median']
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{result['name']:<32} species={result['species']:<7} files={result['files']:<6} "
+              f"{old['median'] * 1000:>10.2f} ms -> {result['median'] * 1000:>10.2f} ms  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def _result_key(result):
+    return (result['name'], result['species'], result['files'], result['duplicate_rate'])
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Fish Tracker model benchmarks")
+    parser.add_argument("--species", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000],
+                        help="table sizes for the single session benchmarks")
+    parser.add_argument("--files", type=int, nargs="+", default=[1, 10, 100, 1000, 10000],
+                        help="file counts for the many session benchmarks")
+    parser.add_argument("--file-species", type=int, default=100,
+                        help="species per file in the many session benchmarks")
+    parser.add_argument("--duplicate-rate", type=float, default=0.05,
+                        help="fraction of extra rows reusing an existing name")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None, help="processes for aggregate_files")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--quick", action="store_true", help="small sizes only, for a fast check")
+    parser.add_argument("-o", "--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results of an earlier run")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="median ratio above which --compare reports a regression")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.quick:
+        args.species = [s for s in args.species if s <= 1000]
+        args.files = [n for n in args.files if n <= 100]
+        args.repeat = min(args.repeat, 3)
+
+    results = []
+    workdir = tempfile.mkdtemp(prefix="fish_bench_")
+    try:
+        for species in args.species:
+            print(f"species={species}", file=sys.stderr)
+            results.extend(bench_species(species, args.duplicate_rate, args.repeat, workdir, args.seed))
+        for files in args.files:
+            print(f"files={files}", file=sys.stderr)
+            results.extend(bench_files(files, args.file_species, args.duplicate_rate, args.repeat,
+                                       workdir, args.seed, args.workers))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'created': datetime.datetime.now().isoformat(timespec="seconds"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': numpy().__version__ if numpy() is not None else None,
+        'args': vars(args),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Synthetic session data for the benchmarks.
+
+Everything is generated from a seed, so two runs with the same arguments time
+exactly the same data.
+"""
+import csv
+import json
+import os
+import random
+
+WATER_TYPES = ["Freshwater", "Saltwater", "Unspecified/Mixed"]
+BAIT_TYPES = ["Live", "Lure", "Unspecified/Mixed"]
+
+
+def species_names(count):
+    return [f"Species {i:06d}" for i in range(count)]
+
+
+def make_fish_data(species, duplicate_rate=0.0, seed=0):
+    """
+    A list of fish dicts covering `species` unique names. duplicate_rate adds
+    that fraction of extra rows reusing an existing name, in a different case
+    half of the time, the way hand-edited or merged files end up.
+    """
+    rng = random.Random(seed)
+    names = species_names(species)
+    rows = [{'name': name, 'count': rng.randint(0, 500), 'missed': rng.randint(0, 200)}
+            for name in names]
+    for _ in range(int(species * duplicate_rate)):
+        name = rng.choice(names)
+        if rng.random() < 0.5:
+            name = name.upper()
+        rows.insert(rng.randrange(len(rows) + 1),
+                    {'name': name, 'count': rng.randint(0, 500), 'missed': rng.randint(0, 200)})
+    return rows
+
+
+def write_session(file_path, fish_data, seed=0):
+    rng = random.Random(seed)
+    with open(file_path, 'w') as f:
+        json.dump({
+            'fish_data': fish_data,
+            'water_type': rng.choice(WATER_TYPES),
+            'bait_type': rng.choice(BAIT_TYPES),
+        }, f)
+
+
+def write_sessions(folder, files, species, duplicate_rate=0.0, seed=0):
+    """Write `files` session files of `species` species each, returns their paths."""
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for i in range(files):
+        path = os.path.join(folder, f"session_{i:05d}.json")
+        write_session(path, make_fish_data(species, duplicate_rate, seed + i), seed + i)
+        paths.append(path)
+    return paths
+
+
+def write_csv(file_path, fish_data, headers=("Fish", "Caught", "Missed")):
+    with open(file_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        writer.writerows((fish['name'], fish['count'], fish['missed']) for fish in fish_data)
@@ -0,0 +1,215 @@
+"""
+Headless entry point, e.g.
+
+    python tracker.py stats sessions/*.json
+    python tracker.py combine sessions/*.json -o combined.fts
+    python tracker.py compare a.json b.json
+    python tracker.py export --all sessions -o archive.csv
+    python tracker.py import log.csv --name Fish --count Caught --missed Missed -o imported.json
+
+Only the model layer is used, so nothing here imports tkinter.
+"""
+import argparse
+import json
+import os
+import sys
+
+from model.sessionModel import sessionModel, list_session_files
+from model.parallelLoader import aggregate_files
+from model.csvExport import LONG_FIELDS, export_sessions_long
+from model.csvImport import CsvImport
+from model.binarySession import convert_sessions_folder
+
+
+def _session_paths(args):
+    paths = list(args.files)
+    if getattr(args, 'all', None):
+        paths.extend(list_session_files(args.all))
+    if not paths:
+        raise SystemExit("No session files given")
+    return paths
+
+
+def _load(paths, workers):
+    if len(paths) == 1:
+        session = sessionModel.load_file(paths[0])
+        if session.load_report is not None:
+            print(f"{paths[0]}: " + session.load_report.summary(), file=sys.stderr)
+        return session
+    return aggregate_files(paths, workers)
+
+
+def _stats_rows(session):
+    stats = session.stats()
+    for i, name in enumerate(session.fish_data.names):
+        yield {
+            'name': name,
+            'count': int(stats.counts[i]),
+            'missed': int(stats.missed[i]),
+            'seen': int(stats.seen[i]),
+            'percentage': round(float(stats.percentage[i]), 2),
+            'catch_rate': round(float(stats.catch_rate[i]), 2),
+            'seen_rate': round(float(stats.seen_rate[i]), 2),
+        }
+
+
+def cmd_stats(args):
+    session = _load(_session_paths(args), args.workers)
+    if args.sort:
+        session.sort_data(args.sort, ascending=not args.descending)
+    stats = session.stats()
+    rows = list(_stats_rows(session))
+
+    if args.json:
+        json.dump({
+            'water_type': session.water_type,
+            'bait_type': session.bait_type,
+            'total_caught': stats.total_caught,
+            'total_missed': stats.total_missed,
+            'total_seen': stats.total_seen,
+            'fish': rows,
+        }, sys.stdout, indent=2)
+        print()
+        return 0
+
+    print(f"Water type: {session.water_type}    Bait type: {session.bait_type}")
+    width = max([len(row['name']) for row in rows] + [5])
+    print(f"{'Fish':<{width}} {'Caught':>8} {'Missed':>8} {'Seen':>8} {'Pct':>8} {'Catch':>8} {'Seen %':>8}")
+    for row in rows:
+        print(f"{row['name']:<{width}} {row['count']:>8} {row['missed']:>8} {row['seen']:>8} "
+              f"{row['percentage']:>7.2f}% {row['catch_rate']:>7.2f}% {row['seen_rate']:>7.2f}%")
+    print(f"{'Total':<{width}} {stats.total_caught:>8} {stats.total_missed:>8} {stats.total_seen:>8} "
+          f"{'':>8} {stats.total_catch_rate:>7.2f}%")
+    return 0
+
+
+def cmd_combine(args):
+    session = aggregate_files(_session_paths(args), args.workers)
+    session.save_file(args.output)
+    print(f"Combined {len(session.fish_data)} species into {args.output}")
+    return 0
+
+
+def cmd_compare(args):
+    paths = _session_paths(args)
+    sessions = [sessionModel.load_file(path) for path in paths]
+    labels = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+
+    # One row per species across every session, in order of first appearance
+    species = {}
+    for session in sessions:
+        for name in session.fish_data.names:
+            species.setdefault(sessionModel.name_key(name), name)
+
+    width = max([len(name) for name in species.values()] + [5])
+    col = max([len(label) for label in labels] + [12])
+    print(f"{'Fish':<{width}} " + " ".join(f"{label:>{col}}" for label in labels))
+    for key, name in species.items():
+        cells = []
+        for session in sessions:
+            index = session.fish_index(name)
+            if index < 0:
+                cells.append(f"{'-':>{col}}")
+            else:
+                fish = session.fish_data[index]
+                cells.append(f"{str(fish['count']) + '/' + str(fish['missed']):>{col}}")
+        print(f"{name:<{width}} " + " ".join(cells))
+    print(f"{'Total':<{width}} " + " ".join(
+        f"{str(s.calculate_total_caught()) + '/' + str(s.calculate_total_missed()):>{col}}" for s in sessions))
+    return 0
+
+
+def cmd_export(args):
+    paths = _session_paths(args)
+    if args.long or len(paths) > 1:
+        names = {field: field for field in LONG_FIELDS}
+        rows = export_sessions_long(paths, args.output, names)
+        print(f"Exported {rows} row(s) from {len(paths)} session(s) to {args.output}")
+    else:
+        sessionModel.load_file(paths[0]).export_to_csv(args.output, {'name': 'name', 'count': 'count', 'missed': 'missed'})
+        print(f"Exported {paths[0]} to {args.output}")
+    return 0
+
+
+def cmd_import(args):
+    csv_import = CsvImport(args.csv)
+    fish_data, report = csv_import.run({'name': args.name, 'count': args.count, 'missed': args.missed})
+    if report.rejected_rows:
+        print(report.summary(), file=sys.stderr)
+    if not fish_data:
+        print("No valid rows were imported", file=sys.stderr)
+        return 1
+    sessionModel(fish_data, args.water_type, args.bait_type).save_file(args.output)
+    print(f"Imported {len(fish_data)} species into {args.output}")
+    return 0
+
+
+def cmd_convert(args):
+    written, failures = convert_sessions_folder(args.folder, remove_json=args.remove_json)
+    print(f"Converted {len(written)} session(s)")
+    for name, reason in failures:
+        print(f"Failed to convert {name}: {reason}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="tracker.py", description="Fish Tracker batch tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_sessions(sub):
+        sub.add_argument("files", nargs="*", help="session files (.json or .fts)")
+        sub.add_argument("--all", metavar="FOLDER", help="also use every session in FOLDER")
+        sub.add_argument("--workers", type=int, default=None, help="processes used to parse many files")
+
+    stats = commands.add_parser("stats", help="print totals and rates, combining the files when several are given")
+    add_sessions(stats)
+    stats.add_argument("--sort", choices=["Name", "Count", "Missed", "Percentage", "Number Seen",
+                                          "Catch Percentage", "Seen Percentage"])
+    stats.add_argument("--descending", action="store_true")
+    stats.add_argument("--json", action="store_true", help="print machine readable JSON")
+    stats.set_defaults(func=cmd_stats)
+
+    combine = commands.add_parser("combine", help="merge sessions into one file")
+    add_sessions(combine)
+    combine.add_argument("-o", "--output", required=True, help=".json or .fts output file")
+    combine.set_defaults(func=cmd_combine)
+
+    compare = commands.add_parser("compare", help="print caught/missed per species side by side")
+    add_sessions(compare)
+    compare.set_defaults(func=cmd_compare)
+
+    export = commands.add_parser("export", help="export sessions to CSV")
+    add_sessions(export)
+    export.add_argument("-o", "--output", required=True)
+    export.add_argument("--long", action="store_true", help="long format with session/water/bait columns")
+    export.set_defaults(func=cmd_export)
+
+    imp = commands.add_parser("import", help="turn a CSV file into a session")
+    imp.add_argument("csv")
+    imp.add_argument("--name", default="name", help="CSV column holding the fish name")
+    imp.add_argument("--count", default="count", help="CSV column holding the caught count")
+    imp.add_argument("--missed", default="missed", help="CSV column holding the missed count")
+    imp.add_argument("--water-type", default="Unspecified/Mixed")
+    imp.add_argument("--bait-type", default="Unspecified/Mixed")
+    imp.add_argument("-o", "--output", required=True)
+    imp.set_defaults(func=cmd_import)
+
+    convert = commands.add_parser("convert", help="write a binary copy of every JSON session in a folder")
+    convert.add_argument("folder")
+    convert.add_argument("--remove-json", action="store_true")
+    convert.set_defaults(func=cmd_convert)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,44 @@
 from tkinter import messagebox, filedialog
 import tkinter as tk
-import json
 import os
 
 from functools import partial
 import time
 
 from view.rootView import rootView
-from model.sessionModel import sessionModel
-from view.compareView import compareView
-from view.graphView import GraphView
-from view.editView import EditView
-from view.importView import ImportView
-from view.exportView import ExportView
+from model.sessionModel import sessionModel, SESSION_FILETYPES, SAVE_FILETYPES, list_session_files
+from model.binarySession import convert_sessions_folder
+from model.sessionJournal import SessionJournal
+from model.csvImport import CsvImport
+from model.csvExport import export_sessions_long
+from model.sessionCache import load_session as load_cached_session, session_cache
+from model.graphData import GraphData, MultiGraphData
+from model import timing
+from util.backgroundTask import BackgroundTask
+# The other views (and the catalog) are imported where they are first used,
+# so matplotlib and friends stay out of the startup path
 
 class MainController: 
-    def __init__(self):
-        
+    def __init__(self, startup=None):
+        self.startup = startup or {'start': time.perf_counter()}
         
         self.fish_data = []
         self.water_type = "Unspecified/Mixed"
         self.bait_type = "Unspecified/Mixed"
         
-        self.session_data = sessionModel(self.fish_data, self.water_type, self.bait_type)
+        self.ensure_sessions_folder()
+        
+        # Recover whatever was open last time from the crash journal
+        self.journal = SessionJournal(self.sessions_folder)
+        self.session_data = self.journal.recover()
+        if self.session_data is None:
+            self.session_data = sessionModel(self.fish_data, self.water_type, self.bait_type)
+        self.journal.start()
+        self.session_data.attach_journal(self.journal)
+        
+        # SQLite index of the sessions folder, opened on first combine/compare/graph
+        self.catalog = None
+        
         self.rootView = rootView(self.session_data)
         self.rootView.bind("add_fish", self.add_fish)
         self.rootView.bind("bait_change", self.on_bait_change)
@@ -36,7 +52,11 @@ class MainController:
         self.rootView.bind_menu("graph", self.graph_current_session)
         self.rootView.bind_menu("graph_other", self.graph_other_session)
         self.rootView.bind_menu("export", self.export_session)
+        self.rootView.bind_menu("export_all", self.export_all_sessions)
         self.rootView.bind_menu("import", self.import_session)
+        self.rootView.bind_menu("convert", self.convert_sessions)
+        self.rootView.bind_menu("timing", self.show_timing_report)
+        self.rootView.bind_menu("graph_memory", self.show_graph_memory)
         
         #self.rootView.table.bind("<Double-1>", self.edit_fish)
         self.last_click_time = 0
@@ -52,25 +72,78 @@ class MainController:
         
         self.import_window = None
         self.export_window = None
-        
-        self.ensure_sessions_folder()
+        self.csv_import = None
+        self.import_task = None
+        self.export_task = None
+        
+        self.load_task = None
+        self.load_progress = None
+        self.convert_task = None
+        self.convert_progress = None
+        self.combine_task = None
+        self.combine_progress = None
+        
+        self.timing_window = None
+        self.graph_memory_window = None
+        
+        self.startup['constructed'] = time.perf_counter()
+        self.rootView.root.after_idle(self.report_startup)
         self.rootView.mainloop()
         
+    def report_startup(self):
+        # Runs once the main window has been drawn for the first time
+        self.rootView.root.update_idletasks()
+        start = self.startup['start']
+        imported = self.startup.get('imported', start)
+        self.startup_timings = {
+            'import': imported - start,
+            'construct': self.startup['constructed'] - imported,
+            'first_paint': time.perf_counter() - start,
+        }
+        if os.environ.get("FISH_TRACKER_STARTUP_REPORT"):
+            print("Startup: " + ", ".join(f"{name} {seconds * 1000:.1f} ms"
+                                          for name, seconds in self.startup_timings.items()))
+        
+    def get_catalog(self):
+        if self.catalog is None:
+            from model.sessionCatalog import SessionCatalog
+            self.catalog = SessionCatalog(self.sessions_folder)
+        return self.catalog
+        
     def kill(self, *args):
         self.kill_children(args)
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        if self.catalog is not None:
+            self.catalog.close()
+            self.catalog = None
         if self.rootView:
+            self.rootView.scheduler.cancel()
             self.rootView.quit()
             self.rootView = None
         
     def kill_children(self, event=None):
+        self.cancel_load()
         if self.graphView is not None:
             self.graphView.destroy()
             self.graphView = None
         if self.edit_window is not None:  # Destroy edit window if open
             self.edit_window.destroy()
             self.edit_window = None
+        if self.convert_task is not None:
+            self.convert_task.cancel()
+        if self.combine_task is not None:
+            self.combine_task.cancel()
+            self.on_combine_finished(self.combine_task)
+        if self.timing_window is not None:
+            self.timing_window.destroy()
+            self.timing_window = None
+        if self.graph_memory_window is not None:
+            self.graph_memory_window.destroy()
+            self.graph_memory_window = None
         # Clean up other graph views
-        for graph in self.otherGraphViews:
+        for graph in list(self.otherGraphViews):
             if graph is not None:
                 graph.destroy()
         self.otherGraphViews.clear()     
@@ -82,12 +155,12 @@ class MainController:
             os.makedirs(self.sessions_folder)
 
     def new_session(self):
-        if not self.session_data.is_empty():
+        if self.session_data.dirty and not self.session_data.is_empty():
             if messagebox.askyesno("Unsaved Data", "You have unsaved data. Do you want to save it?"):
                 self.save_session()
 
         self.session_data.clear()
-        self.rootView.update_data(self.session_data)  # Refresh the tree view
+        self.refresh_views()  # Refresh the tree view
         self.focus_root()
 
     def on_click(self, event):
@@ -104,6 +177,7 @@ class MainController:
         self.edit_fish(event)
         self.is_double_click = False
 
+    @timing.timed("add_fish")
     def add_fish(self):
         fish_name = self.rootView.get_fish_name().strip()
         index_check = self.session_data.fish_index(fish_name)
@@ -119,7 +193,7 @@ class MainController:
                     "count": fish_count,
                     "missed": missed_count
                 })
-                self.rootView.update_data(self.session_data)
+                self.refresh_views()
                 #self.update_tree(self.session_data)  # Update the tree view
                 self.clear_inputs()
             else:
@@ -132,80 +206,198 @@ class MainController:
         self.rootView.root.focus_force()
              
     def save_session(self):
-        self.session_data.save_session()
+        # Dialogs live in the controller so the model stays usable without Tk
+        file_path = filedialog.asksaveasfilename(defaultextension=".json", initialdir=self.sessions_folder,
+                                                 filetypes=SAVE_FILETYPES)
+        if file_path:
+            self.session_data.save_file(file_path)
+            # Keep the cache and the catalog in sync without re-reading the file
+            session_cache.invalidate(file_path)
+            self.get_catalog().index_file(file_path, self.session_data)
         self.focus_root()
         
     def clear_inputs(self):
         self.rootView.clear_inputs()
         
     def load_session(self):
-        self.session_data = sessionModel.load_session()
-        if self.session_data is not None:
-            self.rootView.update_data(self.session_data)
+        file_path = filedialog.askopenfilename(defaultextension=".json", initialdir=self.sessions_folder,
+                                               filetypes=SESSION_FILETYPES)
+        if not file_path:
+            self.focus_root()
+            return
+        self.start_load(file_path)
+        
+    def start_load(self, file_path):
+        # Parse the file on a worker thread so big sessions don't freeze the window
+        self.cancel_load()
+        from view.progressView import ProgressView
+        self.load_progress = ProgressView(self.rootView.root, "Loading Session", os.path.basename(file_path))
+        
+        def work(progress, cancelled):
+            with timing.span("load_session.parse"):
+                return load_cached_session(file_path, progress, cancelled)
+        
+        self.load_started = time.perf_counter()
+        task = BackgroundTask(self.rootView.root, work)
+        task.bind("progress", self.load_progress.set_progress)
+        task.bind("done", lambda session_data: self.on_session_loaded(task, session_data))
+        task.bind("error", lambda error: self.on_load_error(task, error))
+        self.load_progress.bind("cancel", self.cancel_load)
+        self.load_task = task.start()
+        
+    def cancel_load(self):
+        if self.load_task is not None:
+            self.load_task.cancel()
+            self.load_task = None
+        self.close_load_progress()
+            
+    def close_load_progress(self):
+        if self.load_progress is not None:
+            self.load_progress.destroy()
+            self.load_progress = None
+        
+    def on_session_loaded(self, task, session_data):
+        if task is not self.load_task:
+            return  # a load that was cancelled or replaced
+        self.load_task = None
+        self.close_load_progress()
+        self.replace_session(session_data)
+        # From picking the file to the table showing it
+        timing.record("load_session", time.perf_counter() - self.load_started)
+        if session_data.load_report is not None:
+            messagebox.showwarning("Load Session", "Some fish entries could not be read and were skipped.\n\n"
+                                   + session_data.load_report.summary())
+        self.focus_root()
+        
+    def on_load_error(self, task, error):
+        if task is not self.load_task:
+            return
+        self.load_task = None
+        self.close_load_progress()
+        messagebox.showerror("Error", f"Failed to load session: {str(error)}")
         self.focus_root()
         
+    def convert_sessions(self):
+        if self.convert_task is not None:
+            return
+        if not messagebox.askyesno("Convert Sessions",
+                                   "Write a compact binary copy (.fts) of every JSON session in the sessions folder?"):
+            return
+        
+        folder = self.sessions_folder
+        from view.progressView import ProgressView
+        self.convert_progress = ProgressView(self.rootView.root, "Converting Sessions")
+        task = BackgroundTask(self.rootView.root,
+                              lambda progress, cancelled: convert_sessions_folder(folder, progress=progress, cancelled=cancelled))
+        task.bind("progress", self.convert_progress.set_progress)
+        task.bind("done", lambda result: self.on_converted(*result))
+        task.bind("error", lambda error: self.on_convert_finished(f"Failed to convert sessions: {str(error)}", True))
+        task.bind("cancelled", lambda: self.on_convert_finished(None))
+        self.convert_progress.bind("cancel", task.cancel)
+        self.convert_task = task.start()
+        
+    def on_converted(self, written, failures):
+        message = f"Converted {len(written)} session(s)."
+        if failures:
+            lines = [f"{name}: {reason}" for name, reason in failures[:10]]
+            if len(failures) > 10:
+                lines.append(f"...and {len(failures) - 10} more")
+            message += f"\n\nFailed to convert {len(failures)} file(s):\n" + "\n".join(lines)
+        self.on_convert_finished(message, bool(failures) and not written)
+        
+    def on_convert_finished(self, message, is_error=False):
+        self.convert_task = None
+        if self.convert_progress is not None:
+            self.convert_progress.destroy()
+            self.convert_progress = None
+        if message and is_error:
+            messagebox.showerror("Error", message)
+        elif message:
+            messagebox.showinfo("Convert Sessions", message)
+        
+    def replace_session(self, session_data, dirty=False):
+        # Move the crash journal over to the new session and show it
+        self.session_data.attach_journal(None)
+        self.session_data = session_data
+        self.session_data.dirty = dirty
+        self.session_data.attach_journal(self.journal)
+        self.refresh_views()
+        
+    def refresh_views(self):
+        # Both redraws are deferred and merged by the root view's scheduler
+        self.rootView.update_data(self.session_data)
+        if self.graphView is not None:
+            self.rootView.scheduler.mark_dirty("graph", self.refresh_graph)
+        
+    def refresh_graph(self):
+        if self.graphView is None:
+            return
+        if self.session_data.is_empty():
+            return
+        self.graphView.set_data(GraphData.from_session(self.session_data))
+        
     def on_bait_change(self, *args):
         #print(self.rootView.bait_type_var.get())
         bait = self.rootView.bait_type_var.get()
-        self.session_data.bait_type = bait
+        self.session_data.set_bait_type(bait)
         
     def on_water_change(self, *args):
         #print(self.rootView.water_type_var.get())
         water = self.rootView.water_type_var.get()
-        self.session_data.water_type = water
+        self.session_data.set_water_type(water)
         
     def combine_sessions(self):
-        file_paths = filedialog.askopenfilenames(initialdir=self.sessions_folder, filetypes=[("JSON files", "*.json")])
-        if not file_paths:
+        file_paths = filedialog.askopenfilenames(initialdir=self.sessions_folder, filetypes=SESSION_FILETYPES)
+        if not file_paths or self.combine_task is not None:
             return
 
-        combined_fish_data = []
-        water_types = set()
-        bait_types = set()
+        folder = self.sessions_folder
+        from view.progressView import ProgressView
+        from model.sessionCatalog import SessionCatalog
+        self.combine_progress = ProgressView(self.rootView.root, "Combining Sessions",
+                                             f"Combining {len(file_paths)} session(s)")
 
-        for file_path in file_paths:
-            with open(file_path, 'r') as json_file:
-                session_data = json.load(json_file)
-                water_types.add(session_data.get("water_type", "Fresh Water"))
-                bait_types.add(session_data.get("bait_type", "Bait Paste"))
-                combined_fish_data.extend(session_data.get("fish_data", []))
+        def work(progress, cancelled):
+            # Indexes any new or changed files, then merges the species in SQL.
+            # sqlite connections stay on the thread that opened them, so this one is the worker's own
+            catalog = SessionCatalog(folder)
+            try:
+                with timing.span("combine_sessions.aggregate"):
+                    return catalog.aggregate(file_paths, progress, cancelled)
+            finally:
+                catalog.close()
 
-        # Determine combined water type
-        if len(water_types) == 1:
-            combined_water_type = water_types.pop()
-        else:
-            combined_water_type = "Unspecified/Mixed"
+        self.combine_started = time.perf_counter()
+        task = BackgroundTask(self.rootView.root, work)
+        task.bind("progress", self.combine_progress.set_progress)
+        task.bind("done", lambda combined: self.on_sessions_combined(task, combined))
+        task.bind("error", lambda error: self.on_combine_error(task, error))
+        task.bind("cancelled", lambda: self.on_combine_finished(task))
+        self.combine_progress.bind("cancel", task.cancel)
+        self.combine_task = task.start()
 
-        # Determine combined bait type
-        if len(bait_types) == 1:
-            combined_bait_type = bait_types.pop()
-        else:
-            combined_bait_type = "Unspecified/Mixed"
+    def on_combine_finished(self, task):
+        if task is not self.combine_task:
+            return False
+        self.combine_task = None
+        if self.combine_progress is not None:
+            self.combine_progress.destroy()
+            self.combine_progress = None
+        return True
 
-        # Combine fish data
-        fish_data = self.aggregate_fish_data(combined_fish_data)
-        water_type = combined_water_type
-        bait_type = combined_bait_type
-        self.session_data = sessionModel(fish_data, water_type, bait_type)
-        
-        # Update UI
-        self.rootView.update_data(self.session_data)
+    def on_sessions_combined(self, task, combined):
+        if not self.on_combine_finished(task) or task.cancelled():
+            return
+        # Combined data hasn't been saved anywhere yet
+        self.replace_session(combined, dirty=True)
+        timing.record("combine_sessions", time.perf_counter() - self.combine_started)
         self.focus_root()
-        
-    def aggregate_fish_data(self, fish_data):
-        fish_count_dict = {}
-        for fish in fish_data:
-            name = fish['name']
-            count = fish['count']
-            missed = fish.get('missed', 0)
-            if name in fish_count_dict:
-                fish_count_dict[name]['count'] += count
-                fish_count_dict[name]['missed'] += missed  # Aggregate missed counts
-            else:
-                fish_count_dict[name] = {'name': name, 'count': count, 'missed': missed}
-        return [{'name': fish['name'], 'count': fish['count'], 'missed': fish['missed']} for fish in fish_count_dict.values()]
-    
 
+    def on_combine_error(self, task, error):
+        if not self.on_combine_finished(task):
+            return
+        messagebox.showerror("Error", f"Failed to combine sessions: {str(error)}")
+        
     def save_edit_changes(self):
         if not self.edit_window:
             return
@@ -213,21 +405,21 @@ class MainController:
         fish_name = self.edit_window.original_fish_data['name']
         values = self.edit_window.get_values()
         new_fish_name = values['name']
+        index = self.session_data.fish_index(fish_name)
         index_check = self.session_data.fish_index(new_fish_name)
-        if index_check >= 0 and fish_name != new_fish_name:
+        if index_check >= 0 and index_check != index:
             messagebox.showwarning("Invalid Name", "You cannot reuse a name that already exists")
             return
         try:
             new_fish_count = int(values['count'])
             new_missed_count = int(values['missed'])
             if new_fish_name and new_fish_count >= 0 and new_missed_count >= 0:
-                index = self.session_data.fish_index(fish_name)
                 self.session_data.update_at(index, {
                     "name": new_fish_name, 
                     "count": new_fish_count,
                     "missed": new_missed_count
                 })
-                self.rootView.update_data(self.session_data)
+                self.refresh_views()
                 self.edit_window.destroy()
                 self.edit_window = None
             else:
@@ -245,7 +437,7 @@ class MainController:
             index = self.session_data.fish_index(fish_name)
             if index >= 0:
                 self.session_data.delete_at(index)
-                self.rootView.update_data(self.session_data)
+                self.refresh_views()
                 self.edit_window.destroy()
                 self.edit_window = None
         self.focus_root()
@@ -266,8 +458,8 @@ class MainController:
             self.edit_window.window.focus_force()
             return
         
-        # Check if this is the last selection in the table
-        if selected_item[0] == self.rootView.table.tree.get_children()[-1]:
+        # The Total row can't be edited
+        if self.rootView.table.is_total(selected_item[0]):
             return
 
         item = self.rootView.table.item(selected_item)
@@ -295,62 +487,62 @@ class MainController:
         
         
     def compare_sessions(self):
-        file_paths = filedialog.askopenfilenames(initialdir=self.sessions_folder, title="Select up to 3 JSON files",
-                                                   filetypes=[("JSON files", "*.json")])
+        file_paths = filedialog.askopenfilenames(initialdir=self.sessions_folder, title="Select up to 3 session files",
+                                                   filetypes=SESSION_FILETYPES)
         if not file_paths or len(file_paths) > 3:
             messagebox.showwarning("Selection Error", "Please select up to 3 files.")
             return
 
-        self.compare_table = compareView(self.rootView.root, file_paths)
+        from view.compareView import compareView
+        self.compare_table = compareView(self.rootView.root, file_paths, self.load_other_session)
 
     def graph_current_session(self):
         if self.session_data.is_empty():
             messagebox.showwarning("Empty Session", "There is no data to graph.")
             return
 
-        graph_data = []
-        for fish in self.session_data.fish_data:
-            total_count = self.session_data.calculate_total_caught()
-            total_seen = self.session_data.calculate_total_seen()
-            number_seen = fish['count'] + fish.get('missed', 0)
-            graph_data.append({
-                'name': fish['name'],
-                'count': fish['count'],
-                'missed': fish.get('missed', 0),
-                'percentage': f"{(fish['count'] / total_count * 100):.2f}%" if total_count > 0 else "0.00%",
-                'number_seen': number_seen,
-                'catch_percentage': f"{(fish['count'] / number_seen * 100):.2f}%" if number_seen > 0 else "0.00%",
-                'seen_percentage': f"{(number_seen / total_seen * 100):.2f}%" if total_seen > 0 else "0.00%"
-            })
-        if self.graphView is not None:
-            self.graphView.destroy()
-        self.graphView = GraphView(self.rootView.root, graph_data)
+        with timing.span("graph_current_session"):
+            from view.graphView import GraphView
+            graph_data = GraphData.from_session(self.session_data)
+            if self.graphView is not None:
+                self.graphView.destroy()
+            self.graphView = GraphView(self.rootView.root, graph_data)
+            self.graphView.bind("close", partial(self.on_graph_closed, self.graphView))
 
     def graph_other_session(self):
         #loaded_session = sessionModel.load_session()
-        file_paths = filedialog.askopenfilenames(initialdir=self.sessions_folder, filetypes=[("JSON files", "*.json")])
+        file_paths = filedialog.askopenfilenames(initialdir=self.sessions_folder, filetypes=SESSION_FILETYPES)
         if not file_paths:
             return
         
-        for file_path in file_paths:
-            loaded_session = sessionModel.load_file(file_path)
-            if loaded_session:
-                graph_data = []
-                for fish in loaded_session.fish_data:
-                    total_count = loaded_session.calculate_total_caught()
-                    total_seen = loaded_session.calculate_total_seen()
-                    number_seen = fish['count'] + fish.get('missed', 0)
-                    graph_data.append({
-                        'name': fish['name'],
-                        'count': fish['count'],
-                        'missed': fish.get('missed', 0),
-                        'percentage': f"{(fish['count'] / total_count * 100):.2f}%" if total_count > 0 else "0.00%",
-                        'number_seen': number_seen,
-                        'catch_percentage': f"{(fish['count'] / number_seen * 100):.2f}%" if number_seen > 0 else "0.00%",
-                        'seen_percentage': f"{(number_seen / total_seen * 100):.2f}%" if total_seen > 0 else "0.00%"
-                    })
-                new_graph = GraphView(self.rootView.root, graph_data)
-                self.otherGraphViews.append(new_graph)
+        with timing.span("graph_other_session"):
+            if len(file_paths) == 1:
+                from view.graphView import GraphView
+                loaded_session = self.load_other_session(file_paths[0])
+                new_graph = GraphView(self.rootView.root, GraphData.from_session(loaded_session))
+            else:
+                # One window with every session on the same axes, not a window per file
+                from view.multiGraphView import MultiGraphView
+                labels = [os.path.splitext(os.path.basename(file_path))[0] for file_path in file_paths]
+                sessions = [self.load_other_session(file_path) for file_path in file_paths]
+                new_graph = MultiGraphView(self.rootView.root, MultiGraphData.from_sessions(labels, sessions))
+            new_graph.bind("close", partial(self.on_graph_closed, new_graph))
+            self.otherGraphViews.append(new_graph)
+            
+    def load_other_session(self, file_path):
+        # A saved session for compare/graph, read through the catalog and the session cache
+        session_data = self.get_catalog().load_session(file_path)
+        if session_data.load_report is not None:
+            messagebox.showwarning("Load Session", f"Some fish entries in {os.path.basename(file_path)} "
+                                   "could not be read and were skipped.\n\n" + session_data.load_report.summary())
+        return session_data
+
+    def on_graph_closed(self, graph):
+        # Forget closed windows so their figures can be freed
+        if graph is self.graphView:
+            self.graphView = None
+        elif graph in self.otherGraphViews:
+            self.otherGraphViews.remove(graph)
             
 
     def export_session(self):
@@ -368,6 +560,7 @@ class MainController:
         if self.export_window is not None:
             self.export_window.destroy()
         
+        from view.exportView import ExportView
         self.export_window = ExportView(self.rootView.root)
         self.export_window.bind("export", lambda: self.process_export(file_path))
         self.export_window.bind("close", self.on_export_close)
@@ -384,18 +577,83 @@ class MainController:
             return
             
         try:
-            self.session_data.export_to_csv(file_path, column_names)
+            with timing.span("process_export"):
+                self.session_data.export_to_csv(file_path, column_names)
             self.export_window.destroy()
             self.export_window = None
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export data: {str(e)}")
         
     def on_export_close(self):
+        if self.export_task is not None:
+            self.export_task.cancel()
+            self.export_task = None
         if self.export_window:
             self.export_window = None
             
+    def export_all_sessions(self):
+        file_paths = list_session_files(self.sessions_folder)
+        if not file_paths:
+            messagebox.showwarning("Export", "There are no saved sessions to export.")
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            initialdir=self.sessions_folder,
+            initialfile="all_sessions.csv",
+            filetypes=[("CSV files", "*.csv")]
+        )
+        if not file_path:
+            return
+        
+        if self.export_window is not None:
+            self.export_window.destroy()
+            self.on_export_close()
+        
+        from view.exportView import ExportView
+        self.export_window = ExportView(self.rootView.root, batch=True)
+        self.export_window.bind("export", lambda: self.process_batch_export(file_paths, file_path))
+        self.export_window.bind("close", self.on_export_close)
+        
+    def process_batch_export(self, file_paths, out_path):
+        if not self.export_window or self.export_task is not None:
+            return
+        
+        column_names = self.export_window.get_column_names()
+        if not all(column_names.values()):
+            messagebox.showerror("Error", "All column names must be specified")
+            return
+        
+        # Stream every session into one long-format CSV in the background
+        def work(progress, cancelled):
+            with timing.span("process_batch_export.write"):
+                return export_sessions_long(file_paths, out_path, column_names, progress, cancelled)
+        
+        task = BackgroundTask(self.rootView.root, work)
+        task.bind("progress", self.export_window.set_progress)
+        task.bind("done", lambda rows: self.on_batch_export_finished(task, rows, len(file_paths)))
+        task.bind("error", lambda error: self.on_batch_export_error(task, error))
+        self.export_window.set_busy(True)
+        self.export_task = task.start()
+        
+    def on_batch_export_finished(self, task, rows, session_count):
+        if task is not self.export_task:
+            return
+        self.export_task = None
+        if self.export_window:
+            self.export_window.destroy()
+            self.export_window = None
+        messagebox.showinfo("Export", f"Exported {rows} row(s) from {session_count} session(s).")
+        
+    def on_batch_export_error(self, task, error):
+        if task is not self.export_task:
+            return
+        self.export_task = None
+        if self.export_window:
+            self.export_window.set_busy(False)
+        messagebox.showerror("Error", f"Failed to export data: {str(error)}")
+            
     def import_session(self):
-        print("import session")
         file_path = filedialog.askopenfilename(
             defaultextension=".csv",
             initialdir=self.sessions_folder,
@@ -405,21 +663,26 @@ class MainController:
             return
         
         try:
-            headers = sessionModel.get_csv_headers(file_path)
-            self.show_import_window(file_path, headers)
+            # Opened once, the header is read now and rows are streamed on import
+            csv_import = CsvImport(file_path)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to read CSV file: {str(e)}")
+            return
+        self.show_import_window(csv_import)
         
-    def show_import_window(self, file_path, headers):
+    def show_import_window(self, csv_import):
         if self.import_window is not None:
             self.import_window.destroy()
+            self.on_import_close()
         
-        self.import_window = ImportView(self.rootView.root, headers)
-        self.import_window.bind("import", lambda: self.process_import(file_path))
+        self.csv_import = csv_import
+        from view.importView import ImportView
+        self.import_window = ImportView(self.rootView.root, csv_import.headers)
+        self.import_window.bind("import", self.process_import)
         self.import_window.bind("close", self.on_import_close)
     
-    def process_import(self, file_path):
-        if not self.import_window:
+    def process_import(self):
+        if not self.import_window or self.import_task is not None:
             return
         
         mapping = self.import_window.get_mapping()
@@ -429,20 +692,101 @@ class MainController:
             messagebox.showerror("Error", "Please map all required fields")
             return
         
-        try:
-            fish_data = sessionModel.import_from_csv(file_path, mapping)
-            if fish_data:
-                self.session_data = sessionModel(fish_data, "Unspecified/Mixed", "Unspecified/Mixed")
-                self.rootView.update_data(self.session_data)
-                self.import_window.destroy()
-                self.import_window = None
-            else:
-                messagebox.showerror("Error", "CSV file has invalid data, or column mapping is incorrect")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to import data: {str(e)}")
+        csv_import = self.csv_import
+        
+        def work(progress, cancelled):
+            with timing.span("process_import.parse"):
+                return csv_import.run(mapping, progress, cancelled)
+        
+        self.import_started = time.perf_counter()
+        task = BackgroundTask(self.rootView.root, work)
+        task.bind("progress", self.import_window.set_progress)
+        task.bind("done", lambda result: self.on_import_finished(task, result))
+        task.bind("error", lambda error: self.on_import_error(task, error))
+        self.import_window.set_busy(True)
+        self.import_task = task.start()
+        
+    def on_import_finished(self, task, result):
+        if task is not self.import_task:
+            return  # the import window was closed or replaced
+        self.import_task = None
+        fish_data, report = result
+        if not self.import_window:
+            return
+        if fish_data:
+            self.replace_session(sessionModel(fish_data, "Unspecified/Mixed", "Unspecified/Mixed"), dirty=True)
+            timing.record("process_import", time.perf_counter() - self.import_started)
+            self.import_window.destroy()
+            self.on_import_close()
+            if report.rejected_rows:
+                messagebox.showwarning("Import", report.summary())
+        else:
+            self.import_window.set_busy(False)
+            messagebox.showerror("Error", "CSV file has invalid data, or column mapping is incorrect\n\n" + report.summary())
+            
+    def on_import_error(self, task, error):
+        if task is not self.import_task:
+            return
+        self.import_task = None
+        if self.import_window:
+            self.import_window.set_busy(False)
+        messagebox.showerror("Error", f"Failed to import data: {str(error)}")
         
     def on_import_close(self):
-        if self.import_window:
-            self.import_window = None
+        if self.import_task is not None:
+            self.import_task.cancel()  # the worker closes the file when it stops
+            self.import_task = None
+        elif self.csv_import is not None:
+            self.csv_import.close()
+        self.csv_import = None
+        self.import_window = None
+        
+    def show_timing_report(self):
+        if self.timing_window is not None:
+            self.timing_window.set_report(self.timing_report())
+            self.timing_window.window.focus_force()
+            return
+        
+        from view.timingView import TimingView
+        self.timing_window = TimingView(self.rootView.root, self.timing_report())
+        self.timing_window.bind("refresh", lambda: self.timing_window.set_report(self.timing_report()))
+        self.timing_window.bind("reset", self.reset_timings)
+        self.timing_window.bind("save", self.save_timings)
+        self.timing_window.bind("close", self.on_timing_close)
+        
+    def timing_report(self):
+        scheduler = self.rootView.scheduler
+        from view.figurePool import figure_pool
+        return (timing.timings.report() +
+                f"\n\nRefresh scheduler: {scheduler.renders} render(s), {scheduler.skipped} skipped" +
+                "\n\n" + figure_pool.report())
+        
+    def reset_timings(self):
+        timing.timings.reset()
+        if self.timing_window is not None:
+            self.timing_window.set_report(self.timing_report())
+        
+    def save_timings(self):
+        file_path = filedialog.asksaveasfilename(defaultextension=".json", initialdir=self.sessions_folder,
+                                                 initialfile="timings.json", filetypes=[("JSON files", "*.json")])
+        if file_path:
+            timing.timings.dump(file_path)
+        
+    def on_timing_close(self):
+        self.timing_window = None
+        
+    def show_graph_memory(self):
+        from view.figurePool import figure_pool
+        if self.graph_memory_window is not None:
+            self.graph_memory_window.set_report(figure_pool.report())
+            self.graph_memory_window.window.focus_force()
+            return
+        
+        from view.timingView import TimingView
+        self.graph_memory_window = TimingView(self.rootView.root, figure_pool.report(),
+                                              title="Graph Memory", timing_controls=False)
+        self.graph_memory_window.bind("refresh", lambda: self.graph_memory_window.set_report(figure_pool.report()))
+        self.graph_memory_window.bind("close", self.on_graph_memory_close)
         
-            
\ No newline at end of file
+    def on_graph_memory_close(self):
+        self.graph_memory_window = None
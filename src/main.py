@@ -1,8 +1,18 @@
+import os
+import time
+import tracemalloc
+
+# Opt-in memory tracing for the Debug > Graph Memory window, started before anything is allocated
+if os.environ.get("FISH_TRACKER_TRACEMALLOC"):
+    tracemalloc.start()
+
+_started = time.perf_counter()
 from controller.mainController import MainController
+_imported = time.perf_counter()
 
 
 def main():
-    controller = MainController()
+    controller = MainController(startup={'start': _started, 'imported': _imported})
     
 if __name__ == "__main__":
     main()
\ No newline at end of file
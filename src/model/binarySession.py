@@ -0,0 +1,243 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from model.fishColumns import FishColumns, fish_name_key
+from model.sessionLoader import NotASessionFile, OperationCancelled, read_session_file
+
+# Binary session layout (all integers little-endian):
+#
+#   header      4s magic, u16 version, u16 reserved, u32 species count
+#   water_type  u16 length + utf-8 bytes
+#   bait_type   u16 length + utf-8 bytes
+#   offsets     u32 * (species count + 1), name offsets into the name table
+#   names       utf-8 name table, padded with zeros to a multiple of 8
+#   count       i64 * species count
+#   missed      i64 * species count
+
+MAGIC = b"FTSB"
+VERSION = 1
+EXTENSION = ".fts"
+
+_HEADER = struct.Struct('<4sHHI')
+_LENGTH = struct.Struct('<H')
+_NATIVE_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def is_binary_session(file_path):
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _int64_column(values):
+    column = array('q', values)
+    if not _NATIVE_LITTLE_ENDIAN:
+        column.byteswap()
+    return column.tobytes()
+
+
+def write_binary_session(file_path, fish_data, water_type, bait_type):
+    if not isinstance(fish_data, FishColumns):
+        fish_data = FishColumns(fish_data)
+
+    # Names are stored back to back, name i spans offsets[i]:offsets[i + 1]
+    name_table = bytearray()
+    offsets = array('I', [0])
+    for name in fish_data.names:
+        name_table += name.encode('utf-8')
+        offsets.append(len(name_table))
+    name_table += b"\0" * (-(_header_size(water_type, bait_type) + offsets.itemsize * len(offsets) + len(name_table)) % 8)
+    if not _NATIVE_LITTLE_ENDIAN:
+        offsets.byteswap()
+
+    with open(file_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, len(fish_data)))
+        for text in (water_type, bait_type):
+            encoded = text.encode('utf-8')
+            f.write(_LENGTH.pack(len(encoded)))
+            f.write(encoded)
+        f.write(offsets.tobytes())
+        f.write(name_table)
+        f.write(_int64_column(fish_data.counts))
+        f.write(_int64_column(fish_data.missed))
+
+
+def _header_size(water_type, bait_type):
+    return (_HEADER.size + 2 * _LENGTH.size
+            + len(water_type.encode('utf-8')) + len(bait_type.encode('utf-8')))
+
+
+class BinarySession:
+    """
+    Memory mapped view of a binary session. Counts and names are read from
+    the mapping on demand, nothing is decoded up front.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        with open(file_path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse_header()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse_header(self):
+        data = self._mmap
+        if len(data) < _HEADER.size:
+            raise ValueError(f"Invalid session file: {self.file_path} is too short")
+        magic, version, _, count = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Invalid session file: {self.file_path} is not a binary session")
+        if version > VERSION:
+            raise ValueError(f"Unsupported binary session version {version}")
+        self.species_count = count
+        try:
+            self._parse_layout(data, count)
+        except struct.error:
+            raise ValueError(f"Invalid session file: {self.file_path} is truncated") from None
+
+    def _parse_layout(self, data, count):
+        pos = _HEADER.size
+        strings = []
+        for _ in range(2):
+            (length,) = _LENGTH.unpack_from(data, pos)
+            pos += _LENGTH.size
+            strings.append(bytes(data[pos:pos + length]).decode('utf-8'))
+            pos += length
+        self.water_type, self.bait_type = strings
+
+        self._offsets_start = pos
+        self._names_start = pos + 4 * (count + 1)
+        names_size = struct.unpack_from('<I', data, self._offsets_start + 4 * count)[0]
+        names_end = self._names_start + names_size
+        self._counts_start = names_end + (-names_end % 8)
+        self._missed_start = self._counts_start + 8 * count
+        if self._missed_start + 8 * count > len(data):
+            raise ValueError(f"Invalid session file: {self.file_path} is truncated")
+
+    def __len__(self):
+        return self.species_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def name(self, index):
+        start, end = struct.unpack_from('<II', self._mmap, self._offsets_start + 4 * index)
+        return bytes(self._mmap[self._names_start + start:self._names_start + end]).decode('utf-8')
+
+    def names(self):
+        return [self.name(i) for i in range(self.species_count)]
+
+    def _column(self, start):
+        column = array('q')
+        column.frombytes(self._mmap[start:start + 8 * self.species_count])
+        if not _NATIVE_LITTLE_ENDIAN:
+            column.byteswap()
+        return column
+
+    def count(self, index):
+        return struct.unpack_from('<q', self._mmap, self._counts_start + 8 * index)[0]
+
+    def missed(self, index):
+        return struct.unpack_from('<q', self._mmap, self._missed_start + 8 * index)[0]
+
+    def counts(self):
+        return self._column(self._counts_start)
+
+    def missed_counts(self):
+        return self._column(self._missed_start)
+
+    def total_caught(self):
+        return sum(self.counts())
+
+    def total_missed(self):
+        return sum(self.missed_counts())
+
+    def to_fish_columns(self):
+        return FishColumns.from_columns(self.names(), self.counts(), self.missed_counts())
+
+
+def read_binary_session(file_path, progress=None, cancelled=None):
+    """
+    Load a binary session, merging duplicate names (case insensitive) the
+    same way the JSON loader does.
+    Returns (fish_columns, water_type, bait_type).
+    """
+    if cancelled is not None and cancelled():
+        raise OperationCancelled()
+    with BinarySession(file_path) as session:
+        fish_data = session.to_fish_columns()
+        water_type, bait_type = session.water_type, session.bait_type
+
+    keys = [fish_name_key(name) for name in fish_data.names]
+    if len(set(keys)) < len(keys):
+        merged = FishColumns()
+        positions = {}
+        for key, name, count, missed in zip(keys, fish_data.names, fish_data.counts, fish_data.missed):
+            index = positions.get(key)
+            if index is None:
+                positions[key] = len(merged)
+                merged.append({'name': name, 'count': count, 'missed': missed})
+            else:
+                merged.counts[index] += count
+                merged.missed[index] += missed
+        fish_data = merged
+
+    if progress is not None:
+        progress(1.0)
+    return fish_data, water_type, bait_type
+
+
+def convert_sessions_folder(folder, remove_json=False, progress=None, cancelled=None):
+    """
+    Write a binary copy of every JSON session in folder. Other JSON files
+    (timings.json) are left alone, and a file that fails to convert does not
+    stop the others.
+    Returns (written, failures): the files written and a (file name, reason)
+    pair for each session that could not be converted.
+    """
+    json_files = sorted(name for name in os.listdir(folder) if name.lower().endswith(".json"))
+    written = []
+    failures = []
+    for done, name in enumerate(json_files):
+        if cancelled is not None and cancelled():
+            raise OperationCancelled()
+        json_path = os.path.join(folder, name)
+        binary_path = os.path.splitext(json_path)[0] + EXTENSION
+        try:
+            fish_data, water_type, bait_type = read_session_file(json_path, cancelled=cancelled,
+                                                                 require_fish_data=True)
+        except NotASessionFile:
+            pass
+        except (OSError, ValueError) as e:
+            failures.append((name, str(e)))
+        else:
+            try:
+                write_binary_session(binary_path, fish_data, water_type, bait_type)
+            except OSError as e:
+                failures.append((name, str(e)))
+                # Don't leave a partial copy that would be listed over the JSON
+                if os.path.exists(binary_path):
+                    os.remove(binary_path)
+            else:
+                written.append(binary_path)
+                if remove_json:
+                    os.remove(json_path)
+        if progress is not None:
+            progress((done + 1) / len(json_files), name)
+    return written, failures
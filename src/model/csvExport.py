@@ -0,0 +1,41 @@
+import csv
+import os
+from itertools import repeat
+
+from model.sessionLoader import OperationCancelled
+from model.sessionModel import sessionModel
+
+WRITE_BUFFER = 1 << 20
+
+# Columns of the long format, one row per (session, species)
+LONG_FIELDS = ('session', 'water_type', 'bait_type', 'species', 'count', 'missed')
+
+
+def export_sessions_long(file_paths, out_path, column_names, progress=None, cancelled=None):
+    """
+    Stream many session files into one long-format CSV. Only one session is
+    held in memory at a time. Returns the number of species rows written.
+    """
+    rows_written = 0
+    try:
+        with open(out_path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow([column_names[field] for field in LONG_FIELDS])
+
+            for done, file_path in enumerate(file_paths):
+                if cancelled is not None and cancelled():
+                    raise OperationCancelled()
+                session_name = os.path.splitext(os.path.basename(file_path))[0]
+                session = sessionModel.load_file(file_path)
+                fish_data = session.fish_data
+                writer.writerows(zip(repeat(session_name), repeat(session.water_type), repeat(session.bait_type),
+                                     fish_data.names, fish_data.counts, fish_data.missed))
+                rows_written += len(fish_data)
+                if progress is not None:
+                    progress((done + 1) / len(file_paths), f"{done + 1}/{len(file_paths)}: {session_name}")
+    except BaseException:
+        # Don't leave half an export behind after a cancel or an error
+        if os.path.exists(out_path):
+            os.remove(out_path)
+        raise
+    return rows_written
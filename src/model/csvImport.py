@@ -0,0 +1,145 @@
+import codecs
+import csv
+import locale
+import os
+from itertools import islice
+
+from model.fishColumns import FishColumns, fish_name_key
+from model.sessionLoader import OperationCancelled, ImportReport
+
+CHUNK_ROWS = 5000
+ENCODING = 'utf-8-sig'
+
+
+def _fallback_encoding():
+    # Spreadsheets on Windows export CSV in the ANSI code page (cp1252) rather than UTF-8
+    encoding = locale.getpreferredencoding(False)
+    return 'cp1252' if codecs.lookup(encoding).name == 'utf-8' else encoding
+
+
+class CsvImport:
+    """
+    A CSV file opened once: the header is read up front for the column
+    mapping dialog and the rows are streamed from the same handle by run().
+    Files that are not UTF-8 are read again in the locale's encoding.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.total_bytes = max(os.path.getsize(file_path), 1)
+        self.encoding = ENCODING
+        self._file = None
+        self._consumed = False
+        try:
+            self._open()
+        except UnicodeDecodeError:
+            self._fall_back()
+
+    def _open(self):
+        self.close()
+        self.bytes_read = 0
+        self._file = open(self.file_path, 'rb')
+        self._reader = csv.reader(self._lines())
+        self.headers = next(self._reader, [])
+        self._consumed = False
+
+    def _fall_back(self):
+        if self.encoding != ENCODING:
+            raise ValueError(f"{os.path.basename(self.file_path)} is neither UTF-8 nor {self.encoding}")
+        self.encoding = _fallback_encoding()
+        self._open()
+
+    def _lines(self):
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        for raw in self._file:
+            self.bytes_read += len(raw)
+            yield decoder.decode(raw)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _parsed_rows(self, column_mapping, report):
+        """Yield (name, count, missed) for valid rows, recording the rest in report."""
+        columns = {}
+        for field in ('name', 'count', 'missed'):
+            header = column_mapping[field]
+            if header not in self.headers:
+                raise ValueError(f"Column '{header}' is not in the CSV header")
+            # A repeated header maps to its last column, as csv.DictReader did
+            columns[field] = len(self.headers) - 1 - self.headers[::-1].index(header)
+        name_col, count_col, missed_col = columns['name'], columns['count'], columns['missed']
+        width = max(columns.values()) + 1
+
+        reader = self._reader
+        for row in reader:
+            if not row:
+                continue  # blank line
+            if len(row) < width:
+                report.reject(reader.line_num, f"expected at least {width} columns, found {len(row)}")
+                continue
+            name = row[name_col].strip()
+            if not name:
+                report.reject(reader.line_num, "empty fish name")
+                continue
+            try:
+                count = int(row[count_col])
+            except ValueError:
+                report.reject(reader.line_num, f"count '{row[count_col]}' is not an integer")
+                continue
+            try:
+                missed = int(row[missed_col])
+            except ValueError:
+                report.reject(reader.line_num, f"missed '{row[missed_col]}' is not an integer")
+                continue
+            yield name, count, missed
+
+    def run(self, column_mapping, progress=None, cancelled=None, chunk_rows=CHUNK_ROWS):
+        """
+        Stream the rows in chunks, merging duplicate species (case insensitive)
+        as they arrive. Returns (fish_columns, report).
+        """
+        if self._consumed or self._file is None:
+            self._open()
+        self._consumed = True
+
+        try:
+            try:
+                return self._import(column_mapping, progress, cancelled, chunk_rows)
+            except UnicodeDecodeError:
+                # Not UTF-8 after all, start over in the fallback encoding
+                self._fall_back()
+                self._consumed = True
+                return self._import(column_mapping, progress, cancelled, chunk_rows)
+        finally:
+            self.close()
+
+    def _import(self, column_mapping, progress, cancelled, chunk_rows):
+        report = ImportReport()
+        fish_data = FishColumns()
+        positions = {}
+        rows = self._parsed_rows(column_mapping, report)
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                break
+            for name, count, missed in chunk:
+                key = fish_name_key(name)
+                index = positions.get(key)
+                if index is None:
+                    positions[key] = len(fish_data.names)
+                    fish_data.names.append(name)
+                    fish_data.counts.append(count)
+                    fish_data.missed.append(missed)
+                else:
+                    fish_data.counts[index] += count
+                    fish_data.missed[index] += missed
+            report.imported_rows += len(chunk)
+
+            if cancelled is not None and cancelled():
+                raise OperationCancelled()
+            if progress is not None:
+                progress(self.bytes_read / self.total_bytes,
+                         f"Imported {report.imported_rows} row(s), rejected {report.rejected_rows}")
+        return fish_data, report
@@ -0,0 +1,216 @@
+import sys
+from array import array
+from collections.abc import MutableMapping, MutableSequence
+
+FIELDS = ('name', 'count', 'missed')
+
+# Below this many rows plain python loops beat converting to NumPy, and NumPy stays unimported
+VECTORIZE_MIN_ROWS = 256
+
+_numpy = False  # not imported yet
+
+
+def numpy():
+    """
+    NumPy, imported on first use so it stays out of startup. None when it is
+    not installed, the columns fall back to plain python loops without it.
+    """
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy as module
+        except ImportError:
+            module = None
+        _numpy = module
+    return _numpy
+
+
+def numpy_for(rows):
+    """NumPy for work over this many rows, or None when loops are cheaper (or it is missing)."""
+    return numpy() if rows >= VECTORIZE_MIN_ROWS else None
+
+
+def is_array(value):
+    # Nothing can be an ndarray before NumPy has been imported, so don't import it to find out
+    np = sys.modules.get('numpy')
+    return np is not None and isinstance(value, np.ndarray)
+
+
+def fish_name_key(fish_name):
+    # Key used for all case insensitive name matching
+    return fish_name.casefold()
+
+
+class FishRow(MutableMapping):
+    """Dict-like view of one row in a FishColumns table."""
+
+    __slots__ = ('_columns', '_index')
+
+    def __init__(self, columns, index):
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, key):
+        if key == 'name':
+            return self._columns.names[self._index]
+        elif key == 'count':
+            return self._columns.counts[self._index]
+        elif key == 'missed':
+            return self._columns.missed[self._index]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == 'name':
+            self._columns.names[self._index] = value
+        elif key == 'count':
+            self._columns.counts[self._index] = int(value)
+        elif key == 'missed':
+            self._columns.missed[self._index] = int(value)
+        else:
+            raise KeyError(key)
+
+    def __delitem__(self, key):
+        raise TypeError("Fish rows always have a name, count and missed value")
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def copy(self):
+        return dict(self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class FishColumns(MutableSequence):
+    """
+    Fish data stored as a names list plus packed int64 count/missed columns.
+    Indexing and iterating give FishRow views, so code written against a list
+    of dicts keeps working.
+    """
+
+    def __init__(self, fish_data=()):
+        self.names = []
+        self.counts = array('q')
+        self.missed = array('q')
+        self.extend(fish_data)
+
+    @classmethod
+    def from_columns(cls, names, counts, missed):
+        columns = cls()
+        columns.names = list(names)
+        columns.counts = array('q', counts)
+        columns.missed = array('q', missed)
+        return columns
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [FishRow(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("fish index out of range")
+        return FishRow(self, index)
+
+    def __iter__(self):
+        for i in range(len(self.names)):
+            yield FishRow(self, i)
+
+    def __setitem__(self, index, fish):
+        # Read the values first, the fish may be a view of this same row
+        name, count, missed = fish['name'], int(fish['count']), int(fish.get('missed', 0))
+        self.names[index] = name
+        self.counts[index] = count
+        self.missed[index] = missed
+
+    def __delitem__(self, index):
+        del self.names[index]
+        del self.counts[index]
+        del self.missed[index]
+
+    def insert(self, index, fish):
+        self.names.insert(index, fish['name'])
+        self.counts.insert(index, int(fish['count']))
+        self.missed.insert(index, int(fish.get('missed', 0)))
+
+    def append(self, fish):
+        self.names.append(fish['name'])
+        self.counts.append(int(fish['count']))
+        self.missed.append(int(fish.get('missed', 0)))
+
+    def extend(self, fish_data):
+        for fish in fish_data:
+            self.append(fish)
+
+    def clear(self):
+        self.names.clear()
+        self.counts = array('q')
+        self.missed = array('q')
+
+    def copy(self):
+        return FishColumns.from_columns(self.names, self.counts, self.missed)
+
+    def permute(self, order):
+        """Reorder every column so row i becomes the old row order[i]."""
+        names = self.names
+        self.names = [names[i] for i in order]
+        np = numpy_for(len(order))
+        if np is not None:
+            order = np.asarray(order, dtype=np.intp)
+            self.counts = _packed(np.array(self.counts, dtype=np.int64)[order])
+            self.missed = _packed(np.array(self.missed, dtype=np.int64)[order])
+        else:
+            counts = self.counts
+            missed = self.missed
+            self.counts = array('q', [counts[i] for i in order])
+            self.missed = array('q', [missed[i] for i in order])
+
+    def sort(self, key=None, reverse=False):
+        rows = list(self)
+        if key is None:
+            order = sorted(range(len(rows)), key=lambda i: rows[i]['name'], reverse=reverse)
+        else:
+            order = sorted(range(len(rows)), key=lambda i: key(rows[i]), reverse=reverse)
+        self.permute(order)
+
+    def count_column(self):
+        """Counts as an int64 vector (a NumPy copy when available)."""
+        np = numpy()
+        return np.array(self.counts, dtype=np.int64) if np is not None else list(self.counts)
+
+    def missed_column(self):
+        np = numpy()
+        return np.array(self.missed, dtype=np.int64) if np is not None else list(self.missed)
+
+    def to_list(self):
+        return [{'name': name, 'count': count, 'missed': missed}
+                for name, count, missed in zip(self.names, self.counts, self.missed)]
+
+    def __repr__(self):
+        return f"FishColumns({self.to_list()!r})"
+
+
+def _packed(vector):
+    packed = array('q')
+    packed.frombytes(vector.astype(numpy().int64).tobytes())
+    return packed
+
+
+def sort_permutation(keys, ascending=True):
+    """
+    Stable ordering of row indices by keys, matching list.sort(reverse=...)
+    so equal rows keep their relative order in both directions.
+    """
+    if is_array(keys):
+        np = numpy()
+        if ascending:
+            return np.argsort(keys, kind='stable')
+        n = len(keys)
+        return (n - 1 - np.argsort(keys[::-1], kind='stable'))[::-1]
+    return sorted(range(len(keys)), key=keys.__getitem__, reverse=not ascending)
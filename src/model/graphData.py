@@ -0,0 +1,163 @@
+from model.fishColumns import numpy, is_array, sort_permutation, fish_name_key
+
+
+class GraphData:
+    """
+    What GraphView plots: fish names plus one numeric column per metric, all
+    the same length. Percentages stay numbers (0-100) and are only formatted
+    when a label is drawn. Never changed in place, so a graph worker can keep
+    reading one while the window sorts.
+    """
+
+    METRICS = ("count", "missed", "number_seen", "percentage", "catch_percentage", "seen_percentage")
+
+    def __init__(self, names, columns):
+        self.names = list(names)
+        self.columns = columns  # metric -> numpy array (or list without numpy)
+
+    @classmethod
+    def from_session(cls, session):
+        # The session's memoized stats already hold every column
+        stats = session.stats()
+        return cls(session.fish_data.names, {
+            'count': stats.counts,
+            'missed': stats.missed,
+            'number_seen': stats.seen,
+            'percentage': stats.percentage,
+            'catch_percentage': stats.catch_rate,
+            'seen_percentage': stats.seen_rate,
+        })
+
+    def __len__(self):
+        return len(self.names)
+
+    def column(self, metric):
+        return self.columns[metric]
+
+    def take(self, order):
+        """A new GraphData holding the rows at the given indices, in that order."""
+        # New arrays, so the session's stats the columns came from are left alone
+        if is_array(order):
+            np = numpy()
+            columns = {metric: np.asarray(values)[order] for metric, values in self.columns.items()}
+        else:
+            columns = {metric: [values[i] for i in order] for metric, values in self.columns.items()}
+        return GraphData([self.names[i] for i in order], columns)
+
+    def sorted(self, metric, reverse=False):
+        """A copy with every column reordered by metric, stable like sorted()."""
+        return self.take(sort_permutation(self.columns[metric], ascending=not reverse))
+
+    def top(self, metric, n):
+        """
+        The n rows with the largest metric, in their current order, followed by
+        one "Other" row summing up the rest. Returns self when there are no
+        more than n rows.
+        """
+        if n is None or len(self) <= n:
+            return self
+        return self.fold(top_rows(self.columns[metric], n))
+
+    def fold(self, keep):
+        """The rows at the (sorted) indices in keep, plus one "Other" row for all the others."""
+        if is_array(keep):
+            np = numpy()
+            rest = np.ones(len(self), dtype=bool)
+            rest[keep] = False
+            columns = {m: np.append(np.asarray(column)[keep], self._other(m, np.asarray(column)[rest], rest))
+                       for m, column in self.columns.items()}
+        else:
+            kept = set(keep)
+            rest = [i for i in range(len(self)) if i not in kept]
+            columns = {m: [column[i] for i in keep] + [self._other(m, [column[i] for i in rest], rest)]
+                       for m, column in self.columns.items()}
+        names = [self.names[i] for i in keep]
+        names.append(f"Other ({len(self) - len(keep)})")
+        return GraphData(names, columns)
+
+    def _other(self, metric, values, rest):
+        # Shares of a total add up, the catch rate has to be worked out again
+        if metric == "catch_percentage" and "count" in self.columns and "number_seen" in self.columns:
+            if is_array(rest):
+                np = numpy()
+                caught = np.asarray(self.columns["count"])[rest].sum()
+                seen = np.asarray(self.columns["number_seen"])[rest].sum()
+            else:
+                caught = sum(self.columns["count"][i] for i in rest)
+                seen = sum(self.columns["number_seen"][i] for i in rest)
+            return caught / seen * 100 if seen > 0 else 0
+        return values.sum() if hasattr(values, 'sum') else sum(values)
+
+
+class MultiGraphData:
+    """
+    Several sessions lined up on one species axis: every session's GraphData
+    has the same names in the same order, with zeros for species it never saw.
+    Sorting and top-N go by the metric summed over all sessions.
+    """
+
+    def __init__(self, labels, sessions):
+        self.labels = list(labels)
+        self.sessions = sessions
+
+    @classmethod
+    def from_sessions(cls, labels, sessions):
+        # Union of the species in order of first appearance, matched case insensitively
+        np = numpy()
+        positions = {}
+        names = []
+        for session in sessions:
+            for name in session.fish_data.names:
+                key = fish_name_key(name)
+                if key not in positions:
+                    positions[key] = len(names)
+                    names.append(name)
+
+        aligned = []
+        for session in sessions:
+            data = GraphData.from_session(session)
+            rows = [positions[fish_name_key(name)] for name in data.names]
+            columns = {}
+            for metric, values in data.columns.items():
+                if np is not None:
+                    column = np.zeros(len(names), dtype=np.asarray(values).dtype)
+                    column[rows] = values
+                else:
+                    column = [0] * len(names)
+                    for row, value in zip(rows, values):
+                        column[row] = value
+                columns[metric] = column
+            aligned.append(GraphData(names, columns))
+        return cls(labels, aligned)
+
+    @property
+    def names(self):
+        return self.sessions[0].names if self.sessions else []
+
+    def __len__(self):
+        return len(self.names)
+
+    def column(self, metric):
+        """metric summed over every session."""
+        columns = [data.column(metric) for data in self.sessions]
+        if columns and all(is_array(column) for column in columns):
+            return numpy().sum(columns, axis=0)
+        return [sum(values) for values in zip(*columns)]
+
+    def sorted(self, metric, reverse=False):
+        order = sort_permutation(self.column(metric), ascending=not reverse)
+        return MultiGraphData(self.labels, [data.take(order) for data in self.sessions])
+
+    def top(self, metric, n):
+        if n is None or len(self) <= n:
+            return self
+        keep = top_rows(self.column(metric), n)
+        return MultiGraphData(self.labels, [data.fold(keep) for data in self.sessions])
+
+
+def top_rows(values, n):
+    """Indices of the n largest values (ties to the earlier row), in row order."""
+    if is_array(values):
+        np = numpy()
+        return np.sort(np.argsort(-values, kind='stable')[:n])
+    return sorted(sorted(range(len(values)), key=values.__getitem__, reverse=True)[:n])
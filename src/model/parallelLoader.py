@@ -0,0 +1,108 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+from model.fishColumns import FishColumns, fish_name_key
+from model.sessionModel import sessionModel
+from model.sessionCache import load_session
+from model.sessionLoader import OperationCancelled
+
+# Below this many files a process pool costs more to start than it saves
+PARALLEL_THRESHOLD = 8
+# Seconds between checks of the cancel flag while waiting on the pool
+CANCEL_POLL = 0.1
+
+
+def partial_aggregate(file_path, cached=False):
+    """
+    Parse one session file and return only its per-species totals:
+    (file_path, water_type, bait_type, names, counts, missed).
+    Worker processes parse directly, a cache filled there would die with the
+    process; cached=True goes through the shared session cache instead.
+    """
+    try:
+        session = load_session(file_path) if cached else sessionModel.load_file(file_path)
+    except Exception as e:
+        # Re-raised in the parent, so name the file and keep it picklable
+        raise ValueError(f"{os.path.basename(file_path)}: {e}") from None
+    fish_data = session.fish_data
+    return (file_path, session.water_type, session.bait_type,
+            fish_data.names, fish_data.counts, fish_data.missed)
+
+
+def partial_chunk(file_paths):
+    """partial_aggregate() for a run of files, so each worker round trip carries several."""
+    return [partial_aggregate(file_path) for file_path in file_paths]
+
+
+def load_partials(file_paths, max_workers=None, cancelled=None):
+    """
+    Yield partial_aggregate() for every file, in order, in parallel when there
+    are many. OperationCancelled is raised once cancelled() returns True,
+    without waiting for the files still queued in the pool.
+    """
+    file_paths = list(file_paths)
+    workers = max_workers or os.cpu_count() or 1
+    if len(file_paths) < PARALLEL_THRESHOLD or workers == 1:
+        for file_path in file_paths:
+            if cancelled is not None and cancelled():
+                raise OperationCancelled()
+            yield partial_aggregate(file_path, cached=True)
+        return
+
+    chunksize = max(1, len(file_paths) // (workers * 4))
+    # Spawned, not forked: the app has live threads (journal writer, Tk) that a fork would copy mid-state
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    finished = False
+    try:
+        futures = [pool.submit(partial_chunk, file_paths[start:start + chunksize])
+                   for start in range(0, len(file_paths), chunksize)]
+        for future in futures:
+            while True:
+                if cancelled is not None and cancelled():
+                    raise OperationCancelled()
+                try:
+                    partials = future.result(timeout=CANCEL_POLL)
+                    break
+                except TimeoutError:
+                    continue
+            yield from partials
+        finished = True
+    finally:
+        # On a cancel, an error or an abandoned generator, drop whatever has not started yet
+        pool.shutdown(wait=finished, cancel_futures=not finished)
+
+
+def merge_partials(partials):
+    """
+    Fold partial aggregates into one session. Only one partial and the merged
+    species table are alive at a time, so memory follows the number of unique
+    species rather than the total number of rows.
+    """
+    positions = {}
+    merged = FishColumns()
+    water_types = set()
+    bait_types = set()
+    for _, water_type, bait_type, names, counts, missed in partials:
+        water_types.add(water_type)
+        bait_types.add(bait_type)
+        for name, count, miss in zip(names, counts, missed):
+            key = fish_name_key(name)
+            index = positions.get(key)
+            if index is None:
+                positions[key] = len(merged.names)
+                merged.names.append(name)
+                merged.counts.append(count)
+                merged.missed.append(miss)
+            else:
+                merged.counts[index] += count
+                merged.missed[index] += miss
+
+    water_type = water_types.pop() if len(water_types) == 1 else "Unspecified/Mixed"
+    bait_type = bait_types.pop() if len(bait_types) == 1 else "Unspecified/Mixed"
+    return sessionModel(merged, water_type, bait_type)
+
+
+def aggregate_files(file_paths, max_workers=None):
+    """Combine many session files without going through the catalog."""
+    return merge_partials(load_partials(file_paths, max_workers))
@@ -0,0 +1,123 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from model.sessionModel import sessionModel
+
+DEFAULT_BUDGET_MB = 64
+
+
+def _budget_from_env():
+    # Default budget, override with FISH_TRACKER_CACHE_MB. A bad value must not stop the app from starting
+    try:
+        megabytes = float(os.environ.get("FISH_TRACKER_CACHE_MB", DEFAULT_BUDGET_MB))
+    except ValueError:
+        megabytes = DEFAULT_BUDGET_MB
+    if not 0 <= megabytes < float('inf'):
+        megabytes = DEFAULT_BUDGET_MB  # negative, nan or inf
+    return int(megabytes * 1024 * 1024)
+
+
+DEFAULT_BUDGET = _budget_from_env()
+
+
+def _estimate_size(session):
+    # Rough footprint: the name strings plus 16 bytes of counts per species
+    fish_data = session.fish_data
+    return 256 + sum(sys.getsizeof(name) + 8 for name in fish_data.names) + 16 * len(fish_data)
+
+
+class SessionCache:
+    """
+    Process-wide LRU cache of parsed sessions keyed by (path, mtime, size), so a
+    file is only parsed again after it changes. Entries are evicted least
+    recently used first once max_bytes is exceeded. Callers always get their
+    own copy, the cached session is never handed out.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_BUDGET):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # path -> (mtime, size, session, bytes)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(file_path):
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def set_budget(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def get(self, file_path):
+        stat = os.stat(file_path)
+        key = self._key(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[:2] != (stat.st_mtime, stat.st_size):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _copy(entry[2])
+
+    def put(self, file_path, session, stat=None):
+        stat = stat or os.stat(file_path)
+        key = self._key(file_path)
+        size = _estimate_size(session)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[3]
+            self._entries[key] = (stat.st_mtime, stat.st_size, _copy(session), size)
+            self.current_bytes += size
+            self._evict()
+
+    def get_or_load(self, file_path, loader):
+        session = self.get(file_path)
+        if session is not None:
+            return session
+        # Stat before reading, so a write during the load just causes another miss later
+        stat = os.stat(file_path)
+        session = loader(file_path)
+        self.put(file_path, session, stat)
+        return session
+
+    def invalidate(self, file_path=None):
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                self.current_bytes = 0
+                return
+            old = self._entries.pop(self._key(file_path), None)
+            if old is not None:
+                self.current_bytes -= old[3]
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, old = self._entries.popitem(last=False)
+            self.current_bytes -= old[3]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _copy(session):
+    copy = sessionModel(session.fish_data.copy(), session.water_type, session.bait_type)
+    copy.load_report = session.load_report
+    return copy
+
+
+session_cache = SessionCache()
+
+
+def load_session(file_path, progress=None, cancelled=None):
+    """The shared loader: a cached copy when the file is unchanged, otherwise a fresh parse."""
+    return session_cache.get_or_load(
+        file_path, lambda path: sessionModel.load_file(path, progress, cancelled))
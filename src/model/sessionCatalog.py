@@ -0,0 +1,196 @@
+import os
+import sqlite3
+from contextlib import closing
+
+from model.fishColumns import FishColumns, fish_name_key
+from model.sessionModel import sessionModel, list_session_files
+from model.parallelLoader import load_partials
+from model.sessionCache import load_session
+from model.sessionLoader import OperationCancelled
+
+CATALOG_NAME = "catalog.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    water_type TEXT NOT NULL,
+    bait_type TEXT NOT NULL,
+    total_caught INTEGER NOT NULL,
+    total_missed INTEGER NOT NULL,
+    species_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fish (
+    session_path TEXT NOT NULL REFERENCES sessions(path) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    missed INTEGER NOT NULL,
+    PRIMARY KEY (session_path, position)
+);
+CREATE INDEX IF NOT EXISTS fish_name_key ON fish(name_key);
+"""
+
+
+class SessionCatalog:
+    """
+    SQLite index of the session files in a folder: one row of metadata and
+    totals per file plus its per-species rows. Files are re-read only when
+    their mtime or size changes.
+    """
+
+    def __init__(self, folder, db_path=None):
+        self.folder = folder
+        self.db_path = db_path or os.path.join(folder, CATALOG_NAME)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    @staticmethod
+    def _key(file_path):
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def index_file(self, file_path, session=None, stat=None):
+        """(Re)index one file, using session instead of re-reading it when given."""
+        stat = stat or os.stat(file_path)
+        if session is None:
+            session = load_session(file_path)
+        fish_data = session.fish_data
+        self._store(file_path, stat, session.water_type, session.bait_type,
+                    fish_data.names, fish_data.counts, fish_data.missed)
+
+    def _store(self, file_path, stat, water_type, bait_type, names, counts, missed):
+        path = self._key(file_path)
+        with self.conn:
+            self.conn.execute("DELETE FROM sessions WHERE path = ?", (path,))
+            self.conn.execute(
+                "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, stat.st_mtime, stat.st_size, water_type, bait_type,
+                 sum(counts), sum(missed), len(names)))
+            self.conn.executemany(
+                "INSERT INTO fish VALUES (?, ?, ?, ?, ?, ?)",
+                ((path, position, name, fish_name_key(name), count, miss)
+                 for position, (name, count, miss) in enumerate(zip(names, counts, missed))))
+
+    def refresh(self, file_paths=None, progress=None, cancelled=None):
+        """
+        Bring the catalog in sync with the given files, or with the whole folder
+        when no paths are given (which also drops files that no longer exist).
+        Returns the number of files that were (re)indexed.
+        progress(fraction, text) is called after each indexed file, and
+        OperationCancelled is raised once cancelled() returns True.
+        """
+        full_scan = file_paths is None
+        if full_scan:
+            file_paths = list_session_files(self.folder)
+
+        known = {path: (mtime, size) for path, mtime, size
+                 in self.conn.execute("SELECT path, mtime, size FROM sessions")}
+        stale = {}
+        for file_path in file_paths:
+            stat = os.stat(file_path)
+            if known.get(self._key(file_path)) != (stat.st_mtime, stat.st_size):
+                stale[file_path] = stat
+
+        # Parse the changed files in parallel, each worker sends back only its species totals
+        try:
+            # Closing the generator shuts the pool down without waiting for queued files
+            with closing(load_partials(stale, cancelled=cancelled)) as partials:
+                for done, (file_path, water_type, bait_type, names, counts, missed) in enumerate(partials):
+                    self._store(file_path, stale[file_path], water_type, bait_type, names, counts, missed)
+                    if cancelled is not None and cancelled():
+                        raise OperationCancelled()
+                    if progress is not None:
+                        progress((done + 1) / len(stale), f"Indexed {done + 1}/{len(stale)}: {os.path.basename(file_path)}")
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            raise ValueError(f"Could not index session files: {e}") from e
+        updated = len(stale)
+
+        if full_scan:
+            present = {self._key(file_path) for file_path in file_paths}
+            gone = [(path,) for path in known if path not in present]
+            with self.conn:
+                self.conn.executemany("DELETE FROM sessions WHERE path = ?", gone)
+        return updated
+
+    def forget(self, file_path):
+        with self.conn:
+            self.conn.execute("DELETE FROM sessions WHERE path = ?", (self._key(file_path),))
+
+    def _select(self, file_paths):
+        # A temp table instead of a huge IN (...) list
+        with self.conn:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS selected (path TEXT PRIMARY KEY)")
+            self.conn.execute("DELETE FROM selected")
+            self.conn.executemany("INSERT OR IGNORE INTO selected VALUES (?)",
+                                  ((self._key(file_path),) for file_path in file_paths))
+
+    def aggregate(self, file_paths, progress=None, cancelled=None):
+        """
+        Combine the given sessions in SQL, merging species by case insensitive
+        name. Returns a sessionModel; water/bait type are kept only when every
+        session agrees.
+        """
+        self.refresh(file_paths, progress, cancelled)
+        self._select(file_paths)
+
+        water_types = [row[0] for row in self.conn.execute(
+            "SELECT DISTINCT water_type FROM sessions JOIN selected USING (path)")]
+        bait_types = [row[0] for row in self.conn.execute(
+            "SELECT DISTINCT bait_type FROM sessions JOIN selected USING (path)")]
+
+        # SQLite takes the bare 'name' column from the row that holds MIN(rowid),
+        # so each species keeps the spelling it was first indexed with
+        rows = self.conn.execute(
+            "SELECT name, SUM(count), SUM(missed), MIN(fish.rowid) AS first "
+            "FROM fish JOIN selected ON fish.session_path = selected.path "
+            "GROUP BY name_key ORDER BY first")
+        names = []
+        counts = []
+        missed = []
+        for name, count, miss, _ in rows:
+            names.append(name)
+            counts.append(count)
+            missed.append(miss)
+
+        water_type = water_types[0] if len(water_types) == 1 else "Unspecified/Mixed"
+        bait_type = bait_types[0] if len(bait_types) == 1 else "Unspecified/Mixed"
+        return sessionModel(FishColumns.from_columns(names, counts, missed), water_type, bait_type)
+
+    def load_session(self, file_path):
+        """
+        Read one session through the shared session cache, parsing the file at
+        most once, and index it when the catalog's copy is out of date. The
+        session keeps its load_report of skipped entries.
+        """
+        stat = os.stat(file_path)
+        session = load_session(file_path)
+        if self._is_stale(file_path, stat):
+            self.index_file(file_path, session, stat)
+        return session
+
+    def _is_stale(self, file_path, stat):
+        row = self.conn.execute("SELECT mtime, size FROM sessions WHERE path = ?",
+                                (self._key(file_path),)).fetchone()
+        return row is None or tuple(row) != (stat.st_mtime, stat.st_size)
+
+    def totals(self, file_paths=None):
+        """(sessions, total caught, total missed) over the given files or the whole catalog."""
+        if file_paths is None:
+            return self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(total_caught), 0), COALESCE(SUM(total_missed), 0) FROM sessions").fetchone()
+        self.refresh(file_paths)
+        self._select(file_paths)
+        return self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(total_caught), 0), COALESCE(SUM(total_missed), 0) "
+            "FROM sessions JOIN selected USING (path)").fetchone()
@@ -0,0 +1,185 @@
+import json
+import os
+import threading
+
+from model.fishColumns import FishColumns
+from model.sessionModel import sessionModel
+
+JOURNAL_NAME = "autosave.journal"
+SNAPSHOT_NAME = "autosave.snapshot"
+
+
+class SessionJournal:
+    """
+    Append-only log of session mutations kept under the sessions folder so an
+    unsaved session survives a crash.
+
+    record() only queues the entry, a writer thread appends everything queued
+    since its last pass and fsyncs once per batch (group commit). Every
+    snapshot_every records the full session is written to a snapshot file and
+    the log is truncated, so replay stays short.
+    """
+
+    def __init__(self, folder, snapshot_every=500, commit_interval=0.25):
+        self.journal_path = os.path.join(folder, JOURNAL_NAME)
+        self.snapshot_path = os.path.join(folder, SNAPSHOT_NAME)
+        self.snapshot_every = snapshot_every
+        self.commit_interval = commit_interval
+
+        self.records_since_snapshot = 0
+        # Every record gets a sequence number, snapshots remember the last one they cover
+        self._seq = 0
+        self._pending = []
+        self._condition = threading.Condition()
+        # Held while the writer reads a snapshot's fish data
+        self._snapshot_lock = threading.Lock()
+        self._closed = False
+        self._writing = False
+        self._journal_file = None
+        self._thread = None
+
+    def start(self):
+        self._journal_file = open(self.journal_path, 'a', encoding='utf-8')
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+        return self
+
+    def record(self, op, **fields):
+        fields['op'] = op
+        with self._condition:
+            self._seq += 1
+            fields['seq'] = self._seq
+            self._pending.append(('record', fields))
+            self.records_since_snapshot += 1
+            self._condition.notify()
+
+    def needs_snapshot(self):
+        return self.records_since_snapshot >= self.snapshot_every
+
+    def snapshot(self, session):
+        """
+        Queue a snapshot of session. Its fish data is not copied here, the
+        writer thread serializes the live columns, so the session has to call
+        release() with the returned state before it changes them.
+        """
+        state = {
+            "water_type": session.water_type,
+            "bait_type": session.bait_type,
+            "dirty": session.dirty,
+            "fish_data": session.fish_data,
+        }
+        with self._condition:
+            state["seq"] = self._seq
+            self._pending.append(('snapshot', state))
+            self.records_since_snapshot = 0
+            self._condition.notify()
+        return state
+
+    def release(self, state):
+        # Only copy when the writer has not serialized the snapshot yet
+        with self._snapshot_lock:
+            if not state.get("written"):
+                state["fish_data"] = state["fish_data"].copy()
+
+    def flush(self):
+        """Block until everything queued so far is on disk."""
+        with self._condition:
+            while (self._pending or self._writing) and self._thread is not None and self._thread.is_alive():
+                self._condition.notify()
+                self._condition.wait(self.commit_interval)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+
+    def _writer(self):
+        while True:
+            with self._condition:
+                if not self._pending and not self._closed:
+                    self._condition.wait(self.commit_interval)
+                batch = self._pending
+                self._pending = []
+                self._writing = bool(batch)
+                closed = self._closed
+            if batch:
+                try:
+                    self._write_batch(batch)
+                finally:
+                    with self._condition:
+                        self._writing = False
+                        self._condition.notify_all()  # wake flush()
+            if closed and not batch:
+                return
+
+    def _write_batch(self, batch):
+        lines = []
+        for kind, value in batch:
+            if kind == 'record':
+                lines.append(json.dumps(value))
+                continue
+            # A snapshot covers everything logged before it, drop those lines
+            self._write_snapshot(value)
+            lines = []
+            self._journal_file.close()
+            self._journal_file = open(self.journal_path, 'w', encoding='utf-8')
+            self._sync(self._journal_file)
+        if lines:
+            self._journal_file.write("\n".join(lines) + "\n")
+            self._sync(self._journal_file)
+
+    def _write_snapshot(self, state):
+        with self._snapshot_lock:
+            fish_data = state["fish_data"].to_list()
+            state["written"] = True
+        state = dict(state, fish_data=fish_data)
+        del state["written"]
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            self._sync(f)
+        os.replace(tmp_path, self.snapshot_path)
+
+    @staticmethod
+    def _sync(f):
+        f.flush()
+        os.fsync(f.fileno())
+
+    def recover(self):
+        """
+        Rebuild the last session from the snapshot plus the journal.
+        Returns None when there is nothing to recover.
+        """
+        if not os.path.exists(self.snapshot_path) and not os.path.exists(self.journal_path):
+            return None
+
+        session = sessionModel([], "Unspecified/Mixed", "Unspecified/Mixed")
+        covered = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            session = sessionModel(FishColumns(state.get("fish_data", [])),
+                                   state.get("water_type", "Unspecified/Mixed"),
+                                   state.get("bait_type", "Unspecified/Mixed"))
+            session.dirty = state.get("dirty", False)
+            covered = state.get("seq", 0)
+
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # torn write at the end of the log
+                    # Entries already in the snapshot are left over from a crash mid-compaction
+                    if entry.get('seq', 0) > covered:
+                        session.replay(entry)
+                    covered = max(covered, entry.get('seq', 0))
+        self._seq = max(self._seq, covered)
+        return session
@@ -0,0 +1,230 @@
+import codecs
+import json
+import os
+from array import array
+
+from model.fishColumns import FishColumns, fish_name_key
+
+CHUNK_SIZE = 1 << 16
+PROGRESS_EVERY = 2048  # fish entries between progress reports / cancel checks
+MAX_REPORTED_ERRORS = 100
+
+_WHITESPACE = ' \t\r\n'
+
+
+class OperationCancelled(Exception):
+    """Raised inside a long running model operation when the caller cancels it."""
+
+
+class NotASessionFile(ValueError):
+    """Raised by read_session_file(require_fish_data=True) for JSON that is not a session."""
+
+
+class ImportReport:
+    """
+    Outcome of reading rows from a file, keeping at most max_errors rejected
+    rows. location names what the numbers in the report refer to.
+    """
+
+    def __init__(self, max_errors=MAX_REPORTED_ERRORS, location="Line"):
+        self.max_errors = max_errors
+        self.location = location
+        self.imported_rows = 0
+        self.rejected_rows = 0
+        self.errors = []  # (line number, reason)
+
+    def reject(self, line_number, reason):
+        self.rejected_rows += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line_number, reason))
+
+    def summary(self, max_lines=10):
+        lines = [f"Imported {self.imported_rows} row(s), rejected {self.rejected_rows}."]
+        for line_number, reason in self.errors[:max_lines]:
+            lines.append(f"{self.location} {line_number}: {reason}")
+        if self.rejected_rows > max_lines:
+            lines.append(f"...and {self.rejected_rows - max_lines} more")
+        return "\n".join(lines)
+
+
+class _JsonStream:
+    """
+    Minimal incremental reader over a JSON file, decoding one value at a time
+    from a bounded buffer instead of loading the whole document.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(CHUNK_SIZE)
+        self.bytes_read += len(chunk)
+        if not chunk:
+            self.eof = True
+            self.buf = self.buf[self.pos:] + self.text_decoder.decode(b"", final=True)
+        else:
+            self.buf = self.buf[self.pos:] + self.text_decoder.decode(chunk)
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            buf = self.buf
+            pos = self.pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid session file: expected '{char}' but found '{found or 'end of file'}'")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the very end of the buffer might continue in the next chunk
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_session_json(f):
+    """
+    Yield ('meta', key, value) for top level fields and ('fish', None, entry)
+    for each element of fish_data, reading the file incrementally. An empty
+    fish_data list is yielded as ('meta', 'fish_data', []).
+    """
+    stream = _JsonStream(f)
+    stream.expect('{')
+    if stream.peek() == '}':
+        return
+    while True:
+        key = stream.value()
+        stream.expect(':')
+        if key == "fish_data" and stream.peek() == '[':
+            stream.expect('[')
+            if stream.peek() == ']':
+                stream.pos += 1
+                yield 'meta', key, []
+            else:
+                while True:
+                    yield 'fish', None, stream.value()
+                    if stream.peek() == ',':
+                        stream.pos += 1
+                    else:
+                        stream.expect(']')
+                        break
+        else:
+            yield 'meta', key, stream.value()
+
+        if stream.peek() == ',':
+            stream.pos += 1
+        else:
+            stream.expect('}')
+            return
+
+
+def _fish_entry(value):
+    """(name, count, missed) from one fish_data entry, ValueError if it is malformed."""
+    if not isinstance(value, dict) or not isinstance(value.get('name'), str):
+        raise ValueError("entry has no fish name")
+    try:
+        # Counts written as floats (1.0) were accepted before, keep taking them
+        count = int(value['count'])
+        missed = int(value.get('missed', 0))
+    except KeyError:
+        raise ValueError(f"'{value['name']}' has no count") from None
+    except (TypeError, ValueError):
+        raise ValueError(f"'{value['name']}' has a count that is not a number") from None
+    return value['name'], count, missed
+
+
+def read_session_file(file_path, progress=None, cancelled=None, report=None, require_fish_data=False):
+    """
+    Stream a session file, defaulting 'missed' and merging duplicate names
+    (case insensitive) in a single pass.
+    Returns (fish_columns, water_type, bait_type).
+    Malformed fish entries are skipped and recorded in report (an
+    ImportReport numbering the entries from 1) when one is given.
+    progress(fraction) is called periodically, and OperationCancelled is raised
+    as soon as cancelled() returns True. With require_fish_data a file without
+    a fish_data list raises NotASessionFile.
+    """
+    water_type = "Unspecified/Mixed"
+    bait_type = "Unspecified/Mixed"
+    positions = {}
+    names = []
+    counts = array('q')
+    missed = array('q')
+
+    entry = 0
+    has_fish_data = False
+    total_bytes = max(os.path.getsize(file_path), 1)
+    with open(file_path, 'rb') as f:
+        events = iter_session_json(f)
+        for seen, (kind, key, value) in enumerate(events):
+            if kind == 'fish':
+                has_fish_data = True
+                entry += 1
+                try:
+                    name, count, miss = _fish_entry(value)
+                except ValueError as e:
+                    if report is not None:
+                        report.reject(entry, str(e))
+                    continue
+                if report is not None:
+                    report.imported_rows += 1
+                name_key = fish_name_key(name)
+                index = positions.get(name_key)
+                if index is None:
+                    positions[name_key] = len(names)
+                    names.append(name)
+                    counts.append(count)
+                    missed.append(miss)
+                else:
+                    counts[index] += count
+                    missed[index] += miss
+            elif key == "fish_data":
+                has_fish_data = isinstance(value, list)
+            elif key == "water_type":
+                water_type = value
+            elif key == "bait_type":
+                bait_type = value
+
+            if seen % PROGRESS_EVERY == 0:
+                if cancelled is not None and cancelled():
+                    raise OperationCancelled()
+                if progress is not None:
+                    progress(f.tell() / total_bytes)
+
+    if require_fish_data and not has_fish_data:
+        raise NotASessionFile(f"{os.path.basename(file_path)} is not a session file")
+    if progress is not None:
+        progress(1.0)
+
+    fish_data = FishColumns()
+    fish_data.names = names
+    fish_data.counts = counts
+    fish_data.missed = missed
+    return fish_data, water_type, bait_type
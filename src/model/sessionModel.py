@@ -1,95 +1,238 @@
 import json
 import os
 import csv
-from tkinter import filedialog
+
+from model.fishColumns import FishColumns, fish_name_key, sort_permutation
+from model.sessionLoader import read_session_file, ImportReport
+from model.binarySession import EXTENSION as BINARY_EXTENSION, is_binary_session, read_binary_session, write_binary_session
+from model.sessionStats import SessionStats
+from model.csvImport import CsvImport
+
+# File dialogs accept both the JSON and the compact binary session format
+SESSION_FILETYPES = [("Session files", f"*.json *{BINARY_EXTENSION}"), ("JSON files", "*.json"),
+                     ("Binary sessions", f"*{BINARY_EXTENSION}")]
+SAVE_FILETYPES = [("JSON files", "*.json"), ("Binary sessions", f"*{BINARY_EXTENSION}")]
+
+def list_session_files(folder):
+    """
+    Every session file in folder, sorted by name. When a session exists in
+    both formats (after converting the folder) only the newer copy is listed,
+    the binary one if they have the same mtime.
+    """
+    if not os.path.isdir(folder):
+        return []
+    sessions = {}  # stem -> (mtime, prefer binary, path)
+    for name in os.listdir(folder):
+        stem, ext = os.path.splitext(name)
+        ext = ext.lower()
+        if ext != BINARY_EXTENSION and ext != ".json":
+            continue
+        path = os.path.join(folder, name)
+        entry = (os.path.getmtime(path), ext == BINARY_EXTENSION, path)
+        if stem not in sessions or entry > sessions[stem]:
+            sessions[stem] = entry
+    return sorted(path for _, _, path in sessions.values())
 
 class sessionModel:
     def __init__(self, data, water_type, bait_type):
-        self.fish_data = data
+        # Fish data is kept columnar, rows still read like {'name', 'count', 'missed'} dicts
+        self.fish_data = data if isinstance(data, FishColumns) else FishColumns(data)
         self.water_type = water_type
         self.bait_type = bait_type
+        # casefolded fish name -> position in fish_data
+        self._name_index = {}
+        self.rebuild_index()
+        # Bumped on every change to fish_data, used to memoize stats()
+        self.version = 0
+        self._stats = None
+        # Crash recovery log, attached by the controller for the live session
+        self.journal = None
+        self._snapshot = None  # (journal, state) of a snapshot still sharing fish_data
+        self.dirty = False
+        # Fish entries load_file had to skip, None when the file was clean
+        self.load_report = None
         
     def is_empty(self):
         return len(self.fish_data) < 1
     
-    def save_session(self):
-        self.sessions_folder = os.path.join(os.getcwd(), "sessions")
-        file_path = filedialog.asksaveasfilename(defaultextension=".json", initialdir=self.sessions_folder, 
-                                                   filetypes=[("JSON files", "*.json")])
-        if not file_path:
-            return
-
-        session_data = {
-            "water_type": self.water_type,
-            "bait_type": self.bait_type,
-            "fish_data": self.fish_data
-        }
-        
-        with open(file_path, 'w') as f:
-            json.dump(session_data, f, indent=4)
+    def save_file(self, file_path):
+        # The extension picks the format, anything but .fts is written as JSON
+        if file_path.lower().endswith(BINARY_EXTENSION):
+            write_binary_session(file_path, self.fish_data, self.water_type, self.bait_type)
+        else:
+            session_data = {
+                "water_type": self.water_type,
+                "bait_type": self.bait_type,
+                "fish_data": self.fish_data.to_list()
+            }
+            
+            with open(file_path, 'w') as f:
+                json.dump(session_data, f, indent=4)
+        self._log("saved", dirty=False, path=file_path)
+        self.dirty = False
             
     def clear(self):
+        self._release_snapshot()
         self.fish_data.clear()  # Clear the data
+        self._name_index.clear()
+        self.touch()
         self.water_type = "Unspecified/Mixed"
         self.bait_type = "Unspecified/Mixed"
+        self._log("clear")
+        self.dirty = False
+        
+    def attach_journal(self, journal):
+        # Log every following change, starting from a snapshot of the current state
+        self._release_snapshot()
+        self.journal = journal
+        if journal is not None:
+            self._snapshot = (journal, journal.snapshot(self))
+            
+    def _release_snapshot(self):
+        # Called before fish_data changes, the journal copies it if it has not been written yet
+        if self._snapshot is not None:
+            journal, state = self._snapshot
+            journal.release(state)
+            self._snapshot = None
+            
+    def _log(self, op, dirty=True, **fields):
+        # Sorting is journaled but is not an unsaved change
+        if dirty:
+            self.dirty = True
+        if self.journal is None:
+            return
+        self.journal.record(op, **fields)
+        if self.journal.needs_snapshot():
+            self._release_snapshot()
+            self._snapshot = (self.journal, self.journal.snapshot(self))
+            
+    def replay(self, entry):
+        """Apply one journal entry without logging it again."""
+        journal, self.journal = self.journal, None
+        try:
+            op = entry['op']
+            if op == "add":
+                self.add_fish(entry['fish'])
+            elif op == "update":
+                self.update_at(entry['index'], entry['fish'])
+            elif op == "delete":
+                self.delete_at(entry['index'])
+            elif op == "sort":
+                self.sort_data(entry['col'], entry['ascending'])
+            elif op == "clear":
+                self.clear()
+            elif op == "water":
+                self.set_water_type(entry['value'])
+            elif op == "bait":
+                self.set_bait_type(entry['value'])
+            elif op == "saved":
+                self.dirty = False
+        finally:
+            self.journal = journal
+            
+    def set_water_type(self, water_type):
+        if water_type != self.water_type:
+            self.water_type = water_type
+            self._log("water", value=water_type)
+            
+    def set_bait_type(self, bait_type):
+        if bait_type != self.bait_type:
+            self.bait_type = bait_type
+            self._log("bait", value=bait_type)
+        
+    def touch(self):
+        # Mark fish_data as changed so cached stats get rebuilt
+        self.version += 1
+        
+    def stats(self):
+        if self._stats is None or self._stats.version != self.version:
+            self._stats = SessionStats(self.fish_data, self.version)
+        return self._stats
+        
+    @staticmethod
+    def name_key(fish_name):
+        # Key used for all case insensitive name matching
+        return fish_name_key(fish_name)
+        
+    def rebuild_index(self):
+        self._name_index.clear()
+        for index, name in enumerate(self.fish_data.names):
+            # Keep the first position if the data still contains duplicates
+            self._name_index.setdefault(sessionModel.name_key(name), index)
+        
+    def _reindex_from(self, start):
+        # Positions at or after start have shifted, repair their entries
+        names = self.fish_data.names
+        for index in range(start, len(names)):
+            key = sessionModel.name_key(names[index])
+            current = self._name_index.get(key)
+            if current is None or current > index:
+                self._name_index[key] = index
         
     def fish_index(self, fish_name):
-        for index, fish in enumerate(self.fish_data):
-            if fish['name'].lower() == fish_name.lower():  # Case insensitive comparison
-                return index
-        return -1  # Return -1 if the fish is not found
+        # Case insensitive lookup, -1 if the fish is not found
+        return self._name_index.get(sessionModel.name_key(fish_name), -1)
         
     def add_fish(self, fish):
         if 'missed' not in fish:
             fish['missed'] = 0
+        self._release_snapshot()
         self.fish_data.append(fish)
+        self._name_index.setdefault(sessionModel.name_key(fish['name']), len(self.fish_data) - 1)
+        self.touch()
+        self._log("add", fish={'name': fish['name'], 'count': fish['count'], 'missed': fish['missed']})
         
     def update_at(self, index, f):
+        old_key = sessionModel.name_key(self.fish_data.names[index])
+        self._release_snapshot()
         self.fish_data[index] = f
+        self.touch()
+        self._log("update", index=index, fish={'name': f['name'], 'count': f['count'], 'missed': f.get('missed', 0)})
+        new_key = sessionModel.name_key(f['name'])
+        if old_key != new_key:
+            if self._name_index.get(old_key) == index:
+                del self._name_index[old_key]
+                if len(self._name_index) < len(self.fish_data) - 1:
+                    self._reindex_from(index + 1)  # a later duplicate may take over the old name
+            current = self._name_index.get(new_key)
+            if current is None or current > index:
+                self._name_index[new_key] = index
 
     def calculate_total_caught(self):
-        return sum(fish['count'] for fish in self.fish_data)
+        return self.stats().total_caught
 
     def calculate_total_missed(self):
-        return sum(fish.get('missed', 0) for fish in self.fish_data)
+        return self.stats().total_missed
 
     def calculate_total_seen(self):
-        return self.calculate_total_caught() + self.calculate_total_missed()
+        return self.stats().total_seen
     
     def delete_at(self, index):
         if 0 <= index < len(self.fish_data):
+            key = sessionModel.name_key(self.fish_data.names[index])
+            self._release_snapshot()
             del self.fish_data[index]
+            self.touch()
+            self._log("delete", index=index)
+            if self._name_index.get(key) == index:
+                del self._name_index[key]
+            self._reindex_from(index)
         else:
             raise IndexError("Index out of range for deleting fish entry.")
         
-    @staticmethod
-    def load_session():
-        sessions_folder = os.path.join(os.getcwd(), "sessions")
-        file_path = filedialog.askopenfilename(defaultextension=".json", initialdir=sessions_folder, 
-                                                filetypes=[("JSON files", "*.json")])
-        if not file_path:
-            return None
-
-        return sessionModel.load_file(file_path)
-    
-    
-    
     def sort_data(self, col, ascending=True):
         """Sort the fish data based on the given column."""
-        self.fish_data.sort(
-            key=lambda x: sessionModel._sort_key(
-                x, col, 
-                self.calculate_total_caught(), 
-                self.calculate_total_seen()
-            ),
-            reverse=not ascending
-        )
+        keys = sessionModel._sort_values(self.fish_data, self.stats(), col)
+        self._release_snapshot()
+        self.fish_data.permute(sort_permutation(keys, ascending))
+        self.rebuild_index()
+        self.touch()
+        self._log("sort", dirty=False, col=col, ascending=ascending)
 
     def export_to_csv(self, file_path, column_names):
         """
         Export fish data to CSV with custom column names
         """
-        import csv
         with open(file_path, 'w', newline='') as csvfile:
             writer = csv.writer(csvfile)
             # Write header with custom column names
@@ -98,41 +241,41 @@ class sessionModel:
                 column_names['count'],
                 column_names['missed']
             ])
-            # Write data
-            for fish in self.fish_data:
-                writer.writerow([
-                    fish['name'],
-                    fish['count'],
-                    fish.get('missed', 0)
-                ])
+            # Write data straight from the columns
+            fish_data = self.fish_data
+            writer.writerows(zip(fish_data.names, fish_data.counts, fish_data.missed))
 
     @staticmethod
-    def load_file(file_path):
-        with open(file_path, 'r') as f:
-            session_data = json.load(f)
-        
-          
-        wt = session_data.get("water_type", "Unspecified/Mixed")
-        bt = session_data.get("bait_type", "Unspecified/Mixed")
-        fd = session_data.get("fish_data", [])
-        # Ensure each fish has a 'missed' value
-        for fish in fd:
-            if 'missed' not in fish:
-                fish['missed'] = 0
-        
-        # Combine fish entries with the same name
-        combined_fish_data = {}
-        for fish in fd:
-            name = fish['name']
-            if name in combined_fish_data:
-                combined_fish_data[name]['count'] += fish['count']
-                combined_fish_data[name]['missed'] += fish['missed']
-            else:
-                combined_fish_data[name] = fish.copy()
-        
-        # Convert the combined data back to a list
-        fd = list(combined_fish_data.values())
-        return sessionModel(fd, wt, bt)
+    def load_file(file_path, progress=None, cancelled=None):
+        # Streams the file, defaulting 'missed' and merging duplicate names in one pass
+        report = None
+        if is_binary_session(file_path):
+            fd, wt, bt = read_binary_session(file_path, progress, cancelled)
+        else:
+            report = ImportReport(location="Entry")
+            fd, wt, bt = read_session_file(file_path, progress, cancelled, report)
+        session = sessionModel(fd, wt, bt)
+        if report is not None and report.rejected_rows:
+            session.load_report = report
+        return session
+    
+    @staticmethod
+    def _sort_values(fish_data, stats, col):
+        """Sort keys for every row, taken from precomputed stats where possible."""
+        if col == "Percentage":
+            return stats.percentage
+        elif col == "Number Seen":
+            return stats.seen
+        elif col == "Catch Percentage":
+            return stats.catch_rate
+        elif col == "Seen Percentage":
+            return stats.seen_rate
+        elif col == "Count":
+            return stats.counts
+        elif col == "Missed":
+            return stats.missed
+        else:
+            return fish_data.names
     
     @staticmethod
     def _sort_key(fish, col, total_count, total_seen):
@@ -167,6 +310,22 @@ class sessionModel:
         return fish_data
     
 
+    @staticmethod
+    def aggregate_fish_data(fish_data):
+        # Static method to merge the entries of any fish data list by name (case insensitive, first spelling wins)
+        fish_count_dict = {}
+        for fish in fish_data:
+            name = fish['name']
+            key = fish_name_key(name)
+            count = fish['count']
+            missed = fish.get('missed', 0)
+            if key in fish_count_dict:
+                fish_count_dict[key]['count'] += count
+                fish_count_dict[key]['missed'] += missed  # Aggregate missed counts
+            else:
+                fish_count_dict[key] = {'name': name, 'count': count, 'missed': missed}
+        return [{'name': fish['name'], 'count': fish['count'], 'missed': fish['missed']} for fish in fish_count_dict.values()]
+
     @staticmethod
     def calculate_total_caught_from(fish_data):
         return sum(fish['count'] for fish in fish_data)
@@ -184,22 +343,7 @@ class sessionModel:
         """
         Import fish data from a CSV file using the provided column mapping
         """
-        import csv
-        fish_data = []
-        
-        with open(file_path, 'r', newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                try:
-                    fish = {
-                        'name': row[column_mapping['name']],
-                        'count': int(row[column_mapping['count']]),
-                        'missed': int(row[column_mapping['missed']])
-                    }
-                    fish_data.append(fish)
-                except (ValueError, KeyError) as e:
-                    continue  # Skip invalid rows
-                
+        fish_data, _ = CsvImport(file_path).run(column_mapping)
         return fish_data
 
     @staticmethod
@@ -207,8 +351,6 @@ class sessionModel:
         """
         Get the headers from a CSV file
         """
-        import csv
-        with open(file_path, 'r', newline='') as csvfile:
-            reader = csv.reader(csvfile)
-            headers = next(reader)  # Get the first row (headers)
-        return headers
\ No newline at end of file
+        csv_import = CsvImport(file_path)
+        csv_import.close()
+        return csv_import.headers
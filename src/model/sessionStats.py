@@ -0,0 +1,68 @@
+from model.fishColumns import numpy, numpy_for
+
+
+class SessionStats:
+    """Totals and per-row rates for one version of a session's fish data."""
+
+    def __init__(self, fish_data, version=0):
+        self.version = version
+
+        # Columnar data is read straight from its packed columns
+        if hasattr(fish_data, 'counts'):
+            counts = fish_data.counts
+            missed = fish_data.missed
+        else:
+            counts = [fish['count'] for fish in fish_data]
+            missed = [fish.get('missed', 0) for fish in fish_data]
+
+        # Rates are stored as percentages (0-100), one entry per row of fish_data.
+        # Small sessions are done with loops, so NumPy is not imported for them
+        np = numpy_for(len(counts))
+        if np is not None:
+            self._vectorized(np.array(counts, dtype=np.int64), np.array(missed, dtype=np.int64))
+        else:
+            self._looped(list(counts), list(missed))
+
+    def _vectorized(self, counts, missed):
+        self.counts = counts
+        self.missed = missed
+        self.seen = counts + missed
+
+        self.total_caught = int(counts.sum())
+        self.total_missed = int(missed.sum())
+        self.total_seen = self.total_caught + self.total_missed
+
+        self.percentage = _rate(counts, self.total_caught)
+        self.catch_rate = _rate(counts, self.seen)
+        self.seen_rate = _rate(self.seen, self.total_seen)
+
+    def _looped(self, counts, missed):
+        self.counts = counts
+        self.missed = missed
+        self.seen = [count + miss for count, miss in zip(counts, missed)]
+
+        self.total_caught = sum(counts)
+        self.total_missed = sum(missed)
+        self.total_seen = self.total_caught + self.total_missed
+
+        total_caught = self.total_caught
+        total_seen = self.total_seen
+        self.percentage = [(count / total_caught * 100) if total_caught > 0 else 0 for count in counts]
+        self.catch_rate = [(count / seen * 100) if seen > 0 else 0 for count, seen in zip(counts, self.seen)]
+        self.seen_rate = [(seen / total_seen * 100) if total_seen > 0 else 0 for seen in self.seen]
+
+    @property
+    def total_catch_rate(self):
+        return (self.total_caught / self.total_seen * 100) if self.total_seen > 0 else 0
+
+    def __len__(self):
+        return len(self.counts)
+
+
+def _rate(part, whole):
+    # part / whole * 100, with 0 wherever whole is 0
+    np = numpy()
+    whole = np.broadcast_to(np.asarray(whole, dtype=np.float64), part.shape)
+    out = np.zeros(part.shape, dtype=np.float64)
+    np.divide(part * 100.0, whole, out=out, where=whole > 0)
+    return out
@@ -0,0 +1,156 @@
+"""
+Opt-in timing spans for the slow paths (parsing, aggregation, table rebuilds,
+graph drawing). Turn it on with the environment variable FISH_TRACKER_TIMING:
+"1" keeps the numbers in memory for the Debug > Timing Report window, a file
+path also writes them there as JSON when the app exits.
+
+When it is off, timed() hands back the undecorated function and span() a
+shared no-op context, so the instrumented code costs next to nothing.
+"""
+import atexit
+import bisect
+import contextlib
+import json
+import os
+import threading
+import time
+
+ENV_VAR = "FISH_TRACKER_TIMING"
+
+_setting = os.environ.get(ENV_VAR, "")
+enabled = _setting.lower() not in ("", "0", "false", "no", "off")
+dump_path = _setting if enabled and _setting.lower() not in ("1", "true", "yes", "on") else None
+
+# Upper bounds of the histogram buckets in milliseconds, the last bucket is open ended
+BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, seconds):
+        ms = seconds * 1000
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = ms if self.max is None else max(self.max, ms)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """Upper bound (ms) of the bucket holding the p-th percentile, capped at the max seen."""
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(BUCKETS_MS[i], self.max) if i < len(BUCKETS_MS) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_ms': self.total,
+            'mean_ms': self.mean,
+            'min_ms': self.min,
+            'max_ms': self.max,
+            'p50_ms': self.percentile(50),
+            'p90_ms': self.percentile(90),
+            'p99_ms': self.percentile(99),
+            'buckets': {(f"<={bound}" if i < len(BUCKETS_MS) else f">{BUCKETS_MS[-1]}"): n
+                        for i, (bound, n) in enumerate(zip(BUCKETS_MS + (None,), self.buckets)) if n},
+        }
+
+
+class Timings:
+    """Latency histograms per span name. Spans may be recorded from any thread."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.add(seconds)
+
+    @contextlib.contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def to_dict(self):
+        with self._lock:
+            return {name: histogram.to_dict() for name, histogram in sorted(self._histograms.items())}
+
+    def report(self):
+        """The histograms as a plain text table, slowest total first."""
+        rows = sorted(self.to_dict().items(), key=lambda item: item[1]['total_ms'], reverse=True)
+        if not rows:
+            return "No timings recorded yet."
+        width = max(len(name) for name, _ in rows)
+        lines = [f"{'Span':<{width}} {'Count':>7} {'Mean':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'Max':>9} {'Total':>10}"]
+        for name, h in rows:
+            lines.append(f"{name:<{width}} {h['count']:>7} {h['mean_ms']:>9.2f} {h['p50_ms']:>9.2f} "
+                         f"{h['p90_ms']:>9.2f} {h['p99_ms']:>9.2f} {h['max_ms']:>9.2f} {h['total_ms']:>10.1f}")
+        lines.append("(milliseconds)")
+        return "\n".join(lines)
+
+    def dump(self, file_path):
+        with open(file_path, 'w') as f:
+            json.dump({'buckets_ms': BUCKETS_MS, 'spans': self.to_dict()}, f, indent=2)
+
+
+timings = Timings()
+
+
+def span(name):
+    """Context manager timing its body under name, a no-op unless timing is enabled."""
+    if not enabled:
+        return _NULL_SPAN
+    return timings.span(name)
+
+
+def record(name, seconds):
+    if enabled:
+        timings.record(name, seconds)
+
+
+def timed(name):
+    """Decorator version of span(); leaves the function untouched when timing is off."""
+    def decorate(func):
+        if not enabled:
+            return func
+
+        def wrapper(*args, **kwargs):
+            with timings.span(name):
+                return func(*args, **kwargs)
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+    return decorate
+
+
+if dump_path:
+    atexit.register(lambda: timings.dump(dump_path))
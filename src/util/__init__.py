@@ -0,0 +1 @@
+# util/__init__.py
\ No newline at end of file
@@ -0,0 +1,98 @@
+import queue
+import threading
+
+
+class BackgroundTask:
+    """
+    Runs work(progress, cancelled) on a worker thread and delivers progress,
+    the result or the error back on the Tk thread by polling with root.after.
+    """
+
+    def __init__(self, root, work, poll_interval=50):
+        self.root = root
+        self.work = work
+        self.poll_interval = poll_interval
+
+        self._on_progress = None
+        self._on_done = None
+        self._on_error = None
+        self._on_cancelled = None
+
+        self._queue = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._thread = None
+        self._after_id = None
+        self.finished = False
+
+    def bind(self, event, callback):
+        if event == "progress":
+            self._on_progress = callback
+        elif event == "done":
+            self._on_done = callback
+        elif event == "error":
+            self._on_error = callback
+        elif event == "cancelled":
+            self._on_cancelled = callback
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._after_id = self.root.after(self.poll_interval, self._poll)
+        return self
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def is_running(self):
+        return not self.finished
+
+    def _report_progress(self, fraction, text=None):
+        # Called from the worker thread
+        self._queue.put(("progress", (fraction, text)))
+
+    def _run(self):
+        try:
+            result = self.work(self._report_progress, self.cancelled)
+        except Exception as e:
+            if self.cancelled():
+                self._queue.put(("cancelled", None))
+            else:
+                self._queue.put(("error", e))
+        else:
+            self._queue.put(("done", result))
+
+    def _poll(self):
+        self._after_id = None
+        progress = None
+        outcome = None
+        try:
+            while True:
+                kind, value = self._queue.get_nowait()
+                if kind == "progress":
+                    progress = value  # only the latest progress matters
+                else:
+                    outcome = (kind, value)
+        except queue.Empty:
+            pass
+
+        if progress is not None and self._on_progress and outcome is None:
+            self._on_progress(*progress)
+
+        if outcome is None:
+            try:
+                self._after_id = self.root.after(self.poll_interval, self._poll)
+            except Exception:
+                self.cancel()  # root window is gone, nobody is listening anymore
+            return
+
+        self.finished = True
+        kind, value = outcome
+        if kind == "done" and self._on_done:
+            self._on_done(value)
+        elif kind == "error" and self._on_error:
+            self._on_error(value)
+        elif kind == "cancelled" and self._on_cancelled:
+            self._on_cancelled()
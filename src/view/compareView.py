@@ -4,15 +4,16 @@ import tkinter as tk
 
 from view.tableView import tableView
 from model.sessionModel import sessionModel
+from model.sessionCache import load_session as load_cached_session
 
 class compareView:
-    def __init__(self, root, file_paths):
+    def __init__(self, root, file_paths, load_session=load_cached_session):
         self.root = root
         self.compare_window = tk.Toplevel(self.root)
         self.compare_window.title("Compare Sessions")
 
         for index, file_path in enumerate(file_paths):
-            session_data = sessionModel.load_file(file_path)
+            session_data = load_session(file_path)
             self.create_compare_table(session_data, file_path, index)
             
     def destroy(self):
@@ -27,12 +28,12 @@ class compareView:
         
         
         # Extracting the session name from the file path
-        session_name = os.path.basename(file_path).replace(".json", "")
+        session_name = os.path.splitext(os.path.basename(file_path))[0]
         label = tk.Label(frame, text=session_name)
         label.grid(row=0, column=0)
         
 
-        self.table = tableView(frame, session_data.fish_data)
+        self.table = tableView(frame, session_data)
 
         
 
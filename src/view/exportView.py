@@ -2,10 +2,10 @@ import tkinter as tk
 from tkinter import ttk
 
 class ExportView:
-    def __init__(self, root):
+    def __init__(self, root, batch=False):
         self.window = tk.Toplevel(root)
-        self.window.title("Export CSV")
-        self.window.geometry("400x300")
+        self.window.title("Export Sessions to CSV" if batch else "Export CSV")
+        self.window.geometry("400x450" if batch else "400x300")
         
         self._on_export = None
         self._on_close = None
@@ -15,6 +15,17 @@ class ExportView:
             'count': 'count',
             'missed': 'missed'
         }
+        if batch:
+            # Long format adds the session and its water/bait type to every row
+            self.default_names = {
+                'session': 'session',
+                'water_type': 'water_type',
+                'bait_type': 'bait_type',
+                'species': 'species',
+                'count': 'count',
+                'missed': 'missed'
+            }
+        self.batch = batch
         
         self.create_widgets()
         self.window.protocol("WM_DELETE_WINDOW", self.on_close)
@@ -39,7 +50,7 @@ class ExportView:
             
             # Label for the field
             ttk.Label(field_frame, 
-                     text=f"{field.capitalize()} column:").pack(side='left', padx=5)
+                     text=f"{field.replace('_', ' ').capitalize()} column:").pack(side='left', padx=5)
             
             # Entry for column name
             var = tk.StringVar(value=default)
@@ -54,14 +65,33 @@ class ExportView:
         button_frame = ttk.Frame(self.window)
         button_frame.pack(side='bottom', pady=20)
         
-        ttk.Button(button_frame, 
+        self.export_button = ttk.Button(button_frame, 
                   text="Export", 
-                  command=self.on_export).pack(side='left', padx=10)
+                  command=self.on_export)
+        self.export_button.pack(side='left', padx=10)
         
         ttk.Button(button_frame, 
                   text="Cancel", 
                   command=self.on_close).pack(side='left', padx=10)
         
+        if self.batch:
+            # Progress of a running batch export
+            self.status_var = tk.StringVar(value="")
+            tk.Label(self.window, textvariable=self.status_var).pack(side='bottom')
+            self.progress_bar = ttk.Progressbar(self.window, mode='determinate', maximum=100, length=350)
+            self.progress_bar.pack(side='bottom', pady=(5, 0))
+        
+    def set_busy(self, busy):
+        if self.window:
+            self.export_button.config(state='disabled' if busy else 'normal')
+            
+    def set_progress(self, fraction, text=None):
+        if not self.window or not self.batch:
+            return
+        self.progress_bar['value'] = max(0.0, min(fraction, 1.0)) * 100
+        if text is not None:
+            self.status_var.set(text)
+        
     def get_column_names(self):
         return {field: var.get().strip() for field, var in self.column_vars.items()}
     
@@ -0,0 +1,102 @@
+import gc
+import os
+import tracemalloc
+import weakref
+from collections import OrderedDict
+
+DEFAULT_MAX_FIGURES = 12
+
+
+def _max_figures_from_env():
+    # Most matplotlib figures kept alive across all graph windows, override with FISH_TRACKER_MAX_FIGURES.
+    # A bad value must not stop the app from starting
+    try:
+        max_figures = int(os.environ.get("FISH_TRACKER_MAX_FIGURES", DEFAULT_MAX_FIGURES))
+    except ValueError:
+        return DEFAULT_MAX_FIGURES
+    return max_figures if max_figures >= 1 else DEFAULT_MAX_FIGURES
+
+
+MAX_LIVE_FIGURES = _max_figures_from_env()
+
+
+class FigurePool:
+    """
+    Keeps the number of live figures bounded across every graph window. Views
+    report each figure they keep with touch(); once there are more than
+    max_figures the least recently drawn ones are released (the tab keeps its
+    image, the figure is simply rebuilt next time it has to be redrawn).
+
+    Views and figures are also tracked through weak references, so stats()
+    can tell figures that are pooled apart from ones something still leaks.
+    """
+
+    def __init__(self, max_figures=MAX_LIVE_FIGURES):
+        self.max_figures = max_figures
+        self.evicted = 0
+        self._entries = OrderedDict()  # (id(view), index) -> view
+        self._open_views = set()
+        self._all_views = weakref.WeakSet()
+        self._all_figures = weakref.WeakSet()
+
+    def register_view(self, view):
+        self._open_views.add(view)
+        self._all_views.add(view)
+
+    def unregister_view(self, view):
+        self._open_views.discard(view)
+        for key in [key for key, owner in self._entries.items() if owner is view]:
+            del self._entries[key]
+
+    def track_figure(self, figure):
+        self._all_figures.add(figure)
+
+    def touch(self, view, index):
+        key = (id(view), index)
+        self._entries[key] = view
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def discard(self, view, index):
+        self._entries.pop((id(view), index), None)
+
+    def _evict(self):
+        for key in list(self._entries):
+            if len(self._entries) <= self.max_figures:
+                return
+            view = self._entries[key]
+            # A view can refuse while its worker is still drawing that figure
+            if view.release_figure(key[1]):
+                del self._entries[key]
+                self.evicted += 1
+
+    def stats(self):
+        gc.collect()
+        stats = {
+            'open_views': len(self._open_views),
+            'live_views': len(self._all_views),
+            'pooled_figures': len(self._entries),
+            'live_figures': len(self._all_figures),
+            'max_figures': self.max_figures,
+            'evicted': self.evicted,
+        }
+        if tracemalloc.is_tracing():
+            stats['traced_bytes'], stats['traced_peak_bytes'] = tracemalloc.get_traced_memory()
+        return stats
+
+    def report(self):
+        stats = self.stats()
+        lines = [
+            f"Graph windows: {stats['open_views']} open, {stats['live_views']} still in memory",
+            f"Figures: {stats['pooled_figures']} pooled (max {stats['max_figures']}), "
+            f"{stats['live_figures']} still in memory, {stats['evicted']} evicted",
+        ]
+        if 'traced_bytes' in stats:
+            lines.append(f"Traced memory: {stats['traced_bytes'] / 1e6:.1f} MB "
+                         f"(peak {stats['traced_peak_bytes'] / 1e6:.1f} MB)")
+        else:
+            lines.append("Traced memory: set FISH_TRACKER_TRACEMALLOC=1 to measure")
+        return "\n".join(lines)
+
+
+figure_pool = FigurePool()
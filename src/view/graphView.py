@@ -1,12 +1,81 @@
+import base64
+import functools
+import io
+import math
+import threading
 import tkinter as tk
+from tkinter import ttk
 
 from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
-import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from util.backgroundTask import BackgroundTask
+from model.graphData import GraphData
+from model.sessionLoader import OperationCancelled
+from model.timing import timed
+from view.figurePool import figure_pool
+
+# (tab title, attribute, suffix for the value labels), one notebook tab each
+GRAPHS = [
+    ("Count", "count", ""),
+    ("Missed", "missed", ""),
+    ("Percentage", "percentage", "%"),
+    ("Number Seen", "number_seen", ""),
+    ("Catch Percentage", "catch_percentage", "%"),
+    ("Seen Percentage", "seen_percentage", "%"),
+]
+
+DPI = 100
+DEFAULT_SIZE = (8, 5)  # inches, until the tab has a size of its own
+
+# How many species get a bar of their own, the rest share an "Other" bar
+TOP_N_CHOICES = ("All", "10", "25", "50", "100")
+DEFAULT_TOP_N = 50
+# Narrower bars than this (in pixels) only get every n-th tick and value label
+MIN_LABEL_WIDTH = 36
+
+# One figure is drawn at a time, whichever graph window asked for it
+_render_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=4096)
+def wrap_label(name, max_label_length):
+    """Word wrap a fish name onto lines of at most max_label_length characters."""
+    words = name.split()
+    lines = []
+    current_line = ""
+    for word in words:
+        if len(current_line) + len(word) <= max_label_length:
+            current_line += " " + word if current_line else word
+        else:
+            if current_line:
+                lines.append(current_line)
+            if len(word) > max_label_length:
+                lines.extend([word[i:i+max_label_length] for i in range(0, len(word), max_label_length)])
+                current_line = ""
+            else:
+                current_line = word
+    if current_line:
+        lines.append(current_line)
+    return '\n'.join(lines)
+
+
+def release_graph(graph):
+    """Break up a figure so its artists and Agg buffer can be freed right away."""
+    if graph is None:
+        return
+    graph['figure'].clear()
+    graph.clear()
+
 
 class GraphView:
-    def __init__(self, root, data):
+    """
+    Six bar charts of one session, one per notebook tab. Figures are drawn
+    with Agg on a worker thread into PNG images, so the window (and the rest
+    of the app) stays responsive; a tab shows a placeholder until its image
+    arrives. The figures themselves are only ever touched by the worker.
+    """
+
+    def __init__(self, root, data: GraphData, top_n=DEFAULT_TOP_N):
         self.root = root
         self.data = data
         self.window = tk.Toplevel(self.root)
@@ -16,18 +85,27 @@ class GraphView:
         # Add sort order tracking
         self.current_sort = None
         self.reverse_sort = False
-        
+
         self.window.protocol("WM_DELETE_WINDOW", self.destroy)
 
         # Add tab tracking
         self.current_tab = 0
 
+        self.top_n = top_n
+        self.render_task = None
+        self.rendering_index = None
+        self.resize_after = None
+
+        self._on_close = None
+        figure_pool.register_view(self)
+
         self.create_widgets()
 
     def create_widgets(self):
 
         sort_frame = tk.Frame(self.window)
         sort_frame.pack(fill=tk.X)
+        self.sort_frame = sort_frame
 
         # Add sort buttons
         sort_options = [
@@ -44,120 +122,267 @@ class GraphView:
                           command=lambda a=attr: self.sort_and_refresh(a))
             btn.pack(side=tk.LEFT, padx=2)
 
+        self.top_n_var = tk.StringVar(value=str(self.top_n) if self.top_n else "All")
+        top_n_dropdown = ttk.Combobox(sort_frame, textvariable=self.top_n_var, values=TOP_N_CHOICES,
+                                      state="readonly", width=5)
+        top_n_dropdown.pack(side=tk.RIGHT, padx=2)
+        top_n_dropdown.bind("<<ComboboxSelected>>", self.on_top_n_change)
+        tk.Label(sort_frame, text="Bars:").pack(side=tk.RIGHT)
+
         self.notebook = tk.ttk.Notebook(self.window)
         self.notebook.pack(fill=tk.BOTH, expand=True)
 
-        self.create_graphs()
+        # Tabs start as a placeholder and are drawn the first time they are selected
+        self.tabs = []
+        for title, _, _ in GRAPHS:
+            label = tk.Label(self.notebook, text="Drawing graph...")
+            self.notebook.add(label, text=title)
+            self.tabs.append(label)
+        self.stale = [True] * len(GRAPHS)
+        self.graphs = [None] * len(GRAPHS)
+        self.sizes = [None] * len(GRAPHS)
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        self.notebook.bind("<Configure>", self.on_resize)
 
-    def create_graphs(self):
-        # Move graph creation code here to avoid duplication
-        self.create_graph("Count", "count")
-        self.create_graph("Missed", "missed")
-        self.create_graph("Percentage", "percentage", bar_label_affix="%")
-        self.create_graph("Number Seen", "number_seen")
-        self.create_graph("Catch Percentage", "catch_percentage", bar_label_affix="%")
-        self.create_graph("Seen Percentage", "seen_percentage", bar_label_affix="%")
+        # The first tab is drawn once the window has its size
+        self.on_resize()
 
-    def sort_and_refresh(self, attribute):
-        # Store current tab before destroying
+    def on_tab_changed(self, event=None):
+        if not self.notebook:
+            return
         self.current_tab = self.notebook.index(self.notebook.select())
+        if self.stale[self.current_tab]:
+            self.render_tab(self.current_tab)
+
+    def on_resize(self, event=None):
+        # Wait for the resize to settle before drawing again at the new size
+        if self.resize_after is not None:
+            self.window.after_cancel(self.resize_after)
+        self.resize_after = self.window.after(200, self.on_resize_settled)
+
+    def on_resize_settled(self):
+        self.resize_after = None
+        if not self.window:
+            return
+        size = self.tab_size()
+        self.stale = [self.stale[i] or self.sizes[i] != size for i in range(len(GRAPHS))]
+        self.on_tab_changed()
+
+    def tab_size(self):
+        width = self.tabs[self.current_tab].winfo_width()
+        height = self.tabs[self.current_tab].winfo_height()
+        if width <= 1 or height <= 1:
+            return DEFAULT_SIZE
+        return (width / DPI, height / DPI)
+
+    def render_tab(self, index):
+        # self.data is never changed in place (sorting swaps in a sorted copy), so
+        # the worker can read the one it was given while the window moves on
+        if self.render_task is not None:
+            # The worker owns the figures until it is done, so ask it to stop
+            # and pick up whatever is stale once it has
+            self.render_task.cancel()
+            return
+
+        graph = self.graphs[index]
+        data = self.data
+        top_n = self.top_n
+        size = self.tab_size()
+        title, attribute, affix = GRAPHS[index]
+        self.stale[index] = False
+        self.rendering_index = index
+
+        def work(progress, cancelled):
+            return self.draw_figure(graph, data.top(attribute, top_n), size, title, attribute, affix, cancelled)
+
+        task = BackgroundTask(self.root, work)
+        task.bind("done", lambda result: self.on_rendered(task, index, size, result))
+        task.bind("error", lambda error: self.on_render_failed(task, index, error))
+        task.bind("cancelled", lambda: self.on_render_finished(task, index))
+        self.render_task = task.start()
+
+    def on_rendered(self, task, index, size, result):
+        graph, png = result
+        if not self.window:
+            release_graph(graph)
+        else:
+            if graph is not self.graphs[index]:
+                release_graph(self.graphs[index])
+                self.graphs[index] = graph
+                figure_pool.track_figure(graph['figure'])
+            figure_pool.touch(self, index)
+            self.sizes[index] = size
+            image = tk.PhotoImage(master=self.window, data=base64.b64encode(png).decode('ascii'))
+            self.tabs[index].configure(image=image, text="")
+            self.tabs[index].image = image  # Tk doesn't keep its own reference
+        self.on_render_finished(task, index)
 
+    def on_render_failed(self, task, index, error):
+        if self.window:
+            self.tabs[index].configure(image="", text=f"Could not draw graph: {error}")
+            self.tabs[index].image = None
+        self.on_render_finished(task, index)
+
+    def on_render_finished(self, task, index):
+        if task is not self.render_task:
+            return
+        self.render_task = None
+        self.rendering_index = None
+        if not self.window:
+            return
+        if task.cancelled():
+            self.stale[index] = True
+        self.on_tab_changed()
+
+    def on_top_n_change(self, event=None):
+        value = self.top_n_var.get()
+        self.top_n = None if value == "All" else int(value)
+        self.refresh()
+
+    def set_data(self, data):
+        # New numbers for the same session, keeping the current sort and tab
+        self.data = data
+        if self.current_sort is not None:
+            self.data = self.data.sorted(self.current_sort, reverse=self.reverse_sort)
+        self.refresh()
+
+    def sort_and_refresh(self, attribute):
         # Toggle sort direction if clicking same attribute
         if self.current_sort == attribute:
             self.reverse_sort = not self.reverse_sort
         else:
             self.current_sort = attribute
             self.reverse_sort = False
-            
+
         # Sort the data
-        self.data.sort(
-            key=lambda x: self.get_attribute_value(x, attribute),
-            reverse=self.reverse_sort
-        )
-        
-        # Clear and recreate graphs
-        for widget in self.notebook.winfo_children():
-            widget.destroy()
-        self.create_graphs()
+        self.data = self.data.sorted(attribute, reverse=self.reverse_sort)
+        self.refresh()
+
+    def refresh(self):
+        # Only the visible tab is redrawn, the others wait until they are selected again
+        self.current_tab = self.notebook.index(self.notebook.select())
+        self.stale = [True] * len(GRAPHS)
+        self.render_tab(self.current_tab)
 
-        # Restore previously selected tab
-        self.notebook.select(self.current_tab)
+    def draw_figure(self, graph, data, size, title, attribute, affix, cancelled):
+        """
+        Runs on the worker: bring the tab's figure up to date with data (making
+        it the first time, or when the number of species changed) and return
+        it with a PNG of it.
+        """
+        with _render_lock:
+            if cancelled():
+                raise OperationCancelled()
+            if not self.can_reuse(graph, data):
+                graph = self.create_graph(data, size, title, attribute, bar_label_affix=affix)
+            else:
+                # Same species, so reuse the figure and only move things around
+                graph['figure'].set_size_inches(size)
+                self.update_graph(graph, data)
+            if cancelled():
+                raise OperationCancelled()
 
+            buffer = io.BytesIO()
+            graph['canvas'].print_png(buffer)
+            return graph, buffer.getvalue()
 
-    def create_graph(self, title, attribute, max_label_length=10, bottom_margin=0.2, bar_label_affix=""):
-        frame = tk.Frame(self.notebook)
-        self.notebook.add(frame, text=title)
+    def can_reuse(self, graph, data):
+        return graph is not None and len(graph['bars']) == len(data)
 
-        fig = Figure(figsize=(8, 5), dpi=100)
+    @timed("GraphView.create_graph")
+    def create_graph(self, data, size, title, attribute, max_label_length=10, bottom_margin=0.2, bar_label_affix=""):
+        fig = Figure(figsize=size, dpi=DPI)
         ax = fig.add_subplot(111)
 
-        names = [fish['name'] for fish in self.data]
-        values = [self.get_attribute_value(fish, attribute) for fish in self.data]
-        bars = ax.bar(names, values)
+        # Bars sit at 0..n-1 and keep their place, a sort only changes heights and labels
+        bars = ax.bar(range(len(data)), [0] * len(data))
         ax.set_title(f"{title} Graph")
         ax.set_xlabel("Fish")
         ax.set_ylabel(title)
-        
-        # Set y-axis limits to start from 0
-        ax.set_ylim(bottom=0)
-        
-        # Adjust x-axis labels
-        ax.set_xticklabels(names, rotation=0, ha='center')
+
+        # display values inside the bars
+        texts = [ax.text(bar.get_x() + bar.get_width()/2., 0, "", ha='center', va='bottom') for bar in bars]
+
+        graph = {
+            'figure': fig,
+            'canvas': FigureCanvasAgg(fig),
+            'axes': ax,
+            'bars': bars,
+            'texts': texts,
+            'attribute': attribute,
+            'affix': bar_label_affix,
+            'max_label_length': max_label_length,
+        }
+        self.update_graph(graph, data)
         fig.tight_layout()
-        
-        # Word wrap long labels
-        wrapped_labels = []
-        for name in names:
-            words = name.split()
-            lines = []
-            current_line = ""
-            for word in words:
-                if len(current_line) + len(word) <= max_label_length:
-                    current_line += " " + word if current_line else word
-                else:
-                    if current_line:
-                        lines.append(current_line)
-                    if len(word) > max_label_length:
-                        lines.extend([word[i:i+max_label_length] for i in range(0, len(word), max_label_length)])
-                    else:
-                        current_line = word
-            if current_line:
-                lines.append(current_line)
-            wrapped_labels.append('\n'.join(lines))
-        ax.set_xticklabels(wrapped_labels)
-        
+
         # Adjust bottom margin to accommodate wrapped labels
-        plt.subplots_adjust(bottom=bottom_margin)
+        fig.subplots_adjust(bottom=bottom_margin)
+        return graph
+
+    @timed("GraphView.update_graph")
+    def update_graph(self, graph, data):
+        """Point the existing bars, tick labels and value labels at data."""
+        ax = graph['axes']
+        affix = graph['affix']
+        names = data.names
+        values = data.column(graph['attribute'])
+        step = self.label_step(graph, len(names))
+        for i, (bar, text, value) in enumerate(zip(graph['bars'], graph['texts'], values)):
+            value = float(value)
+            bar.set_height(value)
+            text.set_position((bar.get_x() + bar.get_width()/2., value))
+            text.set_text(f'{value:.1f}{affix}')
+            text.set_visible((len(names) - 1 - i) % step == 0)
+
+        # Word wrap long labels, for the bars that get one (always including the last, "Other", bar)
+        positions = range((len(names) - 1) % step, len(names), step)
+        ax.set_xticks(positions)
+        ax.set_xticklabels([wrap_label(names[i], graph['max_label_length']) for i in positions],
+                           rotation=0, ha='center')
+
+        # Set y-axis limits to start from 0. Pinning the bottom turned autoscaling
+        # off for a reused figure, so turn it back on before rescaling
+        ax.set_autoscaley_on(True)
+        ax.relim()
+        ax.autoscale_view()
+        ax.set_ylim(bottom=0)
+
+    @staticmethod
+    def label_step(graph, bar_count):
+        """Label every n-th bar so labels get at least MIN_LABEL_WIDTH pixels each."""
+        if bar_count == 0:
+            return 1
+        fig = graph['figure']
+        axes_width = graph['axes'].get_position().width * fig.get_figwidth() * fig.dpi
+        return max(1, math.ceil(MIN_LABEL_WIDTH / (axes_width / bar_count)))
+
+    def bind(self, event, callback):
+        if event == "close":
+            self._on_close = callback
+
+    def release_figure(self, index):
+        """Let go of one tab's figure; refused while the worker is drawing it."""
+        if self.render_task is not None and self.rendering_index == index:
+            return False
+        release_graph(self.graphs[index])
+        self.graphs[index] = None
+        return True
 
-        # display values inside the bars
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                    f'{height:.1f}{bar_label_affix}',
-                    ha='center', va='bottom')
-
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-
-    def get_attribute_value(self, fish, attribute):
-        if attribute == "count":
-            return fish['count']
-        elif attribute == "missed":
-            return fish.get('missed', 0)
-        elif attribute == "percentage":
-            return float(fish['percentage'].strip('%'))
-        elif attribute == "number_seen":
-            return fish['count'] + fish.get('missed', 0)
-        elif attribute == "catch_percentage":
-            return float(fish['catch_percentage'].strip('%'))
-        elif attribute == "seen_percentage":
-            return float(fish['seen_percentage'].strip('%'))
-        else:
-            return 0
-        
     def destroy(self):
+        # A render still running is told to stop, its result is dropped
+        if self.render_task is not None:
+            self.render_task.cancel()
+        if self.resize_after is not None and self.window:
+            self.window.after_cancel(self.resize_after)
+            self.resize_after = None
+        for index, graph in enumerate(self.graphs):
+            if index != self.rendering_index:
+                release_graph(graph)
+        self.graphs = [None] * len(GRAPHS)
+        figure_pool.unregister_view(self)
+        for tab in self.tabs:
+            tab.image = None
         if self.window:
             self.window.destroy()
             self.window = None
@@ -166,4 +391,6 @@ class GraphView:
             self.notebook = None
         if self.root:
             self.root = None
-        
\ No newline at end of file
+        if self._on_close:
+            callback, self._on_close = self._on_close, None
+            callback()
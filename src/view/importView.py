@@ -5,7 +5,7 @@ class ImportView:
     def __init__(self, root, csv_headers):
         self.window = tk.Toplevel(root)
         self.window.title("Import CSV")
-        self.window.geometry("400x300")
+        self.window.geometry("400x360")
         
         self._on_import = None
         self._on_close = None
@@ -59,14 +59,32 @@ class ImportView:
         button_frame = ttk.Frame(self.window)
         button_frame.pack(side='bottom', pady=20)
         
-        ttk.Button(button_frame, 
+        self.import_button = ttk.Button(button_frame, 
                   text="Import", 
-                  command=self.on_import).pack(side='left', padx=10)
+                  command=self.on_import)
+        self.import_button.pack(side='left', padx=10)
         
         ttk.Button(button_frame, 
                   text="Cancel", 
                   command=self.on_close).pack(side='left', padx=10)
         
+        # Progress of a running import
+        self.status_var = tk.StringVar(value="")
+        tk.Label(self.window, textvariable=self.status_var).pack(side='bottom')
+        self.progress_bar = ttk.Progressbar(self.window, mode='determinate', maximum=100, length=350)
+        self.progress_bar.pack(side='bottom', pady=(5, 0))
+        
+    def set_busy(self, busy):
+        if self.window:
+            self.import_button.config(state='disabled' if busy else 'normal')
+        
+    def set_progress(self, fraction, text=None):
+        if not self.window:
+            return
+        self.progress_bar['value'] = max(0.0, min(fraction, 1.0)) * 100
+        if text is not None:
+            self.status_var.set(text)
+        
     def get_mapping(self):
         return {field: var.get() for field, var in self.mapping_vars.items()}
     
@@ -3,6 +3,8 @@ from tkinter import ttk
 
 import platform
 
+from model import timing
+
 class menuView:
     def __init__(self, root):
         self.root = root
@@ -16,7 +18,11 @@ class menuView:
         self._graph_other_session = None 
         self._compare_sessions = None 
         self._export_session = None
+        self._export_all_sessions = None
         self._import_session = None
+        self._convert_sessions = None
+        self._timing_report = None
+        self._graph_memory = None
 
         self.modifier_key = "Command" if platform.system() == "Darwin" else "Ctrl"
         self.command_key = "Command" if platform.system() == "Darwin" else "Control"
@@ -29,6 +35,9 @@ class menuView:
         file_menu.add_separator()
         file_menu.add_command(label="Import from CSV", command=self.import_session, accelerator=f"{self.modifier_key}+I")
         file_menu.add_command(label="Export to CSV", command=self.export_session, accelerator=f"{self.modifier_key}+E")
+        file_menu.add_command(label="Export All Sessions to CSV", command=self.export_all_sessions)
+        file_menu.add_separator()
+        file_menu.add_command(label="Convert Sessions to Binary", command=self.convert_sessions)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
 
@@ -45,6 +54,13 @@ class menuView:
         graph_menu.add_command(label="Compare Graphs", command=self.graph_other_session, accelerator=f"{self.modifier_key}+Shift+G")
         menu_bar.add_cascade(label="Graph", menu=graph_menu)
 
+        # Debug menu, the timing report only when FISH_TRACKER_TIMING is set
+        debug_menu = tk.Menu(menu_bar, tearoff=0)
+        debug_menu.add_command(label="Graph Memory", command=self.graph_memory)
+        if timing.enabled:
+            debug_menu.add_command(label="Timing Report", command=self.timing_report)
+        menu_bar.add_cascade(label="Debug", menu=debug_menu)
+
         # Add these bindings after creating the menu
         self.root.bind(f"<{self.command_key}-n>", lambda e: self.new_session())
         self.root.bind(f"<{self.command_key}-s>", lambda e: self.save_session())
@@ -81,8 +97,16 @@ class menuView:
             self._graph_other_session = fn
         elif cmd == "export":
             self._export_session = fn
+        elif cmd == "export_all":
+            self._export_all_sessions = fn
         elif cmd == "import":
             self._import_session = fn
+        elif cmd == "convert":
+            self._convert_sessions = fn
+        elif cmd == "timing":
+            self._timing_report = fn
+        elif cmd == "graph_memory":
+            self._graph_memory = fn
     
     def new_session(self):
         if self._new_session is not None and callable(self._new_session):
@@ -116,7 +140,22 @@ class menuView:
         if self._export_session is not None and callable(self._export_session):
             self._export_session()
 
+    def export_all_sessions(self):
+        if self._export_all_sessions is not None and callable(self._export_all_sessions):
+            self._export_all_sessions()
+
     def import_session(self):
         if self._import_session is not None and callable(self._import_session):
             self._import_session()
-        
\ No newline at end of file
+
+    def convert_sessions(self):
+        if self._convert_sessions is not None and callable(self._convert_sessions):
+            self._convert_sessions()
+
+    def timing_report(self):
+        if self._timing_report is not None and callable(self._timing_report):
+            self._timing_report()
+
+    def graph_memory(self):
+        if self._graph_memory is not None and callable(self._graph_memory):
+            self._graph_memory()
@@ -0,0 +1,101 @@
+import tkinter as tk
+from tkinter import ttk
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from model.graphData import MultiGraphData
+from model.timing import timed
+from view.graphView import GraphView, DEFAULT_TOP_N, DPI, wrap_label
+
+LAYOUTS = ("Grouped", "Overlaid")
+
+
+class MultiGraphView(GraphView):
+    """
+    One window comparing several sessions: each metric tab is a single figure
+    with one bar series per session on a shared species axis, either side by
+    side (grouped) or drawn over each other (overlaid).
+    """
+
+    def __init__(self, root, data: MultiGraphData, top_n=DEFAULT_TOP_N):
+        self.layout = "Grouped"
+        super().__init__(root, data, top_n)
+        self.window.title("Session Comparison Graph")
+
+    def create_widgets(self):
+        super().create_widgets()
+
+        self.layout_var = tk.StringVar(value=self.layout)
+        layout_dropdown = ttk.Combobox(self.sort_frame, textvariable=self.layout_var, values=LAYOUTS,
+                                       state="readonly", width=9)
+        layout_dropdown.pack(side=tk.RIGHT, padx=2)
+        layout_dropdown.bind("<<ComboboxSelected>>", self.on_layout_change)
+
+    def on_layout_change(self, event=None):
+        self.layout = self.layout_var.get()
+        self.refresh()
+
+    def can_reuse(self, graph, data):
+        return (graph is not None and graph['layout'] == self.layout
+                and len(graph['containers']) == len(data.sessions)
+                and len(graph['containers'][0]) == len(data))
+
+    @timed("MultiGraphView.create_graph")
+    def create_graph(self, data, size, title, attribute, max_label_length=10, bottom_margin=0.2, bar_label_affix=""):
+        fig = Figure(figsize=size, dpi=DPI)
+        ax = fig.add_subplot(111)
+
+        layout = self.layout
+        series = len(data.sessions)
+        positions = range(len(data))
+        containers = []
+        for i, label in enumerate(data.labels):
+            if layout == "Grouped":
+                width = 0.8 / series
+                offset = (i - (series - 1) / 2) * width
+                containers.append(ax.bar([x + offset for x in positions], [0] * len(data), width, label=label))
+            else:
+                containers.append(ax.bar(positions, [0] * len(data), 0.8, label=label, alpha=0.5))
+        ax.set_title(f"{title} Graph")
+        ax.set_xlabel("Fish")
+        ax.set_ylabel(title + (" (%)" if bar_label_affix == "%" else ""))
+        ax.legend()
+
+        graph = {
+            'figure': fig,
+            'canvas': FigureCanvasAgg(fig),
+            'axes': ax,
+            'containers': containers,
+            'layout': layout,
+            'attribute': attribute,
+            'max_label_length': max_label_length,
+        }
+        self.update_graph(graph, data)
+        fig.tight_layout()
+
+        # Adjust bottom margin to accommodate wrapped labels
+        fig.subplots_adjust(bottom=bottom_margin)
+        return graph
+
+    @timed("MultiGraphView.update_graph")
+    def update_graph(self, graph, data):
+        ax = graph['axes']
+        names = data.names
+        for container, session in zip(graph['containers'], data.sessions):
+            for bar, value in zip(container, session.column(graph['attribute'])):
+                bar.set_height(float(value))
+
+        # Word wrap long labels, for the groups that get one (always including the last, "Other", group)
+        step = self.label_step(graph, len(names))
+        positions = range((len(names) - 1) % step, len(names), step)
+        ax.set_xticks(positions)
+        ax.set_xticklabels([wrap_label(names[i], graph['max_label_length']) for i in positions],
+                           rotation=0, ha='center')
+
+        # Set y-axis limits to start from 0. Pinning the bottom turned autoscaling
+        # off for a reused figure, so turn it back on before rescaling
+        ax.set_autoscaley_on(True)
+        ax.relim()
+        ax.autoscale_view()
+        ax.set_ylim(bottom=0)
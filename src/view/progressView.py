@@ -0,0 +1,44 @@
+import tkinter as tk
+from tkinter import ttk
+
+class ProgressView:
+    def __init__(self, root, title, message=""):
+        self.window = tk.Toplevel(root)
+        self.window.title(title)
+        self.window.geometry("350x120")
+        self.window.transient(root)
+
+        self._on_cancel = None
+
+        self.create_widgets(message)
+        self.window.protocol("WM_DELETE_WINDOW", self.on_cancel)
+
+    def create_widgets(self, message):
+        self.message_var = tk.StringVar(value=message)
+        tk.Label(self.window, textvariable=self.message_var, wraplength=320).pack(pady=(10, 5))
+
+        self.progress_bar = ttk.Progressbar(self.window, mode='determinate', maximum=100, length=300)
+        self.progress_bar.pack(padx=20, pady=5)
+
+        ttk.Button(self.window, text="Cancel", command=self.on_cancel).pack(pady=(5, 10))
+
+    def set_progress(self, fraction, text=None):
+        if not self.window:
+            return
+        self.progress_bar['value'] = max(0.0, min(fraction, 1.0)) * 100
+        if text is not None:
+            self.message_var.set(text)
+
+    def bind(self, event, callback):
+        if event == "cancel":
+            self._on_cancel = callback
+
+    def on_cancel(self):
+        if self._on_cancel:
+            self._on_cancel()
+        self.destroy()
+
+    def destroy(self):
+        if self.window:
+            self.window.destroy()
+            self.window = None
@@ -0,0 +1,45 @@
+class RefreshScheduler:
+    """
+    Collapses bursts of redraw requests into one render per target. Targets are
+    marked dirty by key and redrawn together from a single after_idle callback,
+    so everything that changes within one event loop turn is drawn once.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._pending = {}  # key -> callback, in the order they were first marked
+        self._after_id = None
+        self.renders = 0
+        self.skipped = 0
+
+    def mark_dirty(self, key, callback):
+        if key in self._pending:
+            self.skipped += 1
+        # The latest callback for a key wins
+        self._pending[key] = callback
+        if self._after_id is None:
+            self._after_id = self.root.after_idle(self._on_idle)
+
+    def _on_idle(self):
+        self._after_id = None
+        self.flush()
+
+    def flush(self):
+        """Run every pending render now. Also usable to force a synchronous redraw."""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        pending = self._pending
+        self._pending = {}
+        for callback in pending.values():
+            self.renders += 1
+            callback()
+
+    def cancel(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._pending.clear()
+
+    def is_pending(self, key=None):
+        return bool(self._pending) if key is None else key in self._pending
@@ -2,16 +2,19 @@ import tkinter as tk
 from tkinter import ttk
 from view.menuView import menuView
 from view.tableView import tableView
+from view.refreshScheduler import RefreshScheduler
 from model.sessionModel import sessionModel
 
 class rootView:
     def __init__(self, session_data: sessionModel):
         self.root = tk.Tk()
         self.root.title("Fish Tracker")
+        # Redraws triggered by model changes are batched until the app is idle
+        self.scheduler = RefreshScheduler(self.root)
         
         self.water_type = session_data.water_type
         self.bait_type = session_data.bait_type
-        self.fish_data = session_data.fish_data
+        self.session_data = session_data
         self.water_types = ["Unspecified/Mixed", "Fresh Water", "Salt Water"]
         self.bait_types = ["Unspecified/Mixed", "Bait Paste", "Worm", "Shrimp", "Fish Fillet"]
         
@@ -79,7 +82,7 @@ class rootView:
         edit_label = tk.Label(self.root, text="Double-click a fish entry to edit.")
         edit_label.grid(row=7, pady=(10, 0))
         
-        self.table = tableView(self.root, self.fish_data)
+        self.table = tableView(self.root, self.session_data, scheduler=self.scheduler)
     
     def on_bait_change(self, *args):
         if self._on_bait_change is not None and callable(self._on_bait_change):
@@ -112,7 +115,7 @@ class rootView:
     def update_data(self, session_data):
         self.water_type = session_data.water_type
         self.bait_type = session_data.bait_type
-        self.fish_data = session_data.fish_data
+        self.session_data = session_data
         self.water_type_var.set(self.water_type)
         self.bait_type_var.set(self.bait_type)
         
@@ -120,7 +123,7 @@ class rootView:
         
         
     def update_table(self):
-        self.table.update_tree(self.fish_data)
+        self.table.schedule_update(self.session_data)
         
     def clear_inputs(self):
         self.fish_name_entry.delete(0, tk.END)
@@ -1,11 +1,21 @@
 import tkinter as tk
 from tkinter import ttk
 from model.sessionModel import sessionModel
+from model.fishColumns import numpy, is_array
+from model.timing import timed
+
+TOTAL_IID = "total"
+# Above this many rows the table switches to virtual mode
+VIRTUAL_THRESHOLD = 2000
+# Rows kept as items above and below the visible page in virtual mode
+OVERSCAN = 20
 
 class tableView:
-    def __init__(self, root, data):
-        self.data = data
+    def __init__(self, root, session_data: sessionModel, virtual=None, scheduler=None):
+        self.session_data = session_data
+        self.data = session_data.fish_data
         self.root = root
+        self.scheduler = scheduler
         
         self.frame = tk.Frame(self.root)
         self.frame.grid(row=9, pady=(10, 30), padx=(10, 10))
@@ -16,11 +26,12 @@ class tableView:
             self.frame,
             text="Hide rows with 0 seen",
             variable=self.hide_zero_catches_var,
-            command=self.update_tree
+            command=self.schedule_update
         )
         self.hide_zero_catches_checkbox.grid(row=0, column=0, sticky="w")
         
         heading = ("Name", "Count", "Percentage", "Missed",  "Number Seen", "Catch Percentage", "Seen Percentage")
+        self.columns = heading
         
         # Treeview for displaying fish data with percentages
         self.tree = ttk.Treeview(self.frame, columns=heading, show="headings")
@@ -52,76 +63,202 @@ class tableView:
             "Seen Percentage": True
         }
         
+        # Values currently shown, per item id
+        self._row_values = {}
+        
+        # Virtual mode keeps only the rows in view as Treeview items and scrolls
+        # over self._visible (model indices) itself. None switches it on by size.
+        self.virtual = virtual
+        self.virtual_active = False
+        self.first_row = 0
+        self._visible = range(0)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.yview)
+        self.tree.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.tree.bind("<Button-4>", self.on_mouse_wheel)
+        self.tree.bind("<Button-5>", self.on_mouse_wheel)
+        
         self.update_tree()
         
     def bind(self, cmd, fn):
         # Bind bind event to value
         self.tree.bind(cmd, fn)#"<Double-1>"
         
-    def update_tree(self, new_data=None):
-        if new_data is not None:
-            self.data = new_data
-        # Clear the tree
-        self.tree.delete(*self.tree.get_children())
+    def schedule_update(self, new_session=None):
+        # Redraw once the current burst of changes is over, or right away without a scheduler
+        if new_session is not None:
+            self.session_data = new_session
+        if self.scheduler is None:
+            self.update_tree()
+        else:
+            self.scheduler.mark_dirty("table", self.update_tree)
+        
+    @timed("tableView.update_tree")
+    def update_tree(self, new_session=None):
+        if new_session is not None:
+            self.session_data = new_session
+        self.data = self.session_data.fish_data
+        
+        self._visible = self.visible_indices()
+        virtual = self.virtual if self.virtual is not None else len(self._visible) > VIRTUAL_THRESHOLD
+        if virtual != self.virtual_active:
+            self.set_virtual_active(virtual)
+        self.render()
+        
+    def visible_indices(self):
+        """Model indices of the rows to show, in model order, with the hide-zero filter applied."""
+        if not self.hide_zero_catches_var.get():
+            return range(len(self.data))
+        seen = self.session_data.stats().seen
+        if is_array(seen):
+            return numpy().flatnonzero(seen)
+        return [i for i, number_seen in enumerate(seen) if number_seen != 0]
+        
+    def set_virtual_active(self, active):
+        self.virtual_active = active
+        self.first_row = 0
+        if active:
+            self.scrollbar.grid(row=1, column=1, sticky="ns", pady=(10, 30))
+        else:
+            self.scrollbar.grid_remove()
+        
+    def render(self):
+        if self.virtual_active:
+            rows, offset = self.build_window()
+        else:
+            rows, offset = list(self.build_rows(range(len(self._visible) + 1))), 0
+        self.apply_rows(rows)
+        if self.virtual_active:
+            # Show the window from first_row and size the scrollbar from the logical row count
+            self.tree.yview_moveto(offset / len(rows))
+            total = len(self._visible) + 1
+            self.scrollbar.set(self.first_row / total, min(1.0, (self.first_row + self.page_size()) / total))
+        
+    def apply_rows(self, rows):
+        # Only touch the items that differ from what is shown
+        old_rows = self._row_values
+        new_rows = dict(rows)
+        
+        gone = [iid for iid in old_rows if iid not in new_rows]
+        if gone:
+            self.tree.delete(*gone)
+        
+        for index, (iid, values) in enumerate(rows):
+            old_values = old_rows.get(iid)
+            if old_values is None:
+                self.tree.insert("", index, iid=iid, values=values)
+            elif old_values != values:
+                # Only the columns that changed are sent to Tk
+                for column, old, new in zip(self.columns, old_values, values):
+                    if old != new:
+                        self.tree.set(iid, column, new)
+        
+        # Reorder with move() after a sort instead of rebuilding
+        order = [iid for iid, _ in rows]
+        if list(self.tree.get_children()) != order:
+            for index, iid in enumerate(order):
+                self.tree.move(iid, "", index)
+        
+        self._row_values = new_rows
+        
+    def page_size(self):
+        return int(self.tree.cget("height"))
+        
+    def build_window(self):
+        """Rows first_row - OVERSCAN up to a page plus OVERSCAN below it, and where first_row sits in them."""
+        total = len(self._visible) + 1
+        self.first_row = max(0, min(self.first_row, total - self.page_size()))
+        start = max(0, self.first_row - OVERSCAN)
+        end = min(total, self.first_row + self.page_size() + OVERSCAN)
+        return list(self.build_rows(range(start, end))), self.first_row - start
+        
+    def yview(self, *args):
+        # Scrollbar callback: ("moveto", fraction) or ("scroll", n, "units"/"pages")
+        if not self.virtual_active:
+            return
+        total = len(self._visible) + 1
+        if args[0] == "moveto":
+            first = int(float(args[1]) * total)
+        elif args[2] == "pages":
+            first = self.first_row + int(args[1]) * self.page_size()
+        else:
+            first = self.first_row + int(args[1])
+        self.scroll_to(first)
+        
+    def scroll_to(self, first):
+        first = max(0, min(first, len(self._visible) + 1 - self.page_size()))
+        if first != self.first_row:
+            self.first_row = first
+            self.render()
+        
+    def on_mouse_wheel(self, event):
+        if not self.virtual_active:
+            return None
+        if event.num == 4:
+            step = -3
+        elif event.num == 5:
+            step = 3
+        else:
+            step = -3 if event.delta > 0 else 3
+        self.scroll_to(self.first_row + step)
+        return "break"
+        
+    def build_rows(self, positions):
+        """
+        (item id, values) for the given display positions, where position
+        len(self._visible) is the Total row.
+        """
         blank_sep = "------"
+        visible = self._visible
         if not self.data:
-            self.tree.insert("", "end", values=(
-                "Total",
-                0,
-                blank_sep,
-                0,
-                0,
-                blank_sep,
-                blank_sep
-            ))
+            yield TOTAL_IID, ("Total", 0, blank_sep, 0, 0, blank_sep, blank_sep)
             return
 
-        total_count = sessionModel.calculate_total_caught_from(self.data)
-        missed_count = sessionModel.calculate_total_missed_from(self.data)
-        total_seen = sessionModel.calculate_total_seen_from(self.data)
-        for fish in self.data:
-            if self.hide_zero_catches_var.get() and fish['count'] == 0 and fish.get('missed', 0) == 0:
-                continue  # Skip rows with 0 catches if the checkbox is checked
-            
-            percentage = (fish['count'] / total_count) * 100 if total_count > 0 else 0
-            number_seen = fish['count'] + fish.get('missed', 0)  # Calculate Number Seen
-            catch_percentage = (fish["count"] / number_seen * 100) if number_seen > 0 else 0
-            seen_percentage = (number_seen / total_seen * 100) if total_seen > 0 else 0
+        stats = self.session_data.stats()
+        names = self.data.names
+        used = set()
+        for position in positions:
+            if position == len(visible):
+                # Add Total row at the bottom
+                yield TOTAL_IID, (
+                    "Total",
+                    stats.total_caught,
+                    blank_sep,
+                    stats.total_missed,
+                    stats.total_seen,
+                    f"{stats.total_catch_rate:.2f}%",
+                    blank_sep
+                )
+                continue
             
+            i = visible[position]
+            name = names[i]
+            # A species keeps its item id for as long as it keeps its name
+            iid = "fish:" + sessionModel.name_key(name)
+            while iid in used:
+                iid += "'"
+            used.add(iid)
             
             #heading = ("Name", "Count", "Percentage", "Missed",  "Number Seen", "Catch Percentage", "Seen Percentage")
-            self.tree.insert("", "end", values=(
-                fish['name'], 
-                fish['count'],
-                f"{percentage:.2f}%",
-                fish["missed"], 
-                number_seen,
-                f"{catch_percentage:.2f}%",
-                f"{seen_percentage:.2f}%"
-            ))
-
-        # Add Total row at the bottom
-        # Calculate the total catch percentage
-        total_catch_percentage = (total_count / total_seen * 100) if total_seen > 0 else 0
-        
-        self.tree.insert("", "end", values=(
-            "Total",
-            total_count,
-            blank_sep,
-            missed_count,
-            total_count + missed_count,
-            f"{total_catch_percentage:.2f}%",
-            blank_sep
-        ))
+            yield iid, (
+                name, 
+                int(stats.counts[i]),
+                f"{stats.percentage[i]:.2f}%",
+                int(stats.missed[i]), 
+                int(stats.seen[i]),
+                f"{stats.catch_rate[i]:.2f}%",
+                f"{stats.seen_rate[i]:.2f}%"
+            )
+        
+    def is_total(self, iid):
+        return iid == TOTAL_IID
         
-
     def sort_column(self, col):
         #Sort the treeview when a column header is clicked
         if col in self.sort_order:
             self.sort_order[col] = not self.sort_order[col]  # Toggle sort direction
-            # Use the static sort method from sessionModel
-            sessionModel.sort_fish_data(self.data, col, self.sort_order[col])
-            self.update_tree()  # Refresh the tree view with sorted data
+            # Sort through the session so its name index stays in sync
+            self.session_data.sort_data(col, self.sort_order[col])
+            self.schedule_update()  # Refresh the tree view with sorted data
             
             
     def selection(self):
@@ -0,0 +1,68 @@
+import tkinter as tk
+from tkinter import ttk
+
+class TimingView:
+    def __init__(self, root, report, title="Timing Report", timing_controls=True):
+        self.window = tk.Toplevel(root)
+        self.window.title(title)
+        self.window.geometry("760x400")
+
+        self._on_refresh = None
+        self._on_reset = None
+        self._on_save = None
+        self._on_close = None
+
+        self.create_widgets(timing_controls)
+        self.set_report(report)
+        self.window.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def create_widgets(self, timing_controls):
+        button_frame = tk.Frame(self.window)
+        button_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+        ttk.Button(button_frame, text="Refresh", command=self.on_refresh).pack(side=tk.LEFT)
+        if timing_controls:
+            ttk.Button(button_frame, text="Reset", command=self.on_reset).pack(side=tk.LEFT, padx=5)
+            ttk.Button(button_frame, text="Save JSON...", command=self.on_save).pack(side=tk.LEFT)
+
+        self.text = tk.Text(self.window, wrap=tk.NONE, font=("Courier", 10))
+        self.text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    def set_report(self, report):
+        if not self.window:
+            return
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert(tk.END, report)
+        self.text.config(state=tk.DISABLED)
+
+    def bind(self, event, callback):
+        if event == "refresh":
+            self._on_refresh = callback
+        elif event == "reset":
+            self._on_reset = callback
+        elif event == "save":
+            self._on_save = callback
+        elif event == "close":
+            self._on_close = callback
+
+    def on_refresh(self):
+        if self._on_refresh:
+            self._on_refresh()
+
+    def on_reset(self):
+        if self._on_reset:
+            self._on_reset()
+
+    def on_save(self):
+        if self._on_save:
+            self._on_save()
+
+    def on_close(self):
+        if self._on_close:
+            self._on_close()
+        self.destroy()
+
+    def destroy(self):
+        if self.window:
+            self.window.destroy()
+            self.window = None
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The app runs from src/, with model, view, controller and util as top level packages
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
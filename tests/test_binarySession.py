@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from model.binarySession import BinarySession, is_binary_session, convert_sessions_folder
+from model.sessionModel import sessionModel, list_session_files
+
+FISH = [
+    {"name": "Striped Bass", "count": 7, "missed": 2},
+    {"name": "Flounder \U0001f41f", "count": 0, "missed": 0},
+    {"name": "Bluefish", "count": 2 ** 40, "missed": 3},
+]
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "session.fts")
+    sessionModel(FISH, "Saltwater", "Squid").save_file(path)
+
+    assert is_binary_session(path)
+    loaded = sessionModel.load_file(path)
+    assert loaded.fish_data.to_list() == FISH
+    assert (loaded.water_type, loaded.bait_type) == ("Saltwater", "Squid")
+
+    with BinarySession(path) as session:
+        assert len(session) == 3
+        assert session.name(1) == "Flounder \U0001f41f"
+        assert session.count(2) == 2 ** 40 and session.missed(0) == 2
+        assert session.total_caught() == 7 + 2 ** 40
+
+
+def test_empty_session_round_trip(tmp_path):
+    path = str(tmp_path / "empty.fts")
+    sessionModel([], "Unspecified/Mixed", "Unspecified/Mixed").save_file(path)
+    assert sessionModel.load_file(path).is_empty()
+
+
+def test_duplicates_are_merged_like_json(tmp_path):
+    fish = FISH + [{"name": "BLUEFISH", "count": 1, "missed": 1}]
+    json_path = str(tmp_path / "dupes.json")
+    binary_path = str(tmp_path / "dupes.fts")
+    sessionModel(fish, "Saltwater", "Squid").save_file(json_path)
+    sessionModel(fish, "Saltwater", "Squid").save_file(binary_path)
+
+    assert sessionModel.load_file(binary_path).fish_data.to_list() == \
+        sessionModel.load_file(json_path).fish_data.to_list()
+
+
+def test_truncated_file_is_rejected(tmp_path):
+    path = tmp_path / "session.fts"
+    sessionModel(FISH, "Saltwater", "Squid").save_file(str(path))
+    path.write_bytes(path.read_bytes()[:-8])
+    with pytest.raises(ValueError):
+        sessionModel.load_file(str(path))
+
+
+def test_folder_listing_prefers_the_newer_copy(tmp_path):
+    sessionModel(FISH, "Saltwater", "Squid").save_file(str(tmp_path / "trip.json"))
+    convert_sessions_folder(str(tmp_path))
+    assert list_session_files(str(tmp_path)) == [str(tmp_path / "trip.fts")]
+
+    # Saving the JSON again after converting makes it the current copy
+    json_path = str(tmp_path / "trip.json")
+    sessionModel(FISH[:1], "Saltwater", "Squid").save_file(json_path)
+    binary_mtime = os.path.getmtime(tmp_path / "trip.fts")
+    os.utime(json_path, (binary_mtime + 10, binary_mtime + 10))
+    assert list_session_files(str(tmp_path)) == [json_path]
+
+
+def test_truncated_header_is_a_value_error(tmp_path):
+    path = tmp_path / "session.fts"
+    sessionModel(FISH, "Saltwater", "Squid").save_file(str(path))
+    # Cut inside the water type length, past the fixed header
+    path.write_bytes(path.read_bytes()[:13])
+    with pytest.raises(ValueError, match="truncated"):
+        BinarySession(str(path))
+
+
+def test_convert_skips_other_json_and_reports_failures(tmp_path):
+    sessionModel(FISH, "Saltwater", "Squid").save_file(str(tmp_path / "trip.json"))
+    sessionModel([], "Saltwater", "Squid").save_file(str(tmp_path / "empty.json"))
+    (tmp_path / "timings.json").write_text('{"buckets_ms": [1, 10], "spans": {}}')
+    (tmp_path / "broken.json").write_text('{"fish_data": [{"name": "Cod", "count": 1}')
+
+    written, failures = convert_sessions_folder(str(tmp_path))
+
+    assert sorted(written) == [str(tmp_path / "empty.fts"), str(tmp_path / "trip.fts")]
+    assert [name for name, _ in failures] == ["broken.json"]
+    assert not (tmp_path / "timings.fts").exists()
+    assert not (tmp_path / "broken.fts").exists()
+    assert sessionModel.load_file(str(tmp_path / "trip.fts")).fish_data.to_list() == FISH
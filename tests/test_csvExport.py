@@ -0,0 +1,38 @@
+import csv
+
+import pytest
+
+from model.csvExport import LONG_FIELDS, export_sessions_long
+from model.sessionLoader import OperationCancelled
+from model.sessionModel import sessionModel
+
+
+def test_long_format_has_one_row_per_session_and_species(tmp_path):
+    paths = []
+    for name, water in (("morning", "Freshwater"), ("evening", "Saltwater")):
+        path = str(tmp_path / f"{name}.json")
+        sessionModel([{"name": "Perch", "count": 2, "missed": 1}, {"name": "Pike", "count": 1}], water, "Worm").save_file(path)
+        paths.append(path)
+    out_path = str(tmp_path / "all.csv")
+
+    assert export_sessions_long(paths, out_path, {field: field for field in LONG_FIELDS}) == 4
+    with open(out_path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["session", "water_type", "bait_type", "species", "count", "missed"]
+    assert rows[1] == ["morning", "Freshwater", "Worm", "Perch", "2", "1"]
+    assert rows[4] == ["evening", "Saltwater", "Worm", "Pike", "1", "0"]
+
+
+def test_cancelled_or_failed_export_leaves_no_file(tmp_path):
+    path = str(tmp_path / "trip.json")
+    sessionModel([{"name": "Perch", "count": 2}], "Freshwater", "Worm").save_file(path)
+    names = {field: field for field in LONG_FIELDS}
+    out_path = tmp_path / "all.csv"
+
+    with pytest.raises(OperationCancelled):
+        export_sessions_long([path], str(out_path), names, cancelled=lambda: True)
+    assert not out_path.exists()
+
+    with pytest.raises(OSError):
+        export_sessions_long([path, str(tmp_path / "missing.json")], str(out_path), names)
+    assert not out_path.exists()
@@ -0,0 +1,79 @@
+import pytest
+
+from model.csvImport import CsvImport
+
+MAPPING = {'name': "Fish", 'count': "Caught", 'missed': "Missed"}
+
+
+def write_csv(tmp_path, text):
+    path = tmp_path / "log.csv"
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_rejected_rows_are_reported_with_line_numbers(tmp_path):
+    path = write_csv(tmp_path, "Fish,Caught,Missed\n"
+                               "Perch,3,1\n"
+                               "Walleye,two,0\n"
+                               ",4,0\n"
+                               "\n"
+                               "Pike,1\n"
+                               "perch,2,x\n"
+                               "PERCH,2,2\n")
+    fish_data, report = CsvImport(path).run(MAPPING)
+
+    assert fish_data.to_list() == [{"name": "Perch", "count": 5, "missed": 3}]
+    assert report.imported_rows == 2
+    assert report.rejected_rows == 4
+    assert [line for line, _ in report.errors] == [3, 4, 6, 7]
+    assert "count 'two' is not an integer" in report.summary()
+
+
+def test_rows_are_streamed_in_chunks(tmp_path):
+    rows = "".join(f"Fish {i % 50},{i},1\n" for i in range(1000))
+    progress = []
+    fish_data, report = CsvImport(write_csv(tmp_path, "Fish,Caught,Missed\n" + rows)).run(
+        MAPPING, progress=lambda fraction, text: progress.append(fraction), chunk_rows=64)
+
+    assert len(fish_data) == 50 and report.imported_rows == 1000
+    assert fish_data.counts[0] == sum(range(0, 1000, 50))
+    assert len(progress) == 16 and progress[-1] == 1.0
+
+
+def test_report_keeps_a_bounded_number_of_errors(tmp_path):
+    rows = "".join(f"Fish {i},bad,0\n" for i in range(500))
+    _, report = CsvImport(write_csv(tmp_path, "Fish,Caught,Missed\n" + rows)).run(MAPPING)
+    assert report.rejected_rows == 500 and len(report.errors) == report.max_errors
+    assert "...and 490 more" in report.summary()
+
+
+def test_missing_mapped_column(tmp_path):
+    csv_import = CsvImport(write_csv(tmp_path, "Fish,Caught\nPerch,1\n"))
+    assert csv_import.headers == ["Fish", "Caught"]
+    with pytest.raises(ValueError):
+        csv_import.run(MAPPING)
+
+
+@pytest.mark.parametrize("header", ["Fish,Caught,Missed\n", "Fish,Prisé,Missed\n"])
+def test_windows_code_page_falls_back_to_the_locale_encoding(tmp_path, monkeypatch, header):
+    from model import csvImport
+    monkeypatch.setattr(csvImport.locale, "getpreferredencoding", lambda do_setlocale=True: "cp1252")
+    # Non UTF-8 bytes well past the first chunk, so rows were already merged before the error
+    rows = "Perch,1,0\n" * 100 + "Brème,2,1\n"
+    path = tmp_path / "log.csv"
+    path.write_bytes((header + rows).encode('cp1252'))
+
+    csv_import = CsvImport(str(path))
+    mapping = dict(MAPPING, count=csv_import.headers[1])
+    fish_data, report = csv_import.run(mapping, chunk_rows=16)
+
+    assert csv_import.headers[1] in ("Caught", "Prisé")
+    assert fish_data.to_list() == [{"name": "Perch", "count": 100, "missed": 0},
+                                   {"name": "Brème", "count": 2, "missed": 1}]
+    assert report.imported_rows == 101
+
+
+def test_repeated_header_maps_to_the_last_column(tmp_path):
+    path = write_csv(tmp_path, "Fish,Caught,Missed,Caught\nPerch,1,0,5\n")
+    fish_data, _ = CsvImport(path).run(MAPPING)
+    assert fish_data.to_list() == [{"name": "Perch", "count": 5, "missed": 0}]
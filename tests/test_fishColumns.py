@@ -0,0 +1,138 @@
+import sys
+from array import array
+
+import pytest
+
+from model import fishColumns
+from model.fishColumns import FishColumns, FishRow, sort_permutation, VECTORIZE_MIN_ROWS, is_array
+
+FISH = [
+    {"name": "Perch", "count": 3, "missed": 1},
+    {"name": "Pike", "count": 1},
+    {"name": "Zander", "count": 7, "missed": 2},
+]
+
+
+def test_rows_are_stored_in_packed_columns():
+    fish_data = FishColumns(FISH)
+    assert fish_data.names == ["Perch", "Pike", "Zander"]
+    assert fish_data.counts == array('q', [3, 1, 7])
+    assert fish_data.missed == array('q', [1, 0, 2])
+    assert fish_data.to_list()[1] == {"name": "Pike", "count": 1, "missed": 0}
+
+
+def test_counts_are_int64():
+    fish_data = FishColumns([{"name": "Carp", "count": 2 ** 62}])
+    fish_data.append({"name": "Tench", "count": "4", "missed": 1.0})
+    assert fish_data.counts.typecode == 'q'
+    assert list(fish_data.counts) == [2 ** 62, 4] and fish_data.missed[1] == 1
+    with pytest.raises(OverflowError):
+        fish_data.append({"name": "Huge", "count": 2 ** 63})
+
+
+def test_rows_are_live_views():
+    fish_data = FishColumns(FISH)
+    row = fish_data[-1]
+    assert isinstance(row, FishRow)
+    assert dict(row) == {"name": "Zander", "count": 7, "missed": 2}
+    assert row.get('missed') == 2 and 'count' in row and len(row) == 3
+
+    row['count'] = 9
+    assert fish_data.counts[2] == 9
+    fish_data[2] = {"name": "Walleye", "count": 1}
+    assert row['name'] == "Walleye" and row['missed'] == 0
+
+    with pytest.raises(KeyError):
+        row['weight']
+    with pytest.raises(KeyError):
+        row['weight'] = 1
+    with pytest.raises(TypeError):
+        del row['count']
+    with pytest.raises(IndexError):
+        fish_data[3]
+
+
+def test_assigning_a_row_to_itself():
+    # The row being copied is a view of the same columns
+    fish_data = FishColumns(FISH)
+    fish_data[0] = fish_data[0]
+    fish_data[1] = fish_data[2]
+    assert fish_data.to_list()[:2] == [{"name": "Perch", "count": 3, "missed": 1},
+                                       {"name": "Zander", "count": 7, "missed": 2}]
+
+
+def test_list_operations():
+    fish_data = FishColumns(FISH)
+    fish_data.insert(1, {"name": "Roach", "count": 0})
+    del fish_data[0]
+    assert [fish['name'] for fish in fish_data] == ["Roach", "Pike", "Zander"]
+    assert [fish['name'] for fish in fish_data[1:]] == ["Pike", "Zander"]
+
+    copy = fish_data.copy()
+    copy.counts[0] = 100
+    assert fish_data.counts[0] == 0
+
+    fish_data.sort(key=lambda fish: fish['count'], reverse=True)
+    assert fish_data.names == ["Zander", "Pike", "Roach"]
+    fish_data.clear()
+    assert len(fish_data) == 0 and fish_data.counts == array('q')
+
+
+@pytest.mark.parametrize("rows", [3, VECTORIZE_MIN_ROWS - 1, VECTORIZE_MIN_ROWS, 1000])
+def test_permute_on_both_sides_of_the_numpy_switch(rows):
+    fish_data = FishColumns({"name": f"Fish {i}", "count": i, "missed": rows - i} for i in range(rows))
+    order = list(reversed(range(rows)))
+    fish_data.permute(order)
+    assert fish_data.names[0] == f"Fish {rows - 1}"
+    assert list(fish_data.counts) == order
+    assert list(fish_data.missed) == [rows - i for i in order]
+    assert fish_data.counts.typecode == 'q'
+
+
+def test_numpy_is_only_used_for_big_tables(monkeypatch):
+    imported = []
+    monkeypatch.setattr(fishColumns, "numpy", lambda: imported.append(True) or sys.modules.get("numpy"))
+    assert fishColumns.numpy_for(VECTORIZE_MIN_ROWS - 1) is None
+    assert not imported
+    fishColumns.numpy_for(VECTORIZE_MIN_ROWS)
+    assert imported
+
+
+def test_without_numpy(monkeypatch):
+    monkeypatch.setattr(fishColumns, "_numpy", None)
+    fish_data = FishColumns({"name": f"Fish {i}", "count": i} for i in range(VECTORIZE_MIN_ROWS * 2))
+    fish_data.permute(range(len(fish_data) - 1, -1, -1))
+    assert fish_data.counts[0] == len(fish_data) - 1
+    assert fish_data.count_column() == list(fish_data.counts)
+
+
+def test_is_array():
+    np = pytest.importorskip("numpy")
+    assert is_array(np.arange(3))
+    assert not is_array([1, 2, 3]) and not is_array(array('q', [1]))
+
+
+KEYS = [3, 1, 3, 2, 1, 3]
+
+
+@pytest.mark.parametrize("ascending", [True, False])
+def test_sort_permutation_matches_sorted(ascending):
+    # Equal keys keep their original order in both directions, like sorted(reverse=...)
+    expected = sorted(range(len(KEYS)), key=KEYS.__getitem__, reverse=not ascending)
+    assert list(sort_permutation(KEYS, ascending)) == expected
+
+
+@pytest.mark.parametrize("ascending", [True, False])
+def test_sort_permutation_numpy_is_stable_too(ascending):
+    np = pytest.importorskip("numpy")
+    keys = np.array(KEYS * 100, dtype=np.float64)
+    expected = sorted(range(len(keys)), key=lambda i: keys[i], reverse=not ascending)
+    order = sort_permutation(keys, ascending)
+    assert is_array(order)
+    assert order.tolist() == expected
+
+
+def test_sort_permutation_descending_ties():
+    assert list(sort_permutation([1, 2, 2, 1], ascending=False)) == [1, 2, 0, 3]
+    assert list(sort_permutation(["b", "a", "b"], ascending=False)) == [0, 2, 1]
+    assert list(sort_permutation([], ascending=False)) == []
@@ -0,0 +1,181 @@
+"""
+GraphView drawn headless: the Tk widgets are replaced by fakes, the figures
+are real matplotlib figures rendered with Agg on the worker thread.
+"""
+import time
+
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from model.graphData import GraphData
+from view import graphView
+from view.graphView import GraphView, GRAPHS
+
+
+class FakeWidget:
+    def __init__(self, *args, **kwargs):
+        self.options = dict(kwargs)
+        self.image = None
+
+    def __getattr__(self, name):
+        # pack, bind, title, geometry, protocol, transient... do nothing
+        return lambda *args, **kwargs: None
+
+    def configure(self, **kwargs):
+        self.options.update(kwargs)
+
+    def winfo_width(self):
+        return 1
+
+    def winfo_height(self):
+        return 1
+
+
+class FakeWindow(FakeWidget):
+    """A Toplevel whose after() queue is run by pump()."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pending = []
+
+    def after(self, ms, callback, *args):
+        self.pending.append((callback, args))
+        return len(self.pending)
+
+    def after_cancel(self, after_id):
+        self.pending[after_id - 1] = (lambda: None, ())
+
+
+class FakeNotebook(FakeWidget):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tabs = []
+        self.selected = 0
+
+    def add(self, widget, text=""):
+        self.tabs.append(widget)
+
+    def select(self, index=None):
+        if index is None:
+            return self.selected
+        self.selected = index
+
+    def index(self, tab_id):
+        return tab_id
+
+
+class FakeVar:
+    def __init__(self, value=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+@pytest.fixture
+def fake_tk(monkeypatch):
+    root = FakeWindow()
+    for name in ("Frame", "Button", "Label"):
+        monkeypatch.setattr(graphView.tk, name, FakeWidget)
+    monkeypatch.setattr(graphView.tk, "Toplevel", lambda master: root)
+    monkeypatch.setattr(graphView.tk, "StringVar", FakeVar)
+    monkeypatch.setattr(graphView.tk, "PhotoImage", lambda master, data: ("png", data))
+    monkeypatch.setattr(graphView.ttk, "Combobox", FakeWidget)
+    monkeypatch.setattr(graphView.ttk, "Notebook", FakeNotebook)
+    return root
+
+
+def pump(window, timeout=30):
+    """Run the queued after() callbacks, waiting for worker threads, until nothing is left."""
+    deadline = time.monotonic() + timeout
+    while window.pending:
+        assert time.monotonic() < deadline, "graph render did not finish"
+        callback, args = window.pending.pop(0)
+        callback(*args)
+        time.sleep(0.001)
+
+
+def make_data(values):
+    names = [f"Fish {i}" for i in range(len(values))]
+    return GraphData(names, {metric: list(values) for metric in GraphData.METRICS})
+
+
+def drawn_tabs(view):
+    return [i for i, tab in enumerate(view.tabs) if tab.image is not None]
+
+
+def test_only_the_selected_tab_is_drawn(fake_tk):
+    view = GraphView(fake_tk, make_data([3, 1, 2]))
+    pump(fake_tk)
+    assert drawn_tabs(view) == [0]
+    assert view.graphs[0] is not None and all(graph is None for graph in view.graphs[1:])
+
+    view.notebook.select(2)
+    view.on_tab_changed()
+    pump(fake_tk)
+    assert drawn_tabs(view) == [0, 2]
+    assert view.stale == [False, True, False] + [True] * (len(GRAPHS) - 3)
+    view.destroy()
+
+
+def test_sort_redraws_the_visible_tab_in_place(fake_tk):
+    view = GraphView(fake_tk, make_data([3, 1, 2]))
+    pump(fake_tk)
+    figure = view.graphs[0]['figure']
+
+    view.sort_and_refresh("count")
+    pump(fake_tk)
+    graph = view.graphs[0]
+    assert graph['figure'] is figure
+    assert [bar.get_height() for bar in graph['bars']] == [1, 2, 3]
+    assert [label.get_text() for label in graph['axes'].get_xticklabels()] == ["Fish 1", "Fish 2", "Fish 0"]
+    view.destroy()
+
+
+def test_new_data_rescales_the_y_axis(fake_tk):
+    # set_ylim(bottom=0) switches autoscaling off, a reused figure still has to grow with its data
+    view = GraphView(fake_tk, make_data([3, 1, 2]))
+    pump(fake_tk)
+    figure = view.graphs[0]['figure']
+
+    view.set_data(make_data([300, 100, 200]))
+    pump(fake_tk)
+    axes = view.graphs[0]['axes']
+    assert view.graphs[0]['figure'] is figure
+    bottom, top = axes.get_ylim()
+    assert bottom == 0 and top >= 300
+
+    view.set_data(make_data([3, 1, 2]))
+    pump(fake_tk)
+    assert axes.get_ylim()[1] < 10
+    view.destroy()
+
+
+def test_comparison_graph_rescales_the_y_axis(fake_tk):
+    from model.graphData import MultiGraphData
+    from view.multiGraphView import MultiGraphView
+
+    def sessions(scale):
+        return MultiGraphData(["a", "b"], [make_data([3 * scale, 1]), make_data([1, 2 * scale])])
+
+    view = MultiGraphView(fake_tk, sessions(1))
+    pump(fake_tk)
+    figure = view.graphs[0]['figure']
+
+    view.set_data(sessions(100))
+    pump(fake_tk)
+    assert view.graphs[0]['figure'] is figure
+    assert view.graphs[0]['axes'].get_ylim()[1] >= 300
+    view.destroy()
+
+
+@pytest.mark.parametrize("value, expected", [("4", 4), ("many", 12), ("0", 12), ("-3", 12), ("2.5", 12)])
+def test_max_figures_from_environment(monkeypatch, value, expected):
+    from view import figurePool
+
+    monkeypatch.setenv("FISH_TRACKER_MAX_FIGURES", value)
+    assert figurePool._max_figures_from_env() == expected
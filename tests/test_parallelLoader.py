@@ -0,0 +1,68 @@
+import pytest
+
+from model import parallelLoader
+from model.parallelLoader import aggregate_files, load_partials
+from model.sessionCatalog import SessionCatalog
+from model.sessionModel import sessionModel
+
+
+def write_sessions(folder, count):
+    paths = []
+    for i in range(count):
+        fish = [{"name": f"Fish {j}", "count": i * j + 1, "missed": (i + j) % 3} for j in range(i % 5, i % 5 + 6)]
+        path = str(folder / f"trip_{i:02}.json")
+        sessionModel(fish, "Freshwater", "Worm").save_file(path)
+        paths.append(path)
+    return paths
+
+
+def rows(session):
+    return sorted(zip(session.fish_data.names, session.fish_data.counts, session.fish_data.missed))
+
+
+def test_pool_and_serial_paths_agree(tmp_path, monkeypatch):
+    paths = write_sessions(tmp_path, 6)
+    serial = aggregate_files(paths, max_workers=1)
+
+    monkeypatch.setattr(parallelLoader, "PARALLEL_THRESHOLD", 2)
+    assert rows(aggregate_files(paths, max_workers=2)) == rows(serial)
+    assert [partial[0] for partial in load_partials(paths, max_workers=2)] == paths
+
+
+def test_catalog_indexes_through_the_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(parallelLoader, "PARALLEL_THRESHOLD", 2)
+    monkeypatch.setattr(parallelLoader.os, "cpu_count", lambda: 2)
+    paths = write_sessions(tmp_path, 6)
+    catalog = SessionCatalog(str(tmp_path))
+    try:
+        assert rows(catalog.aggregate(paths)) == rows(aggregate_files(paths, max_workers=1))
+    finally:
+        catalog.close()
+
+
+def test_worker_errors_name_the_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(parallelLoader, "PARALLEL_THRESHOLD", 2)
+    paths = write_sessions(tmp_path, 3)
+    with open(paths[1], 'w') as f:
+        f.write("{not json")
+    with pytest.raises(ValueError, match="trip_01"):
+        list(load_partials(paths, max_workers=2))
+
+
+def test_cancel_stops_the_pool(tmp_path, monkeypatch):
+    from model.sessionLoader import OperationCancelled
+    monkeypatch.setattr(parallelLoader, "PARALLEL_THRESHOLD", 2)
+    paths = write_sessions(tmp_path, 40)
+    seen = []
+    partials = load_partials(paths, max_workers=2, cancelled=lambda: len(seen) >= 3)
+    with pytest.raises(OperationCancelled):
+        for partial in partials:
+            seen.append(partial)
+    assert 3 <= len(seen) < len(paths)
+
+
+def test_cancel_before_the_serial_load(tmp_path):
+    from model.sessionLoader import OperationCancelled
+    paths = write_sessions(tmp_path, 2)
+    with pytest.raises(OperationCancelled):
+        list(load_partials(paths, cancelled=lambda: True))
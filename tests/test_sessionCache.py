@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from model import sessionCache
+from model.sessionCache import SessionCache
+from model.sessionModel import sessionModel
+
+
+@pytest.fixture
+def session_file(tmp_path):
+    path = str(tmp_path / "session.json")
+    sessionModel([{"name": "Trout", "count": 2, "missed": 1}], "Freshwater", "Fly").save_file(path)
+    return path
+
+
+def counting_loader():
+    calls = []
+
+    def loader(path):
+        calls.append(path)
+        return sessionModel.load_file(path)
+    return loader, calls
+
+
+def test_unchanged_file_is_parsed_once(session_file):
+    cache = SessionCache()
+    loader, calls = counting_loader()
+    first = cache.get_or_load(session_file, loader)
+    second = cache.get_or_load(session_file, loader)
+
+    assert len(calls) == 1 and (cache.hits, cache.misses) == (1, 1)
+    # Every caller gets its own copy
+    second.add_fish({"name": "Char", "count": 1})
+    assert cache.get_or_load(session_file, loader).fish_data.names == ["Trout"]
+    assert first is not second
+
+
+def test_changed_mtime_or_size_is_parsed_again(session_file):
+    cache = SessionCache()
+    loader, calls = counting_loader()
+    cache.get_or_load(session_file, loader)
+
+    # Same size, new mtime
+    stat = os.stat(session_file)
+    os.utime(session_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    cache.get_or_load(session_file, loader)
+    assert len(calls) == 2
+
+    # Same mtime, new size
+    stat = os.stat(session_file)
+    sessionModel([{"name": "Trout", "count": 20, "missed": 1}], "Freshwater", "Fly").save_file(session_file)
+    os.utime(session_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert cache.get_or_load(session_file, loader).fish_data.counts[0] == 20
+    assert len(calls) == 3
+
+
+def test_invalidate_and_budget(session_file, tmp_path):
+    cache = SessionCache()
+    loader, calls = counting_loader()
+    cache.get_or_load(session_file, loader)
+    cache.invalidate(session_file)
+    cache.get_or_load(session_file, loader)
+    assert len(calls) == 2
+
+    other = str(tmp_path / "other.json")
+    sessionModel([{"name": "Grayling", "count": 1}], "Freshwater", "Fly").save_file(other)
+    cache.get_or_load(other, loader)
+    cache.set_budget(cache.current_bytes - 1)
+    assert len(cache) == 1  # the least recently used entry went first
+    cache.get_or_load(other, loader)
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize("value, expected", [("16", 16), ("0.5", 0.5), ("lots", 64), ("-1", 64), ("nan", 64)])
+def test_budget_from_environment(monkeypatch, value, expected):
+    monkeypatch.setenv("FISH_TRACKER_CACHE_MB", value)
+    assert sessionCache._budget_from_env() == int(expected * 1024 * 1024)
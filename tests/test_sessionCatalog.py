@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from model.parallelLoader import aggregate_files
+from model.sessionCatalog import SessionCatalog
+from model.sessionModel import sessionModel
+
+
+def write_sessions(folder, count, water_type="Freshwater"):
+    paths = []
+    for i in range(count):
+        fish = [{"name": f"Fish {j}", "count": i * j + 1, "missed": (i + j) % 3} for j in range(i % 5, i % 5 + 6)]
+        path = str(folder / f"trip_{i:02}.json")
+        sessionModel(fish, water_type, "Worm").save_file(path)
+        paths.append(path)
+    return paths
+
+
+def expected(paths):
+    rows = [dict(fish) for path in paths for fish in sessionModel.load_file(path).fish_data]
+    return sorted((fish['name'], fish['count'], fish['missed']) for fish in sessionModel.aggregate_fish_data(rows))
+
+
+def rows(session):
+    return sorted(zip(session.fish_data.names, session.fish_data.counts, session.fish_data.missed))
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = SessionCatalog(str(tmp_path))
+    yield catalog
+    catalog.close()
+
+
+def test_aggregate_matches_aggregate_fish_data(tmp_path, catalog):
+    paths = write_sessions(tmp_path, 4)
+    combined = catalog.aggregate(paths)
+    assert rows(combined) == expected(paths)
+    assert combined.water_type == "Freshwater"
+    assert rows(aggregate_files(paths)) == expected(paths)
+
+
+def test_species_merge_case_insensitively(tmp_path, catalog):
+    first = str(tmp_path / "a.json")
+    second = str(tmp_path / "b.json")
+    sessionModel([{"name": "Brown Trout", "count": 2, "missed": 1}], "Freshwater", "Fly").save_file(first)
+    sessionModel([{"name": "brown trout", "count": 3, "missed": 0}], "Saltwater", "Fly").save_file(second)
+
+    combined = catalog.aggregate([first, second])
+    assert combined.fish_data.to_list() == [{"name": "Brown Trout", "count": 5, "missed": 1}]
+    assert (combined.water_type, combined.bait_type) == ("Unspecified/Mixed", "Fly")
+    assert rows(combined) == expected([first, second])
+
+
+def test_aggregate_fish_data_merges_case_insensitively():
+    merged = sessionModel.aggregate_fish_data([
+        {"name": "Straße Pike", "count": 1},
+        {"name": "STRASSE PIKE", "count": 2, "missed": 4},
+        {"name": "Perch", "count": 3, "missed": 1},
+    ])
+    assert merged == [{"name": "Straße Pike", "count": 3, "missed": 4}, {"name": "Perch", "count": 3, "missed": 1}]
+
+
+def test_changed_files_are_indexed_again(tmp_path, catalog):
+    paths = write_sessions(tmp_path, 3)
+    assert catalog.refresh() == 3
+    assert catalog.refresh() == 0
+
+    sessionModel([{"name": "Fish 0", "count": 100}], "Freshwater", "Worm").save_file(paths[0])
+    stat = os.stat(paths[0])
+    os.utime(paths[0], (stat.st_atime, stat.st_mtime + 10))
+    os.remove(paths[2])
+    assert catalog.refresh() == 1
+    assert catalog.totals()[0] == 2
+    assert rows(catalog.aggregate(paths[:2])) == expected(paths[:2])
+
+
+def test_load_session_parses_once_and_keeps_the_report(tmp_path, catalog, monkeypatch):
+    from model.sessionCache import session_cache
+    path = tmp_path / "rough.json"
+    path.write_text('{"water_type": "Freshwater", "bait_type": "Worm", "fish_data": '
+                    '[{"name": "Perch", "count": 2}, {"name": "Pike", "count": "two"}]}')
+    session_cache.invalidate()
+    parses = []
+    load_file = sessionModel.load_file
+    monkeypatch.setattr(sessionModel, "load_file", staticmethod(lambda *args: parses.append(args) or load_file(*args)))
+
+    session = catalog.load_session(str(path))
+    assert len(parses) == 1
+    assert session.fish_data.names == ["Perch"]
+    assert session.load_report.rejected_rows == 1
+    assert catalog.totals([str(path)]) == (1, 2, 0)
+
+    again = catalog.load_session(str(path))
+    assert len(parses) == 1 and again.load_report.rejected_rows == 1
+    session_cache.invalidate()
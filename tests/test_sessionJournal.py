@@ -0,0 +1,108 @@
+import json
+
+from model.sessionJournal import SessionJournal
+from model.sessionModel import sessionModel
+
+
+def live_session(folder, fish_data=(), **journal_options):
+    journal = SessionJournal(str(folder), **journal_options).start()
+    session = sessionModel(list(fish_data), "Saltwater", "Jig")
+    session.attach_journal(journal)
+    return session, journal
+
+
+def recover(folder):
+    return SessionJournal(str(folder)).recover()
+
+
+def test_nothing_to_recover(tmp_path):
+    assert recover(tmp_path) is None
+
+
+def test_recovery_replays_every_change(tmp_path):
+    session, journal = live_session(tmp_path, [{"name": "Cod", "count": 1, "missed": 0}])
+    session.add_fish({"name": "Haddock", "count": 2})
+    session.add_fish({"name": "Pollock", "count": 5, "missed": 1})
+    session.update_at(0, {"name": "Atlantic Cod", "count": 3, "missed": 2})
+    session.delete_at(1)
+    session.sort_data("Count", ascending=False)
+    session.set_water_type("Brackish")
+    session.set_bait_type("Shrimp")
+    journal.close()  # no save and no clean shutdown of the session: a crash
+
+    recovered = recover(tmp_path)
+    assert recovered.fish_data.to_list() == session.fish_data.to_list()
+    assert (recovered.water_type, recovered.bait_type) == ("Brackish", "Shrimp")
+    assert recovered.dirty
+    assert recovered.fish_index("atlantic cod") == session.fish_index("Atlantic Cod")
+
+
+def test_snapshots_compact_the_log(tmp_path):
+    session, journal = live_session(tmp_path, snapshot_every=10)
+    for i in range(25):
+        session.add_fish({"name": f"Fish {i}", "count": i})
+    journal.close()
+
+    with open(journal.journal_path, encoding='utf-8') as f:
+        assert len(f.readlines()) < 10
+    assert recover(tmp_path).fish_data.to_list() == session.fish_data.to_list()
+
+
+def test_entries_already_in_the_snapshot_are_skipped(tmp_path):
+    # A crash between writing the snapshot and truncating the log leaves both
+    session, journal = live_session(tmp_path)
+    session.add_fish({"name": "Cod", "count": 1})
+    session.add_fish({"name": "Hake", "count": 2})
+    journal.flush()
+    with open(journal.journal_path, encoding='utf-8') as f:
+        old_lines = f.read()
+    journal.snapshot(session)
+    journal.flush()
+    session.add_fish({"name": "Ling", "count": 3})
+    journal.close()
+    with open(journal.journal_path, encoding='utf-8') as f:
+        new_lines = f.read()
+    with open(journal.journal_path, 'w', encoding='utf-8') as f:
+        f.write(old_lines + new_lines)
+
+    assert recover(tmp_path).fish_data.names == ["Cod", "Hake", "Ling"]
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    session, journal = live_session(tmp_path)
+    session.add_fish({"name": "Cod", "count": 1})
+    journal.close()
+    with open(journal.journal_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({"op": "add", "seq": 99, "fish": {"name": "Hake", "count": 2}})[:15])
+
+    assert recover(tmp_path).fish_data.names == ["Cod"]
+
+
+def test_saving_and_sorting_leave_the_session_clean(tmp_path):
+    session, journal = live_session(tmp_path, [{"name": "Cod", "count": 1}, {"name": "Hake", "count": 2}])
+    assert not session.dirty
+    session.sort_data("Count", ascending=False)
+    assert not session.dirty
+
+    session.add_fish({"name": "Ling", "count": 3})
+    assert session.dirty
+    session.save_file(str(tmp_path / "saved.json"))
+    assert not session.dirty
+    journal.close()
+    assert not recover(tmp_path).dirty
+
+
+def test_changes_after_a_snapshot_do_not_leak_into_it(tmp_path):
+    # The snapshot shares the session's columns until the writer has serialized
+    # them, so change them before the writer thread has even started
+    journal = SessionJournal(str(tmp_path))
+    session = sessionModel([{"name": "Cod", "count": 1}], "Saltwater", "Jig")
+    session.attach_journal(journal)
+    session.add_fish({"name": "Hake", "count": 2})
+    session.update_at(0, {"name": "Cod", "count": 5})
+    journal.start()
+    journal.flush()
+    with open(journal.snapshot_path, encoding='utf-8') as f:
+        assert json.load(f)["fish_data"] == [{"name": "Cod", "count": 1, "missed": 0}]
+    journal.close()
+    assert recover(tmp_path).fish_data.to_list() == session.fish_data.to_list()
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from model import sessionLoader
+from model.sessionLoader import read_session_file, ImportReport, OperationCancelled
+from model.sessionModel import sessionModel
+
+
+def write_json(path, fish_data, water_type="Freshwater", bait_type="Worm", indent=4):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"water_type": water_type, "bait_type": bait_type, "fish_data": fish_data}, f, indent=indent)
+    return str(path)
+
+
+FISH = [
+    {"name": "Largemouth Bass", "count": 12, "missed": 3},
+    {"name": "Bluegill", "count": 1234567890123},
+    {"name": "Crappie éè \U0001f41f", "count": 0, "missed": 7},
+    {"name": "bluegill", "count": 5, "missed": 1},
+    {"name": "Pike", "count": 4, "missed": 0},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 4])
+def test_chunk_boundaries_do_not_change_the_result(tmp_path, monkeypatch, chunk_size, indent):
+    # Tokens, multi-byte characters and numbers all end up split across reads
+    monkeypatch.setattr(sessionLoader, "CHUNK_SIZE", chunk_size)
+    path = write_json(tmp_path / "session.json", FISH, indent=indent)
+
+    fish_data, water_type, bait_type = read_session_file(path)
+
+    assert (water_type, bait_type) == ("Freshwater", "Worm")
+    assert fish_data.to_list() == [
+        {"name": "Largemouth Bass", "count": 12, "missed": 3},
+        {"name": "Bluegill", "count": 1234567890128, "missed": 1},
+        {"name": "Crappie éè \U0001f41f", "count": 0, "missed": 7},
+        {"name": "Pike", "count": 4, "missed": 0},
+    ]
+
+
+def test_empty_and_metadata_only_files(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_text("{}")
+    fish_data, water_type, _ = read_session_file(str(path))
+    assert len(fish_data) == 0 and water_type == "Unspecified/Mixed"
+
+    path = write_json(tmp_path / "no_fish.json", [])
+    assert len(read_session_file(path)[0]) == 0
+
+
+def test_float_counts_are_accepted(tmp_path):
+    path = write_json(tmp_path / "floats.json", [{"name": "Cod", "count": 1.0, "missed": 2.0}])
+    assert read_session_file(path)[0].to_list() == [{"name": "Cod", "count": 1, "missed": 2}]
+
+
+def test_malformed_entries_are_reported_not_fatal(tmp_path):
+    path = write_json(tmp_path / "bad.json", [
+        {"name": "Cod", "count": 1},
+        {"name": "Haddock", "count": "lots"},
+        {"count": 3},
+        {"name": "Pollock"},
+        {"name": "cod", "count": 2, "missed": None},
+        {"name": "Hake", "count": 4},
+    ])
+    report = ImportReport(location="Entry")
+    fish_data = read_session_file(path, report=report)[0]
+
+    assert fish_data.to_list() == [{"name": "Cod", "count": 1, "missed": 0},
+                                   {"name": "Hake", "count": 4, "missed": 0}]
+    assert report.imported_rows == 2
+    assert [entry for entry, _ in report.errors] == [2, 3, 4, 5]
+    assert report.summary().splitlines()[1].startswith("Entry 2:")
+
+    session = sessionModel.load_file(path)
+    assert session.load_report.rejected_rows == 4
+    clean = sessionModel.load_file(write_json(tmp_path / "clean.json", FISH))
+    assert clean.load_report is None
+
+
+def test_truncated_file_is_an_error(tmp_path):
+    path = tmp_path / "truncated.json"
+    path.write_text(json.dumps({"fish_data": FISH})[:-20])
+    with pytest.raises(ValueError):
+        read_session_file(str(path))
+
+
+def test_cancel_stops_the_load(tmp_path):
+    path = write_json(tmp_path / "session.json", FISH)
+    with pytest.raises(OperationCancelled):
+        read_session_file(path, cancelled=lambda: True)
@@ -0,0 +1,77 @@
+from model.sessionModel import sessionModel
+
+
+def make_session(*names):
+    return sessionModel([{"name": name, "count": i + 1, "missed": 0} for i, name in enumerate(names)],
+                        "Freshwater", "Worm")
+
+
+def assert_index_consistent(session):
+    # Every name finds the first row holding it, casefolded
+    first = {}
+    for i, name in enumerate(session.fish_data.names):
+        first.setdefault(name.casefold(), i)
+    for key, index in first.items():
+        assert session.fish_index(key.upper()) == index
+    assert session._name_index == first
+
+
+def test_lookup_ignores_case():
+    session = make_session("Rainbow Trout", "Straße")
+    assert session.fish_index("rainbow TROUT") == 0
+    assert session.fish_index("STRASSE") == 1  # casefold, not lower
+    assert session.fish_index("Brook Trout") == -1
+
+
+def test_rename_to_a_different_case():
+    session = make_session("Perch", "Pike")
+    session.update_at(0, {"name": "PERCH", "count": 5, "missed": 0})
+    assert session.fish_index("perch") == 0
+    session.update_at(0, {"name": "Yellow Perch", "count": 5, "missed": 0})
+    assert session.fish_index("perch") == -1
+    assert session.fish_index("yellow perch") == 0
+    assert_index_consistent(session)
+
+
+def test_delete_shifts_later_rows():
+    session = make_session("Perch", "Pike", "Zander", "Roach")
+    session.delete_at(1)
+    assert session.fish_index("pike") == -1
+    assert session.fish_index("zander") == 1
+    assert session.fish_index("roach") == 2
+    assert_index_consistent(session)
+
+
+def test_duplicate_takes_over_after_delete():
+    # Duplicates can come from data written before names were checked
+    session = make_session("Perch", "Pike", "perch", "Roach")
+    assert session.fish_index("PERCH") == 0
+    session.delete_at(0)
+    assert session.fish_index("perch") == 1
+    assert_index_consistent(session)
+
+
+def test_duplicate_takes_over_after_rename():
+    session = make_session("Perch", "Pike", "PERCH")
+    session.update_at(0, {"name": "Ruffe", "count": 1, "missed": 0})
+    assert session.fish_index("perch") == 2
+    assert session.fish_index("ruffe") == 0
+    assert_index_consistent(session)
+
+
+def test_index_follows_sort():
+    session = make_session("Perch", "Pike", "Zander", "Roach")
+    session.sort_data("Count", ascending=False)
+    assert session.fish_data.names == ["Roach", "Zander", "Pike", "Perch"]
+    assert session.fish_index("perch") == 3
+    assert session.fish_index("roach") == 0
+    session.sort_data("Name")
+    assert_index_consistent(session)
+
+
+def test_add_and_clear():
+    session = make_session("Perch")
+    session.add_fish({"name": "Pike", "count": 2})
+    assert session.fish_index("PIKE") == 1 and session.fish_data[1]['missed'] == 0
+    session.clear()
+    assert session.fish_index("perch") == -1 and session.is_empty()
@@ -0,0 +1,77 @@
+import pytest
+
+from model.fishColumns import VECTORIZE_MIN_ROWS, is_array
+from model.sessionModel import sessionModel
+from model import sessionStats
+from model.sessionStats import SessionStats
+
+
+def make_session(rows=3):
+    return sessionModel([{"name": f"Fish {i}", "count": i + 1, "missed": i % 2} for i in range(rows)],
+                        "Freshwater", "Worm")
+
+
+def test_stats_are_reused_while_the_version_is_unchanged():
+    session = make_session()
+    stats = session.stats()
+    assert session.stats() is stats
+    session.calculate_total_caught()
+    session.set_water_type("Saltwater")  # not a fish_data change
+    assert session.stats() is stats
+    assert (stats.total_caught, stats.total_missed, stats.total_seen) == (6, 1, 7)
+
+
+@pytest.mark.parametrize("change", [
+    lambda s: s.add_fish({"name": "Pike", "count": 4, "missed": 0}),
+    lambda s: s.update_at(0, {"name": "Fish 0", "count": 5, "missed": 0}),
+    lambda s: s.delete_at(2),
+    lambda s: s.sort_data("Count", ascending=False),
+    lambda s: s.clear(),
+])
+def test_every_change_recomputes(change):
+    session = make_session()
+    before = session.stats()
+    change(session)
+    after = session.stats()
+    assert after is not before and after.version == session.version
+    expected = SessionStats(list(session.fish_data))
+    assert after.total_caught == expected.total_caught
+    assert list(after.percentage) == pytest.approx(list(expected.percentage))
+
+
+def test_totals_and_rates():
+    stats = make_session().stats()
+    assert list(stats.seen) == [1, 3, 3]
+    assert list(stats.percentage) == pytest.approx([100 / 6, 200 / 6, 300 / 6])
+    assert list(stats.catch_rate) == pytest.approx([100, 200 / 3, 100])
+    assert list(stats.seen_rate) == pytest.approx([100 / 7, 300 / 7, 300 / 7])
+    assert stats.total_catch_rate == pytest.approx(600 / 7)
+
+
+def test_zero_rows_give_zero_rates():
+    session = sessionModel([{"name": "Ghost", "count": 0, "missed": 0}], "Freshwater", "Worm")
+    stats = session.stats()
+    assert list(stats.percentage) == [0] and list(stats.catch_rate) == [0]
+    assert stats.total_catch_rate == 0
+    assert sessionModel([], "Freshwater", "Worm").stats().total_seen == 0
+
+
+def test_numpy_path_for_big_sessions(monkeypatch):
+    pytest.importorskip("numpy")
+    small = make_session(VECTORIZE_MIN_ROWS - 1).stats()
+    big_session = make_session(VECTORIZE_MIN_ROWS)
+    big = big_session.stats()
+    assert not is_array(small.counts)
+    assert is_array(big.counts) and is_array(big.catch_rate)
+
+    monkeypatch.setattr(sessionStats, "numpy_for", lambda rows: None)
+    looped = SessionStats(big_session.fish_data)
+    assert not is_array(looped.counts)
+    assert big.total_caught == looped.total_caught == sum(range(1, VECTORIZE_MIN_ROWS + 1))
+    assert big.percentage.tolist() == pytest.approx(looped.percentage)
+    assert big.catch_rate.tolist() == pytest.approx(looped.catch_rate)
+    assert big.seen_rate.tolist() == pytest.approx(looped.seen_rate)
+
+    # The stats own their arrays, the packed columns can still grow
+    big_session.add_fish({"name": "Pike", "count": 1})
+    assert big_session.stats().total_caught == big.total_caught + 1